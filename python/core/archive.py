@@ -0,0 +1,439 @@
+"""
+Este módulo, `archive`, implementa o acervo de arquivos processados
+endereçado por conteúdo (`ETL_ARCHIVE_MODE=store`).
+
+No modo padrão, cada arquivo processado é movido sem compressão para
+`processed/AAAA/MM/DD/HHMMSS_<nome>`, e um arquivo reenviado com o mesmo
+conteúdo é guardado de novo. No acervo (`processed/archive/`):
+- Cada conteúdo é guardado uma única vez, pelo hash MD5 já usado na detecção
+  de duplicatas (`FileHandler.calculate_hash`), em
+  `objects/<2 primeiros caracteres>/<hash><extensão>`. Reenvios só acrescentam
+  uma entrada no catálogo.
+- Arquivos ainda não compactados (CSV, Arrow, XLS) ganham a extensão `.zst`:
+  a compressão roda em segundo plano, e até ela terminar o arquivo fica em
+  `staging/`, já legível. Arquivos `.gz`/`.zst`/`.zip`, pastas de trabalho
+  (XLSX/ODS) e Parquet já são compactados e são guardados como vieram.
+- O catálogo (`catalog.sqlite3`) liga cada hash aos nomes recebidos, às datas
+  e às execuções (`historico_execucao.id`) que o carregaram.
+- Os arquivos de quarentena das cargas (`ETL_REJECTION_LOG_MODE=quarantine`)
+  ficam ao lado do conteúdo, em `objects/<2 primeiros caracteres>/`.
+- A leitura é em streaming (`open`, `source`): o conteúdo é descompactado
+  direto para o leitor, sem cópia descompactada em disco (planilhas e
+  formatos colunares compactados ainda passam por um arquivo temporário, ver
+  `InputSource.open`).
+
+Compressões interrompidas (o processo caiu com arquivos em `staging/`) são
+retomadas na próxima vez que o acervo é aberto.
+"""
+
+import io
+import os
+import shutil
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, List, Optional
+
+from python.core.file_handler import FileHandler
+from python.core.inputs import COMPRESSION_SUFFIXES, GZIP_SUFFIXES, ZSTD_SUFFIXES, InputSource
+from python.core.readers import ODS_SUFFIXES, PARQUET_SUFFIXES, XLSX_SUFFIXES
+
+ARCHIVE_DIRNAME = 'archive'
+CATALOG_NAME = 'catalog.sqlite3'
+
+# Formatos já compactados, guardados como vieram
+STORED_AS_IS_SUFFIXES = COMPRESSION_SUFFIXES + XLSX_SUFFIXES + ODS_SUFFIXES + PARQUET_SUFFIXES
+
+_CATALOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS objetos (
+    hash TEXT PRIMARY KEY,
+    caminho TEXT NOT NULL,
+    compactado INTEGER NOT NULL,
+    pendente INTEGER NOT NULL,
+    tamanho_original INTEGER NOT NULL,
+    tamanho_armazenado INTEGER
+);
+CREATE TABLE IF NOT EXISTS recebimentos (
+    hash TEXT NOT NULL,
+    nome TEXT NOT NULL,
+    data_arquivamento TEXT NOT NULL,
+    duplicado INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_recebimentos_hash ON recebimentos (hash);
+CREATE INDEX IF NOT EXISTS idx_recebimentos_nome ON recebimentos (nome);
+CREATE TABLE IF NOT EXISTS execucoes (
+    execucao_id TEXT PRIMARY KEY,
+    hash TEXT NOT NULL
+);
+"""
+
+
+@dataclass
+class ArchivedFile:
+    """
+    Um conteúdo do acervo e o seu histórico no catálogo.
+
+    Attributes:
+        file_hash (str): O hash MD5 do conteúdo original.
+        path (Path): Onde o conteúdo está agora (`objects/` ou, com a compressão
+                     pendente, `staging/`).
+        compressed (bool): Se o acervo compactou o conteúdo (extensão `.zst` extra).
+        pending (bool): Se a compressão em segundo plano ainda não terminou.
+        size (int): Tamanho original em bytes.
+        stored_size (int, optional): Tamanho em disco depois da compressão.
+        names (list): Os nomes com que o conteúdo foi recebido, em ordem.
+        archived_at (list): A data de cada recebimento (ISO 8601), na mesma ordem.
+        execution_ids (list): As execuções que carregaram o conteúdo.
+    """
+    file_hash: str
+    path: Path
+    compressed: bool
+    pending: bool
+    size: int
+    stored_size: Optional[int] = None
+    names: List[str] = field(default_factory=list)
+    archived_at: List[str] = field(default_factory=list)
+    execution_ids: List[str] = field(default_factory=list)
+
+
+class ArchiveStore:
+    """
+    Acervo de arquivos processados, endereçado pelo hash do conteúdo e
+    compactado em segundo plano com zstd.
+    """
+
+    def __init__(self, root: Path, level: int = 10, read_only: bool = False):
+        """
+        Args:
+            root (Path): Diretório do acervo (ex: `processed/archive`).
+            level (int): Nível de compressão do zstd.
+            read_only (bool): Abre um acervo existente só para consultas e
+                              leitura, sem criar diretórios nem o catálogo.
+        """
+        self.root = Path(root)
+        self.level = level
+        self.read_only = read_only
+        self.objects_dir = self.root / 'objects'
+        self.staging_dir = self.root / 'staging'
+        self.catalog_path = self.root / CATALOG_NAME
+        # Thread de compressão, criada na primeira compressão agendada
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = []
+        self._lock = threading.Lock()
+
+        if not read_only:
+            self.staging_dir.mkdir(parents=True, exist_ok=True)
+            self.objects_dir.mkdir(parents=True, exist_ok=True)
+            with closing(self._connect()) as catalog:
+                catalog.executescript(_CATALOG_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Uma conexão com o catálogo (uma por operação: as threads não compartilham conexões)."""
+        if self.read_only:
+            return sqlite3.connect(f"{self.catalog_path.resolve().as_uri()}?mode=ro", uri=True,
+                                   timeout=30, isolation_level=None)
+        return sqlite3.connect(self.catalog_path, timeout=30, isolation_level=None)
+
+    def _object_name(self, file_hash: str, name: str):
+        """O nome do objeto de um conteúdo e se o acervo o compacta."""
+        suffix = Path(name).suffix.lower()
+        if suffix in GZIP_SUFFIXES + ZSTD_SUFFIXES:
+            # 'faturamento.csv.gz' → '<hash>.csv.gz'
+            return f"{file_hash}{Path(Path(name).stem).suffix.lower()}{suffix}", False
+        if suffix in STORED_AS_IS_SUFFIXES:
+            return f"{file_hash}{suffix}", False
+        return f"{file_hash}{suffix}.zst", True
+
+    def _object_path(self, object_name: str) -> Path:
+        return self.objects_dir / object_name[:2] / object_name
+
+    def quarantine_dir(self, file_hash: str) -> Path:
+        """
+        Diretório dos arquivos de quarentena (`python.core.quarantine`) das
+        cargas de um conteúdo: o mesmo do conteúdo no acervo.
+        """
+        return self.objects_dir / file_hash[:2]
+
+    def _staging_path(self, object_name: str) -> Path:
+        # O conteúdo original, sem a extensão `.zst` do objeto
+        return self.staging_dir / object_name[:-len('.zst')]
+
+    def store(self, file_path: Path, execution_ids: Iterable[str] = (), is_duplicate: bool = False,
+              file_hash: Optional[str] = None) -> Path:
+        """
+        Guarda um arquivo processado no acervo (o arquivo é movido).
+
+        Um conteúdo já guardado não é copiado de novo: o arquivo é removido e o
+        recebimento só é registrado no catálogo.
+
+        Args:
+            file_path (Path): O arquivo do diretório de entrada.
+            execution_ids (Iterable[str]): As execuções que carregaram o arquivo.
+            is_duplicate (bool): Se todas as fontes do arquivo já tinham sido carregadas.
+            file_hash (str, optional): O hash MD5 do arquivo, se já calculado
+                                       (senão, o arquivo é lido para calculá-lo).
+
+        Returns:
+            Path: Onde o conteúdo está no acervo (em `staging/` até a compressão terminar).
+        """
+        file_path = Path(file_path)
+        file_hash = file_hash or FileHandler.calculate_hash(file_path)
+        size = file_path.stat().st_size
+        object_name, compress = self._object_name(file_hash, file_path.name)
+        dest = self._object_path(object_name)
+
+        with closing(self._connect()) as catalog:
+            # Reserva o hash antes de mover: outro processo pode estar guardando o mesmo conteúdo
+            catalog.execute("BEGIN IMMEDIATE")
+            try:
+                created = catalog.execute(
+                    "INSERT OR IGNORE INTO objetos (hash, caminho, compactado, pendente, tamanho_original) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (file_hash, dest.relative_to(self.root).as_posix(), int(compress), int(compress), size),
+                ).rowcount == 1
+                if created:
+                    if compress:
+                        shutil.move(str(file_path), str(self._staging_path(object_name)))
+                    else:
+                        dest.parent.mkdir(parents=True, exist_ok=True)
+                        shutil.move(str(file_path), str(dest))
+                        catalog.execute("UPDATE objetos SET tamanho_armazenado = ? WHERE hash = ?",
+                                        (size, file_hash))
+                catalog.execute(
+                    "INSERT INTO recebimentos (hash, nome, data_arquivamento, duplicado) VALUES (?, ?, ?, ?)",
+                    (file_hash, file_path.name, datetime.now().isoformat(timespec='seconds'), int(is_duplicate)))
+                catalog.executemany("INSERT OR REPLACE INTO execucoes (execucao_id, hash) VALUES (?, ?)",
+                                    [(str(execution_id), file_hash) for execution_id in execution_ids
+                                     if execution_id is not None])
+                catalog.execute("COMMIT")
+            except BaseException:
+                catalog.execute("ROLLBACK")
+                raise
+
+        if not created:
+            file_path.unlink()
+        elif compress:
+            self._submit(file_hash, object_name)
+        archived = self.get(file_hash)
+        return archived.path if archived is not None else dest
+
+    def _submit(self, file_hash: str, object_name: str) -> None:
+        """Agenda a compressão de um arquivo de `staging/`."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='archive')
+            self._pending = [future for future in self._pending if not future.done()]
+            self._pending.append(self._executor.submit(self._compress, file_hash, object_name))
+
+    def _compress(self, file_hash: str, object_name: str) -> None:
+        """Compacta um arquivo de `staging/` para `objects/` (roda em segundo plano)."""
+        import zstandard
+
+        staged = self._staging_path(object_name)
+        dest = self._object_path(object_name)
+        tmp = dest.with_name(f".{dest.name}.{os.getpid()}.tmp")
+        try:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            compressor = zstandard.ZstdCompressor(level=self.level, write_checksum=True)
+            with open(staged, 'rb') as source, open(tmp, 'wb') as target:
+                compressor.copy_stream(source, target, size=staged.stat().st_size)
+            tmp.replace(dest)
+            with closing(self._connect()) as catalog:
+                catalog.execute("UPDATE objetos SET pendente = 0, tamanho_armazenado = ? WHERE hash = ?",
+                                (dest.stat().st_size, file_hash))
+            staged.unlink(missing_ok=True)
+        except Exception as e:
+            tmp.unlink(missing_ok=True)
+            print(f"   ⚠️  Falha ao compactar {staged.name} no acervo ({e}); "
+                  f"a compressão será refeita na próxima execução.")
+
+    def recover(self) -> int:
+        """
+        Reagenda as compressões que não terminaram (ex: o processo caiu).
+
+        Returns:
+            int: Quantidade de arquivos reagendados.
+        """
+        with closing(self._connect()) as catalog:
+            pending = catalog.execute("SELECT hash, caminho FROM objetos WHERE pendente = 1").fetchall()
+        count = 0
+        for file_hash, path in pending:
+            object_name = Path(path).name
+            if self._staging_path(object_name).exists():
+                self._submit(file_hash, object_name)
+                count += 1
+        return count
+
+    def wait(self) -> None:
+        """Espera as compressões em segundo plano agendadas até agora."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for future in pending:
+            future.result()
+
+    def close(self) -> None:
+        """Espera as compressões pendentes e encerra a thread de compressão."""
+        self.wait()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def get(self, file_hash: str) -> Optional[ArchivedFile]:
+        """O conteúdo de um hash e o seu histórico, ou None se não estiver no acervo."""
+        found = self.find(file_hash=file_hash)
+        return found[0] if found else None
+
+    def find(self, file_hash: Optional[str] = None, name: Optional[str] = None,
+             execution_id: Optional[str] = None) -> List[ArchivedFile]:
+        """
+        Consulta o catálogo.
+
+        Args:
+            file_hash (str, optional): O hash do conteúdo.
+            name (str, optional): Um nome com que o conteúdo foi recebido.
+            execution_id (str, optional): Uma execução que carregou o conteúdo.
+
+        Returns:
+            list: Os conteúdos encontrados, do recebimento mais recente ao mais antigo.
+        """
+        filters, params = [], []
+        if file_hash is not None:
+            filters.append("o.hash = ?")
+            params.append(file_hash)
+        if name is not None:
+            filters.append("o.hash IN (SELECT hash FROM recebimentos WHERE nome = ?)")
+            params.append(name)
+        if execution_id is not None:
+            filters.append("o.hash IN (SELECT hash FROM execucoes WHERE execucao_id = ?)")
+            params.append(str(execution_id))
+        where = f"WHERE {' AND '.join(filters)}" if filters else ""
+
+        with closing(self._connect()) as catalog:
+            objects = catalog.execute(
+                "SELECT o.hash, o.caminho, o.compactado, o.pendente, o.tamanho_original, "
+                "o.tamanho_armazenado, MAX(r.rowid) AS ultimo "
+                f"FROM objetos o LEFT JOIN recebimentos r ON r.hash = o.hash {where} "
+                "GROUP BY o.hash ORDER BY ultimo DESC", params).fetchall()
+            found = []
+            for file_hash, path, compressed, pending, size, stored_size, _ in objects:
+                path = self.root / path
+                archived = ArchivedFile(file_hash, self._staging_path(path.name) if pending else path,
+                                        bool(compressed), bool(pending), size, stored_size)
+                for received_name, archived_at in catalog.execute(
+                        "SELECT nome, data_arquivamento FROM recebimentos WHERE hash = ? ORDER BY rowid",
+                        (file_hash,)):
+                    archived.names.append(received_name)
+                    archived.archived_at.append(archived_at)
+                archived.execution_ids = [row[0] for row in catalog.execute(
+                    "SELECT execucao_id FROM execucoes WHERE hash = ? ORDER BY rowid", (file_hash,))]
+                found.append(archived)
+        return found
+
+    def _readable(self, file_hash: str) -> Optional[ArchivedFile]:
+        """O conteúdo de um hash, reconsultado se a compressão terminar durante a consulta."""
+        archived = self.get(file_hash)
+        if archived is not None and archived.pending and not archived.path.exists():
+            archived = self.get(file_hash)
+        return archived
+
+    @contextmanager
+    def open(self, file_hash: str) -> Iterator[BinaryIO]:
+        """
+        Abre o conteúdo original de um hash como um stream binário, descompactado
+        em streaming (sem cópia em disco).
+
+        Raises:
+            KeyError: Se o hash não estiver no acervo.
+        """
+        archived = self._readable(file_hash)
+        if archived is None:
+            raise KeyError(f"Hash {file_hash} não encontrado no acervo {self.root}")
+        if archived.compressed and not archived.pending:
+            import zstandard
+
+            reader = zstandard.ZstdDecompressor().stream_reader(open(archived.path, 'rb'), closefd=True)
+            with io.BufferedReader(reader) as stream:
+                yield stream
+        else:
+            with open(archived.path, 'rb') as stream:
+                yield stream
+
+    def source(self, file_hash: str, member: Optional[str] = None,
+               sheet: Optional[str] = None) -> Optional[InputSource]:
+        """
+        A fonte (`InputSource`) de um conteúdo do acervo, lida pelos mesmos
+        leitores da carga: CSVs compactados pelo acervo são descompactados em
+        streaming, e membros de `.zip` e planilhas são lidos do objeto original.
+
+        Args:
+            file_hash (str): O hash do arquivo.
+            member (str, optional): O membro do `.zip`.
+            sheet (str, optional): A planilha da pasta de trabalho.
+
+        Returns:
+            InputSource: A fonte, ou None se o hash não estiver no acervo.
+        """
+        archived = self._readable(file_hash)
+        if archived is None:
+            return None
+        return InputSource(archived.path, member, sheet)
+
+
+_store: Optional[ArchiveStore] = None
+_store_lock = threading.Lock()
+
+
+def get_archive_store(processed_dir: Path, etl_config) -> Optional[ArchiveStore]:
+    """
+    O acervo do processo, criado no primeiro uso (as compressões interrompidas
+    são reagendadas nesse momento).
+
+    Args:
+        processed_dir (Path): Diretório de arquivos processados.
+        etl_config (ETLConfig): A configuração do ETL.
+
+    Returns:
+        ArchiveStore: O acervo, ou None fora do modo `ETL_ARCHIVE_MODE=store`.
+    """
+    global _store
+    if etl_config.archive_mode != 'store':
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = ArchiveStore(Path(processed_dir) / ARCHIVE_DIRNAME, etl_config.archive_zstd_level)
+            recovered = _store.recover()
+            if recovered:
+                print(f"🗜️  Compressões pendentes retomadas no acervo: {recovered}")
+        return _store
+
+
+def close_archive_store() -> None:
+    """Espera as compressões em segundo plano e fecha o acervo do processo, se houver um."""
+    global _store
+    with _store_lock:
+        if _store is not None:
+            _store.close()
+            _store = None
+
+
+def open_archive(processed_dir: Path) -> Optional[ArchiveStore]:
+    """
+    Abre o acervo de `processed_dir` para leitura, se ele existir, qualquer que
+    seja o `ETL_ARCHIVE_MODE` atual (ex: arquivos guardados antes de voltar ao
+    modo 'move').
+
+    Reaproveita o acervo do processo (`get_archive_store`), se for o mesmo
+    diretório; senão, o acervo é aberto só para leitura, sem thread de
+    compressão nem recursos a fechar.
+    """
+    root = Path(processed_dir) / ARCHIVE_DIRNAME
+    with _store_lock:
+        if _store is not None and _store.root.resolve() == root.resolve():
+            return _store
+    if not (root / CATALOG_NAME).exists():
+        return None
+    return ArchiveStore(root, read_only=True)
@@ -6,18 +6,33 @@ do PostgreSQL, garantindo alta performance.
 
 Principais funcionalidades:
 - Detecção de arquivos duplicados através de hash MD5.
-- Validação de cabeçalhos contra templates pré-definidos.
+- Validação antecipada de cabeçalhos contra templates pré-definidos, antes do parse completo.
 - Limpeza de dados numéricos e de data.
 - Registro de auditoria detalhado para cada execução.
-- Log de linhas rejeitadas com motivos claros.
+- Log de linhas rejeitadas com motivos claros: com o registro completo em
+  JSON ou, no modo compacto (`ETL_REJECTION_LOG_MODE=compact`), apenas com a
+  linha e os campos, recuperáveis do arquivo arquivado (ver `python.core.row_resolver`).
+- Quarentena das linhas rejeitadas e avisadas em Parquet, com apenas as
+  contagens no banco (`ETL_REJECTION_LOG_MODE=quarantine`, ver `python.core.quarantine`).
+- Limite de exemplos por campo e motivo no log de rejeições, com o restante
+  apenas contado (`ETL_REJECTION_SAMPLE_SIZE`, ver `python.utils.rejection_summary`).
 - Movimentação automática de arquivos processados.
+- Leitura em streaming de arquivos compactados (.gz, .zst e .zip).
+- Pastas de trabalho com várias planilhas, carregadas em paralelo.
+- Checkpoints da carga de arquivos grandes, retomada após falhas e novas
+  tentativas em quedas de conexão.
+- Tempo e vazão de cada etapa da carga (`auditoria.metrica_etapa`).
+- Perfil de desempenho e de memória de cada arquivo (`ETL_PROFILING`).
 """
 
-import pandas as pd
 import sys
 import io
-import re
+import importlib.util
+import itertools
+import json
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 from datetime import datetime
 from pathlib import Path
 from abc import ABC, abstractmethod
@@ -25,35 +40,59 @@ from abc import ABC, abstractmethod
 # Adiciona o diretório raiz do projeto ao sys.path para importações relativas
 sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
-from python.utils.db_connection import get_db_connection, get_cursor
-from python.utils.audit import registrar_execucao, finalizar_execucao
-from python.core.data_cleaner import DataCleaner
+from python.utils.db_connection import acquire_connection, release_connection, get_cursor
+from python.utils.audit import (Checkpoint, buscar_checkpoint, criar_tabela_checkpoint,
+                                criar_tabela_resumo_rejeicao, finalizar_execucao,
+                                registrar_execucao, registrar_resumo_rejeicao,
+                                retomar_execucao, salvar_checkpoint)
+from python.utils.config import get_config
+from python.utils import metrics as prometheus
+from python.utils.rejection_summary import LogRateLimiter, RejectionSampler
+from python.core.archive import get_archive_store
 from python.core.file_handler import FileHandler
 from python.core.validator import Validator
+from python.core.readers import CSV_SUFFIXES, COLUMNAR_SUFFIXES, read_header, iter_batches
+from python.core.conversion_cache import ConversionCache
+from python.core.inputs import InputSource, expand_inputs, load_workbooks
+from python.core.job_queue import advisory_lock
+from python.core.pipeline import prefetch
+from python.core.failure_rate import ColumnFailureStats, FailureRateExceeded
+from python.core.quarantine import QuarantineWriter
+from python.core.rules import compile_rules
+from python.core.row_resolver import split_source_name
+from python.core.stage_metrics import StageMetrics
 
 # Definição dos diretórios padrão
 INPUT_DIR = Path("docker/data/input")
 PROCESSED_DIR = Path("docker/data/processed")
 TEMPLATE_DIR = Path("docker/data/templates")
 
-# Cria os diretórios se não existirem
-PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
-TEMPLATE_DIR.mkdir(parents=True, exist_ok=True)
+
+def _connection_errors():
+    """
+    Falhas de conexão com o banco, que justificam uma nova tentativa do arquivo.
+
+    Usada direto na cláusula `except`, que só é avaliada quando há uma
+    exceção: o `psycopg2` não é importado junto com este módulo.
+    """
+    from psycopg2 import InterfaceError, OperationalError
+    return (OperationalError, InterfaceError, ConnectionError)
 
 class BaseIngestor(ABC):
     """
     Classe base abstrata para ingestores da camada Bronze.
     
     Esta classe implementa o fluxo principal de ingestão, incluindo:
-    - Leitura de arquivos (CSV, Excel).
-    - Validação de estrutura e dados.
+    - Leitura de arquivos (CSV, Excel, ODS, Parquet, Arrow IPC) em lotes de tamanho limitado.
+    - Validação de estrutura e dados, incluindo as regras declaradas por coluna
+      (`rules`, ver `python.core.rules`).
     - Carga otimizada no banco de dados via `COPY`.
     - Auditoria e logging.
     
     As subclasses devem implementar `get_column_mapping`.
     """
 
-    def __init__(self, name, target_table, mandatory_cols):
+    def __init__(self, name, target_table, mandatory_cols, rules=None):
         """
         Inicializa o ingestor.
 
@@ -61,13 +100,42 @@ class BaseIngestor(ABC):
             name (str): Nome do ingestor (ex: "faturamento").
             target_table (str): Tabela de destino no banco (ex: "bronze.faturamento").
             mandatory_cols (list): Lista de colunas obrigatórias.
+            rules (dict, optional): Regras de validação por coluna, com os nomes
+                                    do banco (ver `python.core.rules`).
         """
         self.name = name
         self.target_table = target_table
         self.mandatory_cols = mandatory_cols
+        self.rules = compile_rules(rules or {})
         
-        self.file_handler = FileHandler(PROCESSED_DIR)
-        self.validator = Validator(TEMPLATE_DIR)
+        config = get_config()
+        self.etl_config = config.etl
+        self.batch_size = config.csv.chunk_size
+        self.file_handler = FileHandler(PROCESSED_DIR, get_archive_store(PROCESSED_DIR, self.etl_config))
+        self.validator = Validator(TEMPLATE_DIR, self.etl_config.template_cache_file)
+        self.conversion_cache = ConversionCache.from_config(self.etl_config)
+        # Esquema da tabela de destino, consultado no primeiro arquivo (ver `_get_table_schema`)
+        self._table_schema = None
+        # Se a tabela de checkpoints já foi criada por esta instância
+        self._checkpoint_table_ready = False
+        # Modo do log de rejeições ('full', 'compact' ou 'quarantine'); a quarentena depende do pyarrow
+        self.rejection_log_mode = self.etl_config.rejection_log_mode
+        if self.rejection_log_mode == 'quarantine' and importlib.util.find_spec('pyarrow') is None:
+            print("   ⚠️  pyarrow não instalado. Quarentena desabilitada: rejeições vão para o log completo.")
+            self.rejection_log_mode = 'full'
+        self._summary_table_ready = False
+
+    def warm_up(self, conn):
+        """
+        Carrega antecipadamente o esquema da tabela de destino e o template do
+        ingestor, para que o primeiro arquivo de um processo de longa duração
+        não pague por essas consultas.
+
+        Args:
+            conn: Conexão com o banco de dados.
+        """
+        self._get_table_schema(conn)
+        self.validator.registry.get(self.name)
 
     @abstractmethod
     def get_column_mapping(self):
@@ -99,75 +167,736 @@ class BaseIngestor(ABC):
             """, (file_hash,))
             return cur.fetchone() is not None
 
-    def run(self, file_pattern):
+    def run(self, file_pattern, sources=None):
         """
         Orquestra a execução do pipeline de ingestão para um padrão de arquivo.
 
+        Arquivos `.zip` são expandidos em uma ingestão por membro, e pastas de
+        trabalho com várias planilhas em uma ingestão por planilha. A expansão
+        e o hash do próximo arquivo são calculados em segundo plano enquanto o
+        arquivo atual é carregado no banco.
+
         Args:
             file_pattern (str): Padrão de nome de arquivo (glob) a ser procurado 
                                 no diretório de entrada.
+            sources (list, optional): Fontes (`InputSource`) já expandidas a
+                                      processar, como membros de `.zip` ou
+                                      planilhas destinados a este ingestor.
+                                      Quando informado, o arquivo não é movido (o
+                                      chamador o move após processar as demais
+                                      fontes com outros ingestores).
+
+        Returns:
+            dict: `{arquivo: [(is_duplicate, execucao_id), ...]}`, um item por
+                  fonte processada (`execucao_id` é None se a fonte não gerou
+                  execução, ex: duplicata).
         """
-        files = list(INPUT_DIR.glob(file_pattern))
-        if not files:
-            print(f"[{self.name}] ⚠️  Nenhum arquivo encontrado para o padrão: {file_pattern}")
-            return
+        if sources is None:
+            files = list(INPUT_DIR.glob(file_pattern))
+            if not files:
+                print(f"[{self.name}] ⚠️  Nenhum arquivo encontrado para o padrão: {file_pattern}")
+                return {}
+            groups = ((file_path, expand_inputs(file_path, sheets=True)) for file_path in files)
+        else:
+            grouped = {}
+            for source in sources:
+                grouped.setdefault(source.path, []).append(source)
+            groups = iter(grouped.items())
 
-        conn = get_db_connection()
-        
-        for file_path in files:
-            print(f"[{self.name}] 📂 Processando: {file_path.name}")
-            is_duplicate = self.process_file(conn, file_path)
-            
+        def hashed(groups):
+            for file_path, file_sources in groups:
+                hashes, metrics = [], []
+                for source in file_sources:
+                    source_metrics = StageMetrics(self.name)
+                    with source_metrics.stage('hash', nbytes=source.size):
+                        hashes.append(source.content_hash())
+                    metrics.append(source_metrics)
+                yield file_path, file_sources, hashes, metrics
+
+        conn = acquire_connection()
+        results = {}
+        try:
+            with closing(prefetch(hashed(groups), min(1, self.etl_config.pipeline_depth),
+                                  name=f"{self.name}-hash")) as pending:
+                for file_path, file_sources, hashes, metrics in pending:
+                    # As planilhas leem uma única cópia em memória da pasta de
+                    # trabalho, descartada junto com as fontes do arquivo
+                    file_sources = load_workbooks(file_sources)
+                    if any(source.sheet for source in file_sources) and len(file_sources) > 1:
+                        duplicates = self._process_sheets(file_sources, hashes, metrics)
+                    else:
+                        duplicates = []
+                        for source, file_hash, source_metrics in zip(file_sources, hashes, metrics):
+                            if conn.closed:
+                                # A conexão caiu no arquivo anterior
+                                release_connection(conn)
+                                conn = None
+                                conn = acquire_connection()
+                            print(f"[{self.name}] 📂 Processando: {source.name}")
+                            duplicates.append(self.process_file(conn, source, file_hash, source_metrics))
+                    execution_ids = [source_metrics.execution_id for source_metrics in metrics]
+                    results[file_path] = list(zip(duplicates, execution_ids))
+
+                    if sources is not None:
+                        continue
+                    try:
+                        size = file_path.stat().st_size
+                        start = time.perf_counter()
+                        dest = self.file_handler.move_to_processed(
+                            file_path, is_duplicate=bool(duplicates) and all(duplicates),
+                            execution_ids=execution_ids, file_hash=self._file_hash(file_sources[0], hashes[0]))
+                        elapsed = time.perf_counter() - start
+                        print(f"   📂 Arquivo movido para: {dest.relative_to(PROCESSED_DIR)}")
+                    except Exception as e:
+                        print(f"   ⚠️  Erro ao mover o arquivo: {e}")
+                        continue
+                    # A movimentação é registrada em cada execução gerada pelo arquivo
+                    for source_metrics in metrics:
+                        source_metrics.add('movimentacao', elapsed, nbytes=size)
+                        if source_metrics.execution_id is not None and not conn.closed:
+                            self._save_metrics(conn, source_metrics)
+        finally:
+            if conn is not None:
+                release_connection(conn)
+        return results
+
+    @staticmethod
+    def _file_hash(source, source_hash):
+        """
+        Retorna o hash MD5 do arquivo em disco de uma fonte, se ele já foi
+        calculado junto com o da fonte: arquivos simples e pastas de trabalho
+        (hash base das planilhas). Membros de `.zip` têm hashes próprios (`None`).
+        """
+        if source.member:
+            return None
+        if source.workbook_hash is not None:
+            return source.workbook_hash
+        if not source.sheet:
+            return source_hash
+        return None
+
+    def _quarantine_dir(self, file_path, file_hash):
+        """
+        Diretório da quarentena de uma carga: ao lado do arquivo no acervo, se
+        ele estiver habilitado, ou `None` (diretório do dia, ver `QuarantineWriter`).
+        """
+        archive = self.file_handler.archive
+        if archive is None:
+            return None
+        archive_hash = self._file_hash(file_path, file_hash) or FileHandler.calculate_hash(file_path.path)
+        return archive.quarantine_dir(archive_hash)
+
+    def _process_sheets(self, sources, hashes, metrics):
+        """
+        Processa as planilhas de uma pasta de trabalho em paralelo.
+
+        Cada planilha usa a sua própria conexão (um `COPY` por conexão) e gera
+        a sua própria entrada na auditoria. O conteúdo da pasta de trabalho já
+        está em memória, compartilhado entre as planilhas.
+
+        Args:
+            sources (list): As fontes das planilhas.
+            hashes (list): O hash de cada fonte, na mesma ordem.
+            metrics (list): O `StageMetrics` de cada fonte, na mesma ordem.
+
+        Returns:
+            list: `is_duplicate` de cada planilha, na ordem recebida.
+        """
+        def process_sheet(source, file_hash, source_metrics):
+            print(f"[{self.name}] 📂 Processando: {source.name}")
+            conn = acquire_connection()
             try:
-                dest = self.file_handler.move_to_processed(file_path, is_duplicate=is_duplicate)
-                print(f"   📂 Arquivo movido para: {dest.relative_to(PROCESSED_DIR)}")
+                return self.process_file(conn, source, file_hash, source_metrics)
             except Exception as e:
-                print(f"   ⚠️  Erro ao mover o arquivo: {e}")
+                # O erro já foi registrado na auditoria; as demais planilhas seguem
+                print(f"   ❌ Falha ao processar {source.name}: {e}")
+                return False
+            finally:
+                release_connection(conn)
 
-        conn.close()
+        workers = max(1, min(len(sources), self.etl_config.sheet_workers))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{self.name}-sheet") as executor:
+            return list(executor.map(process_sheet, sources, hashes, metrics))
 
-    def process_file(self, conn, file_path):
+    def process_file(self, conn, file_path, file_hash=None, metrics=None):
         """
         Processa um único arquivo, desde a leitura até a carga no banco.
 
+        O arquivo é lido em lotes (`CSV_CHUNK_SIZE` linhas por lote, para CSV
+        e planilhas). Cada lote
+        passa pela mesma limpeza e validação e é enviado ao banco via `COPY`
+        dentro de uma única transação, confirmada apenas ao final do arquivo.
+        Planilhas já convertidas em uma execução anterior (mesmo hash) são
+        lidas do cache de conversão, sem novo parse. Arquivos compactados são
+        descompactados em streaming; o hash é o dos bytes compactados. Cada
+        planilha de uma pasta de trabalho é uma carga independente. Um mesmo
+        conteúdo nunca é carregado ao mesmo tempo por dois workers (advisory
+        lock do PostgreSQL pelo hash).
+
+        Com `ETL_CHECKPOINT_ROWS`, a transação é confirmada a cada N linhas,
+        junto com um checkpoint, e um arquivo interrompido é retomado do
+        último checkpoint. Falhas de conexão são tentadas de novo até
+        `ETL_MAX_RETRIES` vezes, a cada `ETL_RETRY_DELAY` segundos, com uma
+        nova conexão se a atual tiver caído.
+
+        O tempo, as linhas e os bytes de cada etapa são gravados em
+        `auditoria.metrica_etapa`, ligados à execução. Com `ETL_PROFILING`,
+        o processamento também passa pelo profiler (ver `python.core.profiler`).
+
         Args:
             conn: Conexão com o banco de dados.
-            file_path (Path): Caminho do arquivo a ser processado.
+            file_path (Path | InputSource): Arquivo (membro de `.zip` ou planilha) a ser processado.
+            file_hash (str, optional): Hash do arquivo, se já calculado (ex: em
+                                       segundo plano por `run`).
+            metrics (StageMetrics, optional): Acumulador das métricas por etapa
+                                              (ex: já com o tempo do hash).
 
         Returns:
             bool: True se o arquivo for uma duplicata, False caso contrário.
         """
         start_time = time.time()
-        
-        file_hash = self.file_handler.calculate_hash(file_path)
+        if not isinstance(file_path, InputSource):
+            file_path = InputSource(Path(file_path))
+        if metrics is None:
+            metrics = StageMetrics(self.name)
+
+        if not self.etl_config.enable_profiling:
+            return self._process_with_retries(conn, file_path, file_hash, start_time, metrics)
+
+        from python.core.profiler import FileProfiler
+        from python.utils.logger import setup_logger
+
+        logs_dir = get_config().paths.logs_dir
+        profiler = FileProfiler(logs_dir, thread_names={self._prepare_thread_name(file_path)})
+        try:
+            with profiler:
+                return self._process_with_retries(conn, file_path, file_hash, start_time, metrics)
+        finally:
+            try:
+                base = profiler.write(file_path.name, metrics.execution_id)
+                setup_logger('profiler', log_dir=logs_dir).info(
+                    f"Perfil de {file_path.name} (execução {metrics.execution_id}): "
+                    f"{profiler.summary()}\nArquivos: {base}.*")
+            except Exception as e:
+                print(f"   ⚠️  Não foi possível gravar o perfil do arquivo: {e}")
+
+    def reingest(self, conn, source_name, file_hash, batches, metrics=None):
+        """
+        Carrega linhas corrigidas de um arquivo já processado (ex: as rejeições
+        da quarentena), sem remover as linhas já carregadas do arquivo.
+
+        As linhas passam pela mesma validação, limpeza e auditoria de uma
+        carga normal, em uma nova execução com o nome de origem do arquivo
+        (`source_filename`). Uma nova carga do arquivo original substitui
+        também as linhas recarregadas.
+
+        Args:
+            conn: Conexão com o banco de dados.
+            source_name (str): O nome de origem do arquivo (`InputSource.name`).
+            file_hash (str): Hash do conteúdo recarregado (evita recarregá-lo duas vezes).
+            batches (Iterator[pd.DataFrame]): Lotes com as colunas do arquivo e
+                                              o índice das linhas originais (linha - 2).
+            metrics (StageMetrics, optional): Acumulador das métricas por etapa.
+
+        Returns:
+            bool: True se o conteúdo já tiver sido recarregado, False caso contrário.
+        """
+        start_time = time.time()
+        file_name, member, sheet = split_source_name(source_name)
+        source = InputSource(Path(file_name), member, sheet)
+        if metrics is None:
+            metrics = StageMetrics(self.name)
+
+        with advisory_lock(conn, file_hash):
+            if self.check_duplicate(conn, file_hash):
+                print(f"   ⚠️  Conteúdo já recarregado (Hash: {file_hash}).")
+                prometheus.DUPLICATES_SKIPPED.inc(self.name)
+                return True
+            first_batch = next(batches, None)
+            if first_batch is None:
+                return False
+            if not self._validate_headers(conn, source, file_hash, first_batch.columns):
+                return False
+            return self._load_batches(conn, source, file_hash, itertools.chain([first_batch], batches),
+                                      start_time, metrics, replace=False)
+
+    def _process_with_retries(self, conn, file_path, file_hash, start_time, metrics):
+        """
+        Etapas de `process_file` com as novas tentativas em falhas de conexão:
+        o hash (se ainda não calculado) e `_process_locked`.
+        """
+        if file_hash is None:
+            with metrics.stage('hash', nbytes=file_path.size):
+                file_hash = file_path.content_hash()
+
+        attempt = 0
+        # Execução da tentativa anterior que ficou 'em_execucao' com a conexão perdida
+        interrupted = closed_id = None
+        while True:
+            attempt_conn = conn
+            try:
+                if attempt_conn.closed:
+                    attempt_conn = acquire_connection()
+                if interrupted is not None:
+                    # Sem checkpoints, a nova tentativa recomeça do zero com outra
+                    # execução: a anterior é encerrada como 'erro'
+                    exec_id, message = interrupted
+                    finalizar_execucao(attempt_conn, exec_id, "erro", mensagem_erro=message)
+                    interrupted = None
+                # Outros workers (containers ou hosts) processando o mesmo conteúdo são
+                # aguardados, para que a checagem de duplicatas enxergue o resultado deles
+                with advisory_lock(attempt_conn, file_hash):
+                    return self._process_locked(attempt_conn, file_path, file_hash, start_time, metrics)
+            except _connection_errors() as e:
+                attempt += 1
+                if attempt > self.etl_config.max_retries:
+                    raise
+                # Com checkpoints, a execução interrompida é retomada pela próxima tentativa
+                # ou, sem nenhum checkpoint confirmado, encerrada por `buscar_checkpoint`
+                if (self.etl_config.checkpoint_rows <= 0 and attempt_conn.closed
+                        and metrics.execution_id is not None and metrics.execution_id != closed_id):
+                    interrupted = (metrics.execution_id, f"Conexão perdida: {str(e).strip()}")
+                    closed_id = metrics.execution_id
+                print(f"   🔁 Falha de conexão com o banco ({str(e).strip()}). Nova tentativa "
+                      f"{attempt}/{self.etl_config.max_retries} em {self.etl_config.retry_delay_seconds}s...")
+                time.sleep(self.etl_config.retry_delay_seconds)
+            finally:
+                if attempt_conn is not conn:
+                    release_connection(attempt_conn)
+
+    def _process_locked(self, conn, file_path, file_hash, start_time, metrics):
+        """
+        Etapas de `process_file` executadas com o lock do hash do arquivo:
+        checagem de duplicata, validação do cabeçalho, leitura e carga.
+        """
         if self.check_duplicate(conn, file_hash):
             print(f"   ⚠️  Arquivo duplicado detectado (Hash: {file_hash}). O arquivo não será reprocessado.")
+            prometheus.DUPLICATES_SKIPPED.inc(self.name)
             return True
 
-        try:
-            sep = self.file_handler.detect_separator(file_path)
-            if file_path.suffix == '.csv':
+        resume = self._find_checkpoint(conn, file_path, file_hash)
+
+        # O arquivo é aberto uma única vez: a sonda lê só o cabeçalho e o mesmo
+        # stream é rebobinado para a leitura dos lotes. Um arquivo com o template
+        # errado é rejeitado antes de qualquer parse de dados.
+        with file_path.open() as stream:
+            with metrics.stage('validacao_cabecalho'):
                 try:
-                    df = pd.read_csv(file_path, sep=sep, encoding='utf-8', dtype=str, 
-                                    engine='c', on_bad_lines='skip')
-                except UnicodeDecodeError:
-                    df = pd.read_csv(file_path, sep=sep, encoding='latin-1', dtype=str, 
-                                    engine='c', on_bad_lines='skip')
-            else:
-                df = pd.read_excel(file_path, dtype=str)
-        except Exception as e:
-            print(f"   ❌ Erro fatal na leitura do arquivo: {e}")
-            return False
+                    header = read_header(stream, file_path.suffix, file_path.sheet)
+                except Exception as e:
+                    print(f"   ❌ Erro fatal na leitura do cabeçalho do arquivo: {e}")
+                    prometheus.FILES_PROCESSED.inc(self.name, 'erro')
+                    return False
+
+                if header is not None and not self._validate_headers(conn, file_path, file_hash, header.columns):
+                    return False
+
+            try:
+                stream.seek(0)
+                reader = metrics.timed_iter('leitura', self._read_batches(
+                    stream, file_path, file_hash, header, resume), nbytes=file_path.size)
+                first_batch = next(reader, None)
+            except Exception as e:
+                print(f"   ❌ Erro fatal na leitura do arquivo: {e}")
+                prometheus.FILES_PROCESSED.inc(self.name, 'erro')
+                return False
+
+            # O leitor é fechado antes do arquivo, mesmo que a carga pare no meio (ex: abortada)
+            with closing(reader):
+                # Formatos sem sonda de cabeçalho (ex: .xls) são validados no primeiro lote
+                if (header is None and first_batch is not None
+                        and not self._validate_headers(conn, file_path, file_hash, first_batch.columns)):
+                    return False
+
+                batches = reader
+                if first_batch is not None:
+                    batches = itertools.chain([first_batch], reader)
+                return self._load_batches(conn, file_path, file_hash, batches, start_time, metrics, resume)
+
+    def _find_checkpoint(self, conn, file_path, file_hash):
+        """
+        Retorna o checkpoint da última carga interrompida do arquivo, se os
+        checkpoints estiverem habilitados e houver uma.
+        """
+        if self.etl_config.checkpoint_rows <= 0:
+            return None
+        if not self._checkpoint_table_ready:
+            criar_tabela_checkpoint(conn)
+            self._checkpoint_table_ready = True
+        return buscar_checkpoint(conn, file_hash, file_path.name, self.target_table)
+
+    def _read_batches(self, stream, file_path, file_hash, header, resume=None):
+        """
+        Retorna o iterador de lotes do arquivo.
+
+        Planilhas passam pelo cache de conversão (se habilitado). CSVs são lidos
+        diretamente, pois o parse do CSV já é tão barato quanto ler o Parquet, e
+        Parquet/Arrow IPC já são colunares.
+
+        Com checkpoints, os lotes de CSV registram a posição em bytes em que
+        terminam, e a retomada de um CSV começa direto nessa posição. Nos
+        demais formatos, as linhas já confirmadas são lidas e descartadas,
+        sem limpeza nem `COPY`.
+        """
+        def parse(**kwargs):
+            return iter_batches(stream, file_path.suffix, header, self.batch_size,
+                                self.etl_config.spreadsheet_backend, file_path.sheet, **kwargs)
+
+        suffix = file_path.suffix.lower()
+        track_offsets = suffix in CSV_SUFFIXES and self.etl_config.checkpoint_rows > 0
+        if track_offsets and resume is not None and resume.byte_offset is not None:
+            return parse(track_offsets=True, start_offset=resume.byte_offset,
+                         start_row=resume.numero_linha)
+
+        if self.conversion_cache is None or suffix in CSV_SUFFIXES + COLUMNAR_SUFFIXES:
+            batches = parse(track_offsets=track_offsets)
+        else:
+            batches = self.conversion_cache.batches(file_hash, parse, self.batch_size)
+        if resume is not None:
+            batches = self._skip_rows(batches, resume.numero_linha)
+        return batches
+
+    @staticmethod
+    def _skip_rows(batches, rows):
+        """Descarta as `rows` primeiras linhas de dados (pelo índice contínuo dos lotes)."""
+        for batch in batches:
+            if len(batch) and batch.index[-1] < rows:
+                continue
+            yield batch[batch.index >= rows]
+
+    def _load_batches(self, conn, file_path, file_hash, batches, start_time, metrics, resume=None,
+                      replace=True):
+        """
+        Limpa, valida e carrega os lotes de um arquivo no banco.
+
+        A remoção dos dados antigos do arquivo, os `COPY` de todos os lotes e os
+        logs de rejeição formam uma única transação: em caso de erro, nada do
+        arquivo é confirmado. Com `ETL_CHECKPOINT_ROWS`, a transação é
+        confirmada a cada N linhas, junto com o checkpoint
+        (`auditoria.checkpoint_ingestao`) do trecho: em caso de erro, os
+        trechos já confirmados permanecem e a execução pode ser retomada.
+
+        No modo de quarentena, as linhas rejeitadas e avisadas vão para o
+        Parquet da execução, publicado a cada confirmação, e o banco recebe
+        apenas as contagens (`auditoria.resumo_rejeicao`). Com
+        `ETL_REJECTION_SAMPLE_SIZE`, o log recebe apenas os primeiros exemplos
+        de cada (severidade, campo, motivo), e o resumo, as contagens completas.
+
+        Com `ETL_ABORT_FAILURE_RATE`, a taxa de valores inválidos de cada
+        coluna é acompanhada lote a lote. Os primeiros lotes (até
+        `ETL_ABORT_MIN_ROWS` linhas) só são gravados depois da primeira
+        avaliação; se uma coluna passar do limite, a carga é desfeita e
+        finalizada como 'abortado', sem remover os dados antigos do arquivo.
+
+        Args:
+            conn: Conexão com o banco de dados.
+            file_path (InputSource): Arquivo (ou membro de `.zip`) em processamento.
+            file_hash (str): Hash MD5 do arquivo.
+            batches (Iterator[pd.DataFrame]): Os lotes de dados do arquivo.
+            start_time (float): Instante de início do processamento.
+            metrics (StageMetrics): Acumulador das métricas por etapa.
+            resume (Checkpoint, optional): O checkpoint da execução a retomar.
+                                           Os lotes já começam após ele.
+            replace (bool): Se False, as linhas já carregadas do arquivo não
+                            são removidas (ex: recarga da quarentena).
+
+        Returns:
+            bool: Sempre False (o arquivo não é uma duplicata).
+        """
+        db_cols, numeric_cols, date_cols = self._get_table_schema(conn)
+        checkpoint_rows = self.etl_config.checkpoint_rows
+
+        if resume is None:
+            exec_id = registrar_execucao(conn, f"ingest_{self.name}", "bronze",
+                                         file_path.name, self.target_table, file_hash)
+            committed = Checkpoint(exec_id, None, 0, 0, 0)
+        else:
+            exec_id = resume.execucao_id
+            retomar_execucao(conn, exec_id)
+            committed = resume
+            print(f"   ↩️  Retomando a execução {exec_id} a partir da linha {resume.numero_linha + 2} "
+                  f"({resume.linhas_inseridas} linhas já inseridas)")
+        metrics.execution_id = exec_id
+
+        total_rows = resume_rows = committed.numero_linha
+        inserted_count = resume_inserted = committed.linhas_inseridas
+        total_logged_entries = committed.linhas_log # To count both warnings and errors
+        # Avisos e rejeições desta tentativa, para as métricas do Prometheus
+        warned_count = rejected_count = 0
+        failure_stats = ColumnFailureStats(self.etl_config.abort_failure_rate, self.etl_config.abort_min_rows)
+        quarantine = sampler = None
+        if self.rejection_log_mode == 'quarantine':
+            # Recargas da quarentena não vêm de um arquivo do acervo
+            quarantine = QuarantineWriter(PROCESSED_DIR, exec_id,
+                                          self._quarantine_dir(file_path, file_hash) if replace else None)
+        elif self.etl_config.rejection_sample_size > 0:
+            sampler = RejectionSampler(self.etl_config.rejection_sample_size)
+        if (quarantine is not None or sampler is not None) and not self._summary_table_ready:
+            criar_tabela_resumo_rejeicao(conn)
+            self._summary_table_ready = True
+        # Uma linha por rejeição no console e em `logs/rejection_logger.log`, só
+        # com `ETL_REJECTION_LOG_RATE` (até essa quantidade de linhas por segundo)
+        rejection_log = limiter = None
+        if self.etl_config.rejection_log_rate > 0:
+            from python.utils.logger import setup_logger
+
+            rejection_log = setup_logger('rejection_logger', log_dir=get_config().paths.logs_dir)
+            limiter = LogRateLimiter(self.etl_config.rejection_log_rate)
 
         try:
-            self.validator.validate_headers(self.name, df.columns)
-        except ValueError as e:
+            # Os dados antigos do mesmo arquivo são removidos (para evitar duplicatas)
+            # só antes da primeira gravação: uma carga abortada não chega a tocá-los
+            clear_existing = resume is None and replace
+
+            def prepare(batch):
+                # Estágio de CPU: roda na thread produtora, enquanto o lote
+                # anterior é gravado no banco.
+                valid_df, error_df, warning_log_entries = self._prepare_batch(
+                    batch, db_cols, numeric_cols, date_cols, file_path.name, failure_stats, metrics)
+                failure_stats.add_rows(len(batch))
+                failure_stats.check()
+                buffer, buffer_size = None, 0
+                if not valid_df.empty:
+                    start = time.perf_counter()
+                    buffer = self.to_copy_buffer(valid_df)
+                    buffer_size = buffer.seek(0, io.SEEK_END)
+                    buffer.seek(0)
+                    metrics.add('serializacao', time.perf_counter() - start, len(valid_df), buffer_size)
+                error_entries = self._prepare_data_cleaner_error_entries(error_df, file_path.name, exec_id)
+                quarantined = None
+                if quarantine is not None:
+                    quarantined = quarantine.frame(batch, error_entries + warning_log_entries)
+                return (len(batch), valid_df, buffer, buffer_size, error_entries, warning_log_entries,
+                        quarantined, batch.attrs.get('end_offset'))
+
+            # Em caso de erro, o produtor é interrompido antes de o arquivo ser fechado
+            prepared = prefetch((prepare(batch) for batch in batches),
+                                self.etl_config.pipeline_depth, name=self._prepare_thread_name(file_path))
+            pending_rows = 0
+            with closing(prepared):
+                if failure_stats.max_rate > 0:
+                    prepared = self._hold_first_rows(prepared, failure_stats.min_rows)
+                for (rows, valid_df, buffer, buffer_size, error_entries, warning_log_entries,
+                     quarantined, end_offset) in prepared:
+                    if clear_existing:
+                        self._clear_existing(conn, file_path)
+                        clear_existing = False
+                    total_rows += rows
+                    pending_rows += rows
+
+                    if buffer is not None:
+                        with metrics.stage('copy', len(valid_df), buffer_size):
+                            inserted_count += self.copy_to_db(conn, valid_df, self.target_table,
+                                                              db_cols + ['source_filename'], commit=False,
+                                                              buffer=buffer)
+                        prometheus.COPY_BYTES.inc(self.name, amount=buffer_size)
+                    rejected_count += len(error_entries)
+                    warned_count += len(warning_log_entries)
+                    if limiter is not None:
+                        self._log_rejections(rejection_log, limiter, error_entries + warning_log_entries)
+
+                    if quarantine is not None:
+                        with metrics.stage('quarentena', len(error_entries) + len(warning_log_entries)):
+                            quarantine.write(quarantined)
+                        total_logged_entries += len(error_entries) + len(warning_log_entries)
+                    elif sampler is not None:
+                        with metrics.stage('log_rejeicao', len(error_entries) + len(warning_log_entries)):
+                            # Apenas os primeiros exemplos de cada campo e motivo; os demais são contados
+                            self.insert_log_entries(conn, sampler.filtrar(error_entries + warning_log_entries),
+                                                    exec_id, commit=False)
+                        total_logged_entries += len(error_entries) + len(warning_log_entries)
+                    else:
+                        with metrics.stage('log_rejeicao', len(error_entries) + len(warning_log_entries)):
+                            # Insert DataCleaner errors
+                            total_logged_entries += self.insert_log_entries(conn, error_entries, exec_id, commit=False)
+
+                            # Insert mandatory column warnings
+                            total_logged_entries += self.insert_log_entries(conn, warning_log_entries, exec_id, commit=False)
+
+                    if checkpoint_rows > 0 and pending_rows >= checkpoint_rows:
+                        checkpoint = Checkpoint(exec_id, end_offset, total_rows,
+                                                inserted_count, total_logged_entries)
+                        salvar_checkpoint(conn, checkpoint)
+                        self._commit(conn, exec_id, quarantine, sampler)
+                        committed = checkpoint
+                        pending_rows = 0
+
+            if clear_existing:
+                # Arquivo sem linhas: os dados antigos também são substituídos
+                self._clear_existing(conn, file_path)
+            self._commit(conn, exec_id, quarantine, sampler)
+
+            for col, kind, count in failure_stats.failures():
+                print(f"   ⚠️  {count} {kind} encontrados na coluna '{col}'")
+            if limiter is not None and limiter.omitidas:
+                rejection_log.warning(f"[REJEIÇÃO] Fim de {file_path.name}{limiter.sufixo()}")
+            if quarantine is not None and quarantine.files:
+                print(f"   🧪 {quarantine.rows} linhas em quarentena: "
+                      f"{', '.join(str(path.relative_to(PROCESSED_DIR)) for path in quarantine.files)}")
+            omitted = sampler.omitidas() if sampler is not None else {}
+            if omitted:
+                print(f"   📉 {sum(omitted.values())} entradas além de {sampler.amostras} exemplos por campo e "
+                      f"motivo ({len(omitted)} grupos): contagens em auditoria.resumo_rejeicao")
+
+            duration = time.time() - start_time
+            finalizar_execucao(conn, exec_id, "sucesso", total_rows, inserted_count, 0, total_logged_entries)
+            print(f"   ✓ Inseridos: {inserted_count}/{total_rows} | ⚠️/❌ Logs: {total_logged_entries} | ⏱️ {duration:.1f}s")
+            print(f"   ⏱️  Etapas: {metrics.summary()}")
+            prometheus.FILES_PROCESSED.inc(self.name, 'sucesso')
+            prometheus.ROWS_READ.inc(self.name, amount=total_rows - resume_rows)
+            prometheus.ROWS_INSERTED.inc(self.name, amount=inserted_count - resume_inserted)
+            prometheus.ROWS_WARNED.inc(self.name, amount=warned_count)
+            prometheus.ROWS_REJECTED.inc(self.name, amount=rejected_count)
+
+        except FailureRateExceeded as e:
+            # Arquivo com uma coluna inteira inválida (ex: formato decimal trocado na
+            # origem): a carga para no primeiro lote que passa do limite
             print(f"   ❌ {e}")
-            exec_id = registrar_execucao(conn, f"ingest_{self.name}", "bronze", 
-                                        file_path.name, self.target_table, file_hash)
-            finalizar_execucao(conn, exec_id, "erro", 0, 0, 0, 0, str(e))
+            prometheus.FILES_PROCESSED.inc(self.name, 'abortado')
+            if quarantine is not None:
+                quarantine.discard()
+            if sampler is not None:
+                sampler.descartar_pendentes()
+            conn.rollback()
+            # Linhas processadas = as analisadas até a decisão, ainda que não gravadas
+            finalizar_execucao(conn, exec_id, "abortado", resume_rows + failure_stats.rows,
+                               committed.linhas_inseridas, 0, committed.linhas_log, str(e))
+            if committed.numero_linha:
+                print(f"   💾 {committed.numero_linha} linhas confirmadas em checkpoints anteriores "
+                      f"permanecem na tabela; a execução abortada não é retomada.")
+            self._save_metrics(conn, metrics)
             return False
 
+        except Exception as e:
+            # A falha pode vir de uma alteração na tabela: o esquema é consultado de novo
+            self._table_schema = None
+            duration = time.time() - start_time
+            print(f"   ❌ Erro crítico durante a carga no banco: {e}")
+            prometheus.FILES_PROCESSED.inc(self.name, 'erro')
+            if quarantine is not None:
+                quarantine.discard()
+            if sampler is not None:
+                sampler.descartar_pendentes()
+            try:
+                conn.rollback()
+                finalizar_execucao(conn, exec_id, "erro", total_rows, committed.linhas_inseridas,
+                                   0, committed.linhas_log, str(e))
+            except _connection_errors() as audit_error:
+                # Conexão perdida: a execução fica 'em_execucao' e ainda pode ser retomada
+                print(f"   ⚠️  Não foi possível registrar o erro na auditoria: {audit_error}")
+            if committed.numero_linha:
+                print(f"   💾 {committed.numero_linha} linhas confirmadas até o último checkpoint; "
+                      f"a próxima tentativa continua a partir delas.")
+            if not conn.closed:
+                self._save_metrics(conn, metrics)
+            raise
+
+        self._save_metrics(conn, metrics)
+        return False
+
+    def _clear_existing(self, conn, file_path):
+        """Remove da tabela de destino as linhas de uma carga anterior do mesmo arquivo."""
+        with get_cursor(conn) as cur:
+            cur.execute(f"DELETE FROM {self.target_table} WHERE source_filename = %s",
+                        (file_path.name,))
+
+    @staticmethod
+    def _hold_first_rows(prepared, rows):
+        """
+        Retém os primeiros lotes preparados até somarem `rows` linhas (ou o
+        arquivo acabar). Com `ETL_ABORT_FAILURE_RATE`, a taxa de falhas da
+        amostra mínima é avaliada antes de qualquer gravação no banco.
+        """
+        held, seen = [], 0
+        for item in prepared:
+            held.append(item)
+            seen += item[0]
+            if seen >= rows:
+                break
+        yield from held
+        yield from prepared
+
+    @staticmethod
+    def _commit(conn, exec_id, quarantine=None, sampler=None):
+        """
+        Confirma o trecho em andamento da carga. As contagens de rejeições do
+        trecho (quarentena ou limite de exemplos) entram na mesma transação, e
+        o Parquet da quarentena é publicado após o `commit`.
+        """
+        if quarantine is not None:
+            registrar_resumo_rejeicao(conn, exec_id, quarantine.counts)
+        if sampler is not None:
+            registrar_resumo_rejeicao(conn, exec_id, sampler.pendentes())
+        conn.commit()
+        if quarantine is not None:
+            quarantine.publish()
+
+    def _prepare_thread_name(self, file_path):
+        """Nome da thread que prepara os lotes do arquivo (acompanhada pelo profiler)."""
+        return f"{self.name}-prepare:{file_path.name}"
+
+    @staticmethod
+    def _save_metrics(conn, metrics):
+        """
+        Grava as métricas por etapa da execução. Uma falha aqui não afeta a
+        carga, já confirmada: é apenas avisada.
+        """
+        try:
+            metrics.save(conn)
+        except Exception as e:
+            if not conn.closed:
+                conn.rollback()
+            print(f"   ⚠️  Não foi possível registrar as métricas das etapas: {e}")
+
+    def _get_table_schema(self, conn):
+        """
+        Consulta as colunas da tabela de destino e identifica as numéricas e de data.
+
+        O resultado fica em cache na instância: um processo de longa duração
+        (modo watch) consulta o esquema uma única vez, e não a cada arquivo.
+
+        Args:
+            conn: Conexão com o banco de dados.
+
+        Returns:
+            tuple: `(db_cols, numeric_cols, date_cols)`, onde `db_cols` exclui as
+                   colunas preenchidas pelo próprio banco ou pelo ingestor.
+        """
+        if self._table_schema is not None:
+            return self._table_schema
+
+        with get_cursor(conn) as cur:
+            cur.execute(f"SELECT * FROM {self.target_table} LIMIT 0")
+            db_cols_info = {desc[0]: desc[1] for desc in cur.description}
+            
+            db_cols = [desc[0] for desc in cur.description 
+                       if desc[0] not in ('id', 'data_carga', 'source_filename')]
+            numeric_cols = [name for name, oid in db_cols_info.items() if oid in (1700, 700, 701)]
+            date_cols = [name for name, oid in db_cols_info.items() if oid in (1082, 1114, 1184)]
+        self._table_schema = (db_cols, numeric_cols, date_cols)
+        return self._table_schema
+
+    def _prepare_batch(self, df, db_cols, numeric_cols, date_cols, filename, failure_stats, metrics):
+        """
+        Aplica o mapeamento de colunas, a checagem de obrigatórios, a limpeza
+        de tipos e as regras do ingestor a um lote de dados.
+
+        Args:
+            df (pd.DataFrame): O lote lido do arquivo.
+            db_cols (list): Colunas da tabela de destino.
+            numeric_cols (list): Colunas numéricas da tabela de destino.
+            date_cols (list): Colunas de data da tabela de destino.
+            filename (str): Nome do arquivo de origem (gravado em `source_filename`).
+            failure_stats (ColumnFailureStats): Acumulador de valores inválidos
+                                                por coluna ao longo do arquivo.
+            metrics (StageMetrics): Acumulador do tempo de cada etapa.
+
+        Returns:
+            tuple: `(valid_df, error_df, warning_log_entries)`.
+        """
+        import pandas as pd
+        from python.core.data_cleaner import DataCleaner
+
         mapping = self.get_column_mapping()
         df = df.rename(columns=mapping)
         df = df.loc[:, ~df.columns.duplicated()]
@@ -185,44 +914,32 @@ class BaseIngestor(ABC):
         valid_df = df.copy()
         error_df = pd.DataFrame(columns=df.columns)  # Exclusivo para erros do DataCleaner
 
+        start = time.perf_counter()
         warning_log_entries = []
-        # Cria máscara booleana para identificar linhas com campos obrigatórios vazios
-        rejected_by_mandatory_mask = pd.Series(False, index=df.index)
-        # Identifica todas as linhas que possuem pelo menos um campo obrigatório vazio
-        for col in self.mandatory_cols:
-            missing_mask = df[col].isna() | (df[col].astype(str).str.strip() == '')
-            rejected_by_mandatory_mask |= missing_mask  # OR lógico para acumular violações
-        
+        # Máscara de campos obrigatórios vazios, uma coluna por campo obrigatório
+        missing = pd.DataFrame({col: df[col].isna() | (df[col].astype(str).str.strip() == '')
+                                for col in self.mandatory_cols}, index=df.index)
+        # Linhas que possuem pelo menos um campo obrigatório vazio
+        flagged = missing[missing.any(axis=1)]
+
         # Para cada linha com campos obrigatórios faltantes, cria um warning log
         # Importante: estas linhas NÃO são rejeitadas, apenas avisadas (WARN vs ERROR)
-        for idx in df[rejected_by_mandatory_mask].index:
-            row_data = df.loc[idx].to_dict()
-            # Identifica exatamente quais campos obrigatórios estão vazios nesta linha
-            missing_cols_in_row = [c for c in self.mandatory_cols 
-                                   if pd.isna(row_data.get(c)) or str(row_data.get(c)).strip() == '']
-            
-            if missing_cols_in_row:
-                warning_log_entries.append({
-                    'script_nome': f"ingest_{self.name}",
-                    'tabela_destino': self.target_table,
-                    'numero_linha': idx + 2,  # +2: +1 para header, +1 para indexação começar em 1
-                    'campo_falha': ', '.join(missing_cols_in_row),
-                    'motivo_rejeicao': f"Campos obrigatórios vazios: {', '.join(missing_cols_in_row)}",
-                    'valor_recebido': None,
-                    'registro_completo': str(row_data),
-                    'severidade': 'WARN',  # WARN = não bloqueia ingestão, apenas registra
-                    'execucao_fk': None  # Será preenchido com exec_id após registro da execução
-                })
-
-
-        with get_cursor(conn) as cur:
-            cur.execute(f"SELECT * FROM {self.target_table} LIMIT 0")
-            db_cols_info = {desc[0]: desc[1] for desc in cur.description}
-            
-            db_cols = [desc[0] for desc in cur.description 
-                       if desc[0] not in ('id', 'data_carga', 'source_filename')]
-            numeric_cols = [name for name, oid in db_cols_info.items() if oid in (1700, 700, 701)]
-            date_cols = [name for name, oid in db_cols_info.items() if oid in (1082, 1114, 1184)]
+        records = self._records_as_json(df.loc[flagged.index])
+        for idx, row_flags, record in zip(flagged.index, flagged.to_numpy(), records):
+            # Exatamente quais campos obrigatórios estão vazios nesta linha
+            missing_cols_in_row = [c for c, is_missing in zip(flagged.columns, row_flags) if is_missing]
+            warning_log_entries.append({
+                'script_nome': f"ingest_{self.name}",
+                'tabela_destino': self.target_table,
+                'numero_linha': idx + 2,  # +2: +1 para header, +1 para indexação começar em 1
+                'campo_falha': ', '.join(missing_cols_in_row),
+                'motivo_rejeicao': f"Campos obrigatórios vazios: {', '.join(missing_cols_in_row)}",
+                'valor_recebido': None,
+                'registro_completo': record,
+                'severidade': 'WARN',  # WARN = não bloqueia ingestão, apenas registra
+                'execucao_fk': None  # Será preenchido com exec_id após registro da execução
+            })
+        metrics.add('obrigatorios', time.perf_counter() - start, len(df))
 
         # Garante que o DataFrame tenha todas as colunas do banco
         for col in db_cols:
@@ -234,6 +951,7 @@ class BaseIngestor(ABC):
         # e REJEITA linhas com valores inválidos (diferente de warnings acima)
         
         # Processamento de colunas numéricas: 1.000,50 → 1000.50
+        start = time.perf_counter()
         for col in numeric_cols:
             if col in valid_df.columns:
                 original = valid_df[col].copy()
@@ -242,7 +960,7 @@ class BaseIngestor(ABC):
                 # Identifica valores que falharam na conversão (ex: texto em campo numérico)
                 failed = DataCleaner.identify_errors(original, cleaned)
                 if failed.any():
-                    print(f"   ⚠️  {failed.sum()} valores numéricos inválidos encontrados na coluna '{col}'")
+                    failure_stats.add(col, 'valores numéricos inválidos', failed.sum())
                     
                     # Move linhas com erro para error_df (serão logadas com severidade ERROR)
                     rejected_indices = valid_df[failed].index
@@ -254,8 +972,10 @@ class BaseIngestor(ABC):
                     cleaned = cleaned.drop(rejected_indices)
                 
                 valid_df[col] = cleaned  # Substitui coluna original pela versão limpa
+        metrics.add('limpeza_numerica', time.perf_counter() - start, len(df))
 
         # Processamento de colunas de data: DD/MM/YYYY → YYYY-MM-DD (ISO format)
+        start = time.perf_counter()
         for col in date_cols:
             if col in valid_df.columns:
                 original = valid_df[col].copy()
@@ -264,7 +984,7 @@ class BaseIngestor(ABC):
                 # Identifica datas inválidas (ex: "32/13/2023" ou texto em campo de data)
                 failed = DataCleaner.identify_errors(original, cleaned)
                 if failed.any():
-                    print(f"   ⚠️  {failed.sum()} datas inválidas encontradas na coluna '{col}'")
+                    failure_stats.add(col, 'datas inválidas', failed.sum())
                     
                     # Move linhas com erro de data para error_df
                     rejected_indices = valid_df[failed].index
@@ -278,52 +998,101 @@ class BaseIngestor(ABC):
                 # Formata datas para string ISO (PostgreSQL aceita diretamente)
                 valid_df[col] = cleaned.dt.strftime('%Y-%m-%d')
                 valid_df.loc[cleaned.isna(), col] = None  # Mantém NaT como NULL
+        metrics.add('limpeza_datas', time.perf_counter() - start, len(df))
+
+        # Regras declaradas pelo ingestor (domínio, tamanho, CPF/CNPJ...), avaliadas
+        # sobre o lote inteiro: ERROR rejeita a linha, WARN só registra a falha
+        if self.rules:
+            start = time.perf_counter()
+            rejected = pd.Series(False, index=valid_df.index)
+            # As regras ERROR vêm primeiro: linhas rejeitadas não recebem avisos
+            for col, rule, failed in self.rules.evaluate(valid_df):
+                failed = failed & ~rejected
+                if not failed.any():
+                    continue
+                values = valid_df.loc[failed, col].astype(str)
+                if rule.severity == 'ERROR':
+                    failure_stats.add(col, rule.kind, failed.sum())
+                    new_errors = valid_df[failed].copy()
+                    new_errors['_custom_error'] = f"{rule.reason(col)}: " + values
+                    error_df = pd.concat([error_df, new_errors]) if not error_df.empty else new_errors
+                    rejected |= failed
+                    continue
+                records = self._records_as_json(df.loc[values.index])
+                warning_log_entries.extend({
+                    'script_nome': f"ingest_{self.name}",
+                    'tabela_destino': self.target_table,
+                    'numero_linha': idx + 2,
+                    'campo_falha': col,
+                    'motivo_rejeicao': f"{rule.reason(col)}: {value}",
+                    'valor_recebido': value[:500],
+                    'registro_completo': record,
+                    'severidade': 'WARN',
+                    'execucao_fk': None
+                } for idx, value, record in zip(values.index, values, records))
+            valid_df = valid_df[~rejected]
+            metrics.add('regras', time.perf_counter() - start, len(df))
 
         valid_df = valid_df[db_cols].copy()
-        valid_df['source_filename'] = file_path.name
-        
-        
-        exec_id = registrar_execucao(conn, f"ingest_{self.name}", "bronze", 
-                                     file_path.name, self.target_table, file_hash)
-        
-        # Assign exec_id to warning_log_entries
-        for entry in warning_log_entries:
-            entry['execucao_fk'] = exec_id
+        valid_df['source_filename'] = filename
 
-        inserted_count = 0
-        total_logged_entries = 0 # To count both warnings and errors
+        return valid_df, error_df, warning_log_entries
 
-        try:
-            # Limpa dados antigos do mesmo arquivo para evitar duplicatas
-            with get_cursor(conn) as cur:
-                cur.execute(f"DELETE FROM {self.target_table} WHERE source_filename = %s", 
-                           (file_path.name,))
-            
-            if not valid_df.empty:
-                inserted_count = self.copy_to_db(conn, valid_df, self.target_table, 
-                                                db_cols + ['source_filename'])
+    def _records_as_json(self, df):
+        """
+        O registro completo de cada linha, em JSON (`registro_completo` do log).
 
-            # Prepare and insert DataCleaner errors
-            data_cleaner_error_entries = self._prepare_data_cleaner_error_entries(error_df, file_path.name, exec_id)
-            total_logged_entries += self.insert_log_entries(conn, data_cleaner_error_entries, exec_id)
+        Nos modos compacto e de quarentena do log de rejeições, os registros
+        não são gravados (None): a linha é recuperada do arquivo arquivado ou
+        está no arquivo de quarentena.
+        """
+        if self.rejection_log_mode in ('compact', 'quarantine'):
+            return [None] * len(df)
+        records = df.astype(object).where(df.notna(), None).to_dict('records')
+        return [json.dumps(record, ensure_ascii=False, default=str) for record in records]
 
-            # Insert mandatory column warnings
-            total_logged_entries += self.insert_log_entries(conn, warning_log_entries, exec_id)
+    def _validate_headers(self, conn, file_path, file_hash, columns):
+        """
+        Valida o cabeçalho do arquivo contra o template do ingestor, registrando
+        a execução com status 'erro' na auditoria em caso de divergência.
 
-            duration = time.time() - start_time
-            finalizar_execucao(conn, exec_id, "sucesso", len(df), inserted_count, 0, total_logged_entries)
-            print(f"   ✓ Inseridos: {inserted_count}/{len(df)} | ⚠️/❌ Logs: {total_logged_entries} | ⏱️ {duration:.1f}s")
-            
-        except Exception as e:
-            conn.rollback()
-            duration = time.time() - start_time
-            finalizar_execucao(conn, exec_id, "erro", len(df), inserted_count, 0, total_logged_entries, str(e))
-            print(f"   ❌ Erro crítico durante a carga no banco: {e}")
-            raise
+        Args:
+            conn: Conexão com o banco de dados.
+            file_path (InputSource): Arquivo (ou membro de `.zip`) em processamento.
+            file_hash (str): Hash MD5 do arquivo.
+            columns (list): Colunas encontradas no arquivo.
 
-        return False
+        Returns:
+            bool: True se o cabeçalho for válido, False caso contrário.
+        """
+        try:
+            self.validator.validate_headers(self.name, columns)
+            return True
+        except ValueError as e:
+            print(f"   ❌ {e}")
+            prometheus.FILES_PROCESSED.inc(self.name, 'erro')
+            exec_id = registrar_execucao(conn, f"ingest_{self.name}", "bronze",
+                                        file_path.name, self.target_table, file_hash)
+            finalizar_execucao(conn, exec_id, "erro", 0, 0, 0, 0, str(e))
+            return False
+
+    @staticmethod
+    def to_copy_buffer(df):
+        """
+        Serializa um DataFrame no formato esperado pelo `COPY` (TSV, `\\N` como nulo).
+
+        Args:
+            df (pd.DataFrame): DataFrame com os dados a serem inseridos.
 
-    def copy_to_db(self, conn, df, table, columns):
+        Returns:
+            io.StringIO: O buffer, posicionado no início.
+        """
+        buffer = io.StringIO()
+        df.to_csv(buffer, index=False, header=False, sep='\t', na_rep='\\N')
+        buffer.seek(0)
+        return buffer
+
+    def copy_to_db(self, conn, df, table, columns, commit=True, buffer=None):
         """
         Realiza a carga em massa de um DataFrame para uma tabela no PostgreSQL
         usando o comando `COPY FROM STDIN`.
@@ -333,13 +1102,17 @@ class BaseIngestor(ABC):
             df (pd.DataFrame): DataFrame com os dados a serem inseridos.
             table (str): Nome da tabela de destino.
             columns (list): Lista de colunas do DataFrame a serem inseridas.
+            commit (bool): Se True, confirma a transação e retorna 0 em caso de
+                           erro. Se False, a transação fica aberta para os lotes
+                           seguintes e erros são propagados ao chamador.
+            buffer (io.StringIO, optional): O DataFrame já serializado por
+                           `to_copy_buffer` (ex: em outra thread do pipeline).
 
         Returns:
             int: Número de linhas inseridas.
         """
-        buffer = io.StringIO()
-        df.to_csv(buffer, index=False, header=False, sep='\t', na_rep='\\N')
-        buffer.seek(0)
+        if buffer is None:
+            buffer = self.to_copy_buffer(df)
         
         with get_cursor(conn) as cur:
             try:
@@ -350,14 +1123,30 @@ class BaseIngestor(ABC):
                 sql = f"COPY {table} ({cols_str}) FROM STDIN WITH (FORMAT CSV, DELIMITER E'\\t', NULL '\\N')"
                 
                 cur.copy_expert(sql, buffer)
-                conn.commit()
+                if commit:
+                    conn.commit()
                 return len(df)
             except Exception as e:
                 conn.rollback()
                 print(f"   ❌ Erro durante a operação de COPY: {e}")
+                if not commit:
+                    raise
                 return 0
 
-    def insert_log_entries(self, conn, log_entries, exec_id):
+    @staticmethod
+    def _log_rejections(rejection_log, limiter, log_entries):
+        """
+        Registra uma linha de log por entrada de rejeição, até o limite de
+        linhas por segundo do `limiter`; as demais são só contadas e aparecem
+        como "(+N linhas omitidas do log)" na próxima linha emitida.
+        """
+        for entry in log_entries:
+            if limiter.permitir():
+                rejection_log.warning(
+                    f"[REJEIÇÃO] Linha {entry['numero_linha'] or 'N/A'}: Campo '{entry['campo_falha']}' "
+                    f"falhou: {entry['motivo_rejeicao']}. Valor: '{entry['valor_recebido']}'{limiter.sufixo()}")
+
+    def insert_log_entries(self, conn, log_entries, exec_id, commit=True):
         """
         Registra as entradas de log (warnings ou errors) em uma tabela de auditoria.
 
@@ -365,6 +1154,7 @@ class BaseIngestor(ABC):
             conn: Conexão com o banco de dados.
             log_entries (list): Lista de dicionários, cada um representando uma entrada de log.
             exec_id (UUID): ID da execução atual.
+            commit (bool): Se True, confirma a transação após a inserção.
 
         Returns:
             int: Número de entradas de log inseridas.
@@ -389,8 +1179,12 @@ class BaseIngestor(ABC):
                 ({', '.join(columns)})
                 VALUES %s
             """
-            execute_values(cur, sql, values, page_size=1000)
-            conn.commit()
+            # O registro completo é validado como JSON pelo banco (coluna jsonb ou texto)
+            template = '(' + ', '.join('%s::jsonb' if col == 'registro_completo' else '%s'
+                                       for col in columns) + ')'
+            execute_values(cur, sql, values, template=template, page_size=1000)
+            if commit:
+                conn.commit()
         
         return len(log_entries)
 
@@ -406,29 +1200,28 @@ class BaseIngestor(ABC):
         Returns:
             list: Lista de dicionários, cada um representando uma entrada de log de erro.
         """
-        error_data = []
-        
-        for idx, row in error_df.iterrows():
-            motivo = 'Erro de limpeza de dados'
-            campo_falha = 'data_cleaning'
-            if '_custom_error' in row and pd.notna(row['_custom_error']):
-                motivo = row['_custom_error']
-                # Try to extract the failing field from the custom error message
-                match = re.search(r"'(.*?)'", motivo)
-                if match:
-                    campo_falha = match.group(1)
-
-            error_data.append({
-                'execucao_fk': exec_id,
-                'script_nome': f"ingest_{self.name}",
-                'tabela_destino': self.target_table,
-                'numero_linha': idx + 2, # +2 for 0-indexed and header
-                'campo_falha': campo_falha,
-                'motivo_rejeicao': motivo,
-                'valor_recebido': None,
-                'registro_completo': str(row.to_dict()),
-                'severidade': 'ERROR'
-            })
-        
-        return error_data
+        import pandas as pd
+
+        if error_df.empty:
+            return []
+
+        custom = error_df.get('_custom_error', pd.Series(None, index=error_df.index, dtype=object))
+        has_custom = custom.notna()
+        motivos = custom.where(has_custom, 'Erro de limpeza de dados')
+        # O campo com falha vem da mensagem (ex: "Data inválida em 'data_fat': ...")
+        campos = custom.astype(str).str.extract(r"'(.*?)'", expand=False).where(has_custom)
+        campos = campos.fillna('data_cleaning')
+        records = self._records_as_json(error_df.drop(columns='_custom_error', errors='ignore'))
+
+        return [{
+            'execucao_fk': exec_id,
+            'script_nome': f"ingest_{self.name}",
+            'tabela_destino': self.target_table,
+            'numero_linha': idx + 2, # +2 for 0-indexed and header
+            'campo_falha': campo_falha,
+            'motivo_rejeicao': motivo,
+            'valor_recebido': None,
+            'registro_completo': record,
+            'severidade': 'ERROR'
+        } for idx, campo_falha, motivo, record in zip(error_df.index, campos, motivos, records)]
 
@@ -0,0 +1,197 @@
+"""
+Este módulo, `conversion_cache`, implementa um cache local da conversão de
+planilhas (XLSX/ODS) para o formato colunar Parquet.
+
+O parse de planilhas é a etapa mais cara da ingestão. Quando o mesmo conteúdo
+é processado de novo (reexecução após uma falha de banco, replay de arquivos
+arquivados), a tabela bruta já convertida é lida do Parquet, sem abrir a
+planilha. A chave do cache é o hash MD5 já calculado por
+`FileHandler.calculate_hash`, e o espaço em disco é limitado por uma política
+LRU (os arquivos menos usados recentemente são removidos primeiro).
+"""
+
+import importlib.util
+import os
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+PARQUET_SUFFIX = '.parquet'
+
+
+class ConversionCache:
+    """
+    Cache de tabelas brutas (todas as colunas como texto) em Parquet,
+    indexado pelo hash MD5 do arquivo de origem.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int):
+        """
+        Inicializa o cache.
+
+        Args:
+            cache_dir (Path): Diretório onde os arquivos Parquet são armazenados.
+            max_bytes (int): Tamanho máximo ocupado pelo cache em disco.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    @classmethod
+    def from_config(cls, etl_config) -> Optional['ConversionCache']:
+        """
+        Cria o cache a partir da configuração do ETL.
+
+        Returns:
+            ConversionCache: O cache, ou `None` se estiver desabilitado
+                             (`ETL_CONVERSION_CACHE_MAX_MB=0`) ou se o `pyarrow`
+                             não estiver instalado.
+        """
+        if not etl_config.conversion_cache_dir or etl_config.conversion_cache_max_mb <= 0:
+            return None
+        # Apenas verifica a instalação: o pyarrow só é importado no primeiro uso
+        if importlib.util.find_spec('pyarrow') is None:
+            print("   ⚠️  pyarrow não instalado. Cache de conversão de planilhas desabilitado.")
+            return None
+        return cls(Path(etl_config.conversion_cache_dir),
+                   etl_config.conversion_cache_max_mb * 1024 * 1024)
+
+    def path_for(self, file_hash: str) -> Path:
+        """Retorna o caminho do Parquet correspondente a um hash."""
+        return self.cache_dir / f"{file_hash}{PARQUET_SUFFIX}"
+
+    def batches(self, file_hash: str, produce: Callable[[], Iterator['pd.DataFrame']],
+                batch_size: int) -> Iterator['pd.DataFrame']:
+        """
+        Retorna os lotes da tabela bruta de um arquivo, lidos do cache.
+
+        Em caso de cache miss, os lotes da planilha seguem direto para a carga
+        e são gravados no Parquet à medida que passam (a conversão não atrasa
+        o primeiro lote). Se a carga parar no meio (ex: falha no banco), o
+        restante da planilha ainda é convertido antes de o leitor ser fechado:
+        a próxima tentativa já encontra a conversão pronta. Só uma falha na
+        leitura da própria planilha descarta a conversão.
+
+        Args:
+            file_hash (str): Hash MD5 do arquivo de origem.
+            produce (Callable): Função que retorna o iterador de lotes da planilha
+                                (chamada apenas em caso de cache miss).
+            batch_size (int): Número máximo de linhas por lote na leitura.
+
+        Returns:
+            Iterator[pd.DataFrame]: Os lotes, com índice contínuo a partir de 0.
+        """
+        path = self.path_for(file_hash)
+        if path.exists():
+            os.utime(path)  # Marca o uso recente para a política LRU
+            print(f"   ♻️  Conversão encontrada no cache ({path.name}). Parse da planilha dispensado.")
+            return self._read(path, batch_size)
+        return self._convert(path, produce())
+
+    def _convert(self, path: Path, batches: Iterator['pd.DataFrame']) -> Iterator['pd.DataFrame']:
+        """
+        Repassa os lotes da planilha, gravando-os em um Parquet temporário que
+        é publicado atomicamente ao final.
+
+        Se a gravação falhar (ex: nomes de coluna repetidos no cabeçalho), o
+        arquivo não entra no cache e os lotes continuam vindo da planilha.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        writer = schema = None
+        caching, published = True, False
+
+        def write(batch):
+            nonlocal writer, schema, caching
+            if not caching:
+                return
+            try:
+                if writer is None:
+                    self.cache_dir.mkdir(parents=True, exist_ok=True)
+                    schema = pa.schema([(str(col), pa.string()) for col in batch.columns])
+                    writer = pq.ParquetWriter(tmp_path, schema, compression='zstd')
+                table = pa.Table.from_pandas(batch.astype(object), schema=schema, preserve_index=False)
+                writer.write_table(table)
+            except Exception as e:
+                print(f"   ⚠️  Planilha não incluída no cache de conversão: {e}")
+                caching = False
+
+        def publish():
+            nonlocal writer, published
+            if not caching:
+                return
+            try:
+                if writer is None:
+                    # Planilha sem cabeçalho nem dados
+                    self.cache_dir.mkdir(parents=True, exist_ok=True)
+                    pq.write_table(pa.table({}), tmp_path)
+                else:
+                    writer.close()
+                    writer = None
+                tmp_path.replace(path)
+                published = True
+            except Exception as e:
+                print(f"   ⚠️  Planilha não incluída no cache de conversão: {e}")
+                return
+            self._evict(keep=path)
+
+        try:
+            try:
+                for batch in batches:
+                    write(batch)
+                    yield batch
+            except GeneratorExit:
+                # A carga parou no meio: a conversão do restante é concluída
+                if caching:
+                    try:
+                        for batch in batches:
+                            write(batch)
+                    except Exception as e:
+                        print(f"   ⚠️  Planilha não incluída no cache de conversão: {e}")
+                    else:
+                        publish()
+                raise
+            publish()
+        finally:
+            if writer is not None:
+                writer.close()
+            if not published:
+                tmp_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _read(path: Path, batch_size: int) -> Iterator['pd.DataFrame']:
+        """Lê o Parquet em lotes, reconstruindo o índice contínuo das linhas."""
+        import pandas as pd
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(path)
+        columns = parquet_file.schema_arrow.names
+        offset = 0
+        for record_batch in parquet_file.iter_batches(batch_size=batch_size):
+            df = record_batch.to_pandas()
+            # Mesmo formato dos lotes lidos da planilha: texto, com `None` nas células vazias
+            df = df.astype(object).where(df.notna(), None)
+            df.index = pd.RangeIndex(offset, offset + len(df))
+            offset += len(df)
+            yield df
+        if offset == 0:
+            yield pd.DataFrame(columns=columns, dtype=object)
+
+    def _evict(self, keep: Path) -> None:
+        """Remove os arquivos menos usados recentemente até o cache caber no limite."""
+        entries = []
+        for entry in self.cache_dir.glob(f"*{PARQUET_SUFFIX}"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue  # Removido por outro processo
+            entries.append((stat.st_mtime, stat.st_size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if entry == keep:
+                continue
+            entry.unlink(missing_ok=True)
+            total -= size
@@ -25,12 +25,16 @@ class DataCleaner:
           padrão americano (ex: "1000.00").
         - Converte a série para o tipo numérico, tratando valores inválidos como NaN.
 
+        Colunas já tipadas (ex: lidas de Parquet) não passam pelo tratamento de texto.
+
         Args:
             series (pd.Series): A série de dados a ser limpa.
 
         Returns:
             pd.Series: A série com dados numéricos limpos.
         """
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            return pd.to_numeric(series, errors='coerce')
         s = series.astype(str).str.strip()
         s = s.replace('-', '0')
         s = s.str.replace('.', '', regex=False).str.replace(',', '.', regex=False)
@@ -49,12 +53,17 @@ class DataCleaner:
         Valores que não seguem nenhum formato esperado ou são inválidos são
         convertidos para NaT (Not a Time).
 
+        Colunas já tipadas como data (ex: lidas de Parquet) são devolvidas sem parse.
+
         Args:
             series (pd.Series): A série de dados a ser convertida.
 
         Returns:
             pd.Series: A série com os dados no tipo datetime.
         """
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return series.dt.tz_localize(None) if series.dt.tz is not None else series
+
         # Mapeamento de meses em português (abreviados) para números
         meses_pt = {
             'jan': '01', 'fev': '02', 'mar': '03', 'abr': '04',
@@ -80,6 +89,10 @@ class DataCleaner:
         # Aplica a conversão de formatos especiais
         converted_series = series.apply(convert_value)
         
+        if converted_series.empty:
+            # Lote sem linhas (ex: todas rejeitadas antes): a série vazia também deve ser de datas
+            return pd.Series(index=converted_series.index, dtype='datetime64[ns]')
+
         # Tenta converter com múltiplos formatos
         # Primeiro tenta com formatos explícitos para evitar ambiguidade
         result = pd.Series([pd.NaT] * len(converted_series), index=converted_series.index)
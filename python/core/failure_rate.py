@@ -0,0 +1,69 @@
+"""
+Este módulo, `failure_rate`, acompanha a taxa de valores inválidos de cada
+coluna ao longo dos lotes de uma carga, para interromper cedo um arquivo em
+que uma coluna falha em (quase) todas as linhas — ex: a origem trocou o
+formato decimal e todo `valor_da_conta` é rejeitado.
+
+- A taxa de uma coluna é a fração das linhas lidas com valor inválido na
+  coluna, acumulada lote a lote (colunas esparsas não abortam a carga por
+  poucos valores preenchidos).
+- Só é avaliada depois de `ETL_ABORT_MIN_ROWS` linhas lidas, para que poucas
+  linhas ruins no início do arquivo não derrubem a carga.
+- A partir de `ETL_ABORT_FAILURE_RATE`, `check` lança `FailureRateExceeded` e
+  a carga é finalizada com o status 'abortado' (ver `BaseIngestor._load_batches`).
+"""
+
+from typing import Dict, List, Tuple
+
+
+class FailureRateExceeded(Exception):
+    """A taxa de valores inválidos de uma coluna passou do limite da carga."""
+
+    def __init__(self, col: str, kind: str, failures: int, rows: int, max_rate: float):
+        self.col = col
+        self.kind = kind
+        self.failures = failures
+        self.rows = rows
+        self.max_rate = max_rate
+        super().__init__(
+            f"Carga abortada: {failures} {kind} na coluna '{col}' nas primeiras {rows} linhas "
+            f"({failures / rows:.1%}), acima do limite de {max_rate:.1%} (ETL_ABORT_FAILURE_RATE)")
+
+
+class ColumnFailureStats:
+    """Contagens acumuladas de linhas lidas e de valores inválidos por coluna em uma carga."""
+
+    def __init__(self, max_rate: float = 0.0, min_rows: int = 0):
+        """
+        Args:
+            max_rate (float): Taxa de valores inválidos que aborta a carga (0 = nunca aborta).
+            min_rows (int): Linhas lidas antes de a taxa ser avaliada.
+        """
+        self.max_rate = max_rate
+        self.min_rows = max(min_rows, 1)
+        self.rows = 0
+        # `{(coluna, tipo): quantidade}`
+        self._failures: Dict[Tuple[str, str], int] = {}
+
+    def add_rows(self, rows: int) -> None:
+        """Acumula as linhas de um lote."""
+        self.rows += rows
+
+    def add(self, col: str, kind: str, count: int) -> None:
+        """Acumula os valores inválidos de uma coluna em um lote (ex: 'datas inválidas')."""
+        self._failures[col, kind] = self._failures.get((col, kind), 0) + int(count)
+
+    def failures(self) -> List[Tuple[str, str, int]]:
+        """As colunas com valores inválidos: `(coluna, tipo, quantidade)`."""
+        return [(col, kind, count) for (col, kind), count in self._failures.items()]
+
+    def check(self) -> None:
+        """
+        Lança `FailureRateExceeded` se, já com a amostra mínima de linhas,
+        alguma coluna estiver no limite de valores inválidos ou acima dele.
+        """
+        if self.max_rate <= 0 or self.rows < self.min_rows:
+            return
+        for (col, kind), count in self._failures.items():
+            if count / self.rows >= self.max_rate:
+                raise FailureRateExceeded(col, kind, count, self.rows, self.max_rate)
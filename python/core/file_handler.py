@@ -7,28 +7,37 @@ automática de separadores em arquivos CSV.
 
 import hashlib
 import shutil
+import struct
+import zipfile
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
 
 class FileHandler:
     """
     Gerencia as operações de I/O de arquivos para o pipeline de ingestão.
     """
     
-    def __init__(self, processed_dir: Path):
+    def __init__(self, processed_dir: Path, archive=None):
         """
         Inicializa o handler de arquivos.
 
         Args:
             processed_dir (Path): O diretório base para onde os arquivos 
                                   processados serão movidos.
+            archive (ArchiveStore, optional): Acervo endereçado por conteúdo
+                                              (`ETL_ARCHIVE_MODE=store`); se
+                                              informado, os arquivos processados
+                                              vão para ele.
         """
         self.processed_dir = processed_dir
+        self.archive = archive
 
     @staticmethod
     def calculate_hash(file_path: Path) -> str:
         """
         Calcula o hash MD5 de um arquivo de forma eficiente em termos de memória.
+        Para arquivos compactados (.gz, .zst), o hash é o dos bytes compactados.
 
         A leitura é feita em blocos (chunks) para evitar carregar arquivos
         grandes inteiramente na memória.
@@ -45,20 +54,62 @@ class FileHandler:
                 hash_md5.update(chunk)
         return hash_md5.hexdigest()
 
-    def move_to_processed(self, file_path: Path, is_duplicate: bool = False) -> Path:
+    @staticmethod
+    def calculate_member_hash(archive_path: Path, member: str) -> str:
+        """
+        Calcula o hash MD5 de um membro de um arquivo `.zip` sobre os seus bytes
+        compactados, sem descompactá-lo.
+
+        Apenas o trecho do membro é lido, então os hashes de todos os membros
+        de um arquivo custam uma única leitura do `.zip`.
+
+        Args:
+            archive_path (Path): O caminho do arquivo `.zip`.
+            member (str): O nome do membro dentro do `.zip`.
+
+        Returns:
+            str: O hash MD5 hexadecimal dos bytes compactados do membro.
+        """
+        hash_md5 = hashlib.md5()
+        with zipfile.ZipFile(archive_path) as archive:
+            info = archive.getinfo(member)
+        with open(archive_path, "rb") as f:
+            # O cabeçalho local tem 30 bytes fixos, seguidos do nome e do campo extra
+            f.seek(info.header_offset)
+            name_length, extra_length = struct.unpack('<26xHH', f.read(30))
+            f.seek(name_length + extra_length, 1)
+            remaining = info.compress_size
+            while remaining > 0:
+                chunk = f.read(min(4096, remaining))
+                if not chunk:
+                    break
+                hash_md5.update(chunk)
+                remaining -= len(chunk)
+        return hash_md5.hexdigest()
+
+    def move_to_processed(self, file_path: Path, is_duplicate: bool = False, execution_ids=(),
+                          file_hash: Optional[str] = None) -> Path:
         """
         Move um arquivo para o diretório de processados com uma estrutura organizada.
 
         - Arquivos normais são movidos para: `processed/YYYY/MM/DD/HHMMSS_nomeoriginal.ext`
         - Arquivos duplicados são movidos para: `processed/duplicates/HHMMSS_nomeoriginal.ext`
+        - Com o acervo, o arquivo vai para `processed/archive/` (ver `python.core.archive`).
 
         Args:
             file_path (Path): O caminho do arquivo a ser movido.
             is_duplicate (bool): Flag que indica se o arquivo é uma duplicata.
+            execution_ids (Iterable[str]): As execuções que carregaram o arquivo
+                                           (registradas no catálogo do acervo).
+            file_hash (str, optional): O hash MD5 do arquivo, se já calculado
+                                       (evita uma nova leitura pelo acervo).
 
         Returns:
             Path: O caminho de destino do arquivo movido.
         """
+        if self.archive is not None:
+            return self.archive.store(file_path, execution_ids, is_duplicate, file_hash)
+
         today = datetime.now()
         timestamp = today.strftime("%H%M%S")
         
@@ -95,8 +146,22 @@ class FileHandler:
         except UnicodeDecodeError:
             with open(file_path, 'r', encoding='latin-1') as f:
                 first_line = f.readline()
-        
-        if ';' in first_line: return ';'
-        if ',' in first_line: return ','
-        if '\t' in first_line: return '\t'
+
+        return FileHandler.separator_from_line(first_line)
+
+    @staticmethod
+    def separator_from_line(line: str) -> str:
+        """
+        Aplica a regra de prioridade de separadores (`;`, `,`, `\t`) a uma linha
+        já lida, permitindo detectar o separador sem reabrir o arquivo.
+
+        Args:
+            line (str): A primeira linha (cabeçalho) do arquivo.
+
+        Returns:
+            str: O separador detectado.
+        """
+        if ';' in line: return ';'
+        if ',' in line: return ','
+        if '\t' in line: return '\t'
         return ','
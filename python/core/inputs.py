@@ -0,0 +1,311 @@
+"""
+Este módulo, `inputs`, representa as fontes de dados do diretório de entrada,
+incluindo arquivos compactados.
+
+Um arquivo `.gz` ou `.zst` é uma única fonte, descompactada em streaming direto
+para o parser (sem extrair para o disco). Um `.zip` é expandido em uma fonte por
+membro suportado, e cada membro é ingerido separadamente. Da mesma forma, uma
+pasta de trabalho (XLSX/ODS) com várias planilhas pode ser expandida em uma
+fonte por planilha. A expansão guarda só os nomes das planilhas e o hash; o
+arquivo é carregado em memória uma única vez no processamento
+(`load_workbooks`), e todas as planilhas leem essa cópia.
+
+Para o restante do pipeline, uma fonte se comporta como um arquivo: tem `name`
+(gravado em `source_filename`), `suffix` (o formato do conteúdo), `open()` e
+`content_hash()`.
+"""
+
+import gzip
+import hashlib
+import io
+import shutil
+import tempfile
+import zipfile
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, Callable, Iterator, List, Optional
+
+from python.core.file_handler import FileHandler
+from python.core.readers import CSV_SUFFIXES, ODS_SUFFIXES, SUPPORTED_SUFFIXES, XLSX_SUFFIXES, list_sheets
+
+GZIP_SUFFIXES = ('.gz',)
+ZSTD_SUFFIXES = ('.zst',)
+ZIP_SUFFIXES = ('.zip',)
+COMPRESSION_SUFFIXES = GZIP_SUFFIXES + ZSTD_SUFFIXES + ZIP_SUFFIXES
+
+# Tamanho dos blocos copiados ao descompactar para um arquivo temporário
+_COPY_BUFFER_SIZE = 1024 * 1024
+
+
+@dataclass
+class InputSource:
+    """
+    Uma fonte de dados do diretório de entrada.
+
+    Attributes:
+        path (Path): O arquivo em disco (o arquivo compactado, se for o caso).
+        member (str, optional): O membro do `.zip` correspondente a esta fonte.
+        sheet (str, optional): A planilha da pasta de trabalho correspondente a esta fonte.
+        data (bytes, optional): O conteúdo da pasta de trabalho carregado em
+                                memória, compartilhado entre as suas planilhas
+                                (ver `load_workbooks`).
+        workbook_hash (str, optional): O hash da pasta de trabalho, calculado uma
+                                       única vez para todas as suas planilhas.
+    """
+    path: Path
+    member: Optional[str] = None
+    sheet: Optional[str] = None
+    data: Optional[bytes] = field(default=None, repr=False, compare=False)
+    workbook_hash: Optional[str] = field(default=None, repr=False, compare=False)
+
+    @property
+    def name(self) -> str:
+        """Nome da fonte (ex: 'exportacao.zip/faturamento.csv', 'financeiro.xlsx#Janeiro')."""
+        name = f"{self.path.name}/{self.member}" if self.member else self.path.name
+        return f"{name}#{self.sheet}" if self.sheet else name
+
+    @property
+    def stem(self) -> str:
+        """Nome do arquivo de conteúdo, sem extensões de formato e compressão."""
+        if self.member:
+            return PurePosixPath(self.member).stem
+        if self.compression in GZIP_SUFFIXES + ZSTD_SUFFIXES:
+            return Path(self.path.stem).stem
+        return self.path.stem
+
+    @property
+    def compression(self) -> Optional[str]:
+        """A extensão de compressão do arquivo ('.gz', '.zst', '.zip'), se houver."""
+        suffix = self.path.suffix.lower()
+        return suffix if suffix in COMPRESSION_SUFFIXES else None
+
+    @property
+    def suffix(self) -> str:
+        """A extensão do conteúdo (ex: '.csv' para 'faturamento.csv.gz')."""
+        if self.member:
+            return PurePosixPath(self.member).suffix
+        if self.compression in GZIP_SUFFIXES + ZSTD_SUFFIXES:
+            return Path(self.path.stem).suffix
+        return self.path.suffix
+
+    @property
+    def size(self) -> int:
+        """
+        Tamanho em bytes do conteúdo em disco: o arquivo (compactado, se for o
+        caso), os bytes compactados do membro do `.zip` ou a pasta de trabalho
+        em memória.
+        """
+        if self.data is not None:
+            return len(self.data)
+        if self.member:
+            with zipfile.ZipFile(self.path) as archive:
+                return archive.getinfo(self.member).compress_size
+        return self.path.stat().st_size
+
+    def content_hash(self) -> str:
+        """
+        Calcula o hash MD5 usado na detecção de duplicatas.
+
+        - Arquivos comuns e `.gz`/`.zst`: o hash dos bytes do arquivo em disco.
+        - Membros de `.zip`: o hash dos bytes compactados do membro.
+        - Planilhas de uma pasta de trabalho: o hash da pasta de trabalho
+          combinado com o nome da planilha, para que cada planilha seja uma
+          carga independente.
+        """
+        file_hash = self.workbook_hash
+        if file_hash is None:
+            if self.member:
+                file_hash = FileHandler.calculate_member_hash(self.path, self.member)
+            else:
+                file_hash = FileHandler.calculate_hash(self.path)
+        if self.sheet:
+            file_hash = hashlib.md5(f"{file_hash}:{self.sheet}".encode('utf-8')).hexdigest()
+        return file_hash
+
+    @contextmanager
+    def open(self) -> Iterator[BinaryIO]:
+        """
+        Abre o conteúdo (já descompactado) como um stream binário que aceita
+        `seek(0)`.
+
+        CSVs são lidos direto do descompactador. Planilhas e formatos colunares
+        precisam de acesso aleatório, então o conteúdo compactado é descompactado
+        para um arquivo temporário antes da leitura. Planilhas de uma pasta de
+        trabalho já carregada são lidas da cópia em memória.
+        """
+        if self.data is not None:
+            yield io.BytesIO(self.data)
+        elif self.compression is None:
+            with open(self.path, 'rb') as stream:
+                yield stream
+        elif self.suffix.lower() in CSV_SUFFIXES:
+            with self._open_decompressed() as stream:
+                yield stream
+        else:
+            with self._open_decompressed() as source, \
+                    tempfile.NamedTemporaryFile(suffix=self.suffix) as spool:
+                shutil.copyfileobj(source, spool, _COPY_BUFFER_SIZE)
+                spool.flush()
+                spool.seek(0)
+                yield spool
+
+    @contextmanager
+    def _open_decompressed(self) -> Iterator[BinaryIO]:
+        """Abre o descompactador correspondente à extensão do arquivo."""
+        if self.compression in GZIP_SUFFIXES:
+            with gzip.open(self.path, 'rb') as stream:
+                yield stream
+        elif self.compression in ZSTD_SUFFIXES:
+            with io.BufferedReader(_RewindableReader(self._open_zstd)) as stream:
+                yield stream
+        else:
+            with zipfile.ZipFile(self.path) as archive, archive.open(self.member) as stream:
+                yield stream
+
+    def _open_zstd(self) -> BinaryIO:
+        """Abre um leitor em streaming de um arquivo `.zst` (todos os frames)."""
+        import zstandard
+
+        return zstandard.ZstdDecompressor().stream_reader(
+            open(self.path, 'rb'), read_across_frames=True, closefd=True)
+
+
+class _RewindableReader(io.RawIOBase):
+    """
+    Adapta um leitor em streaming que só avança (ex: zstd) para aceitar
+    `seek`: voltar ao início reabre o descompactador, e avançar descarta bytes.
+    """
+
+    def __init__(self, opener: Callable[[], BinaryIO]):
+        self._opener = opener
+        self._stream = opener()
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._stream.read(len(buffer))
+        buffer[:len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence != io.SEEK_SET:
+            raise io.UnsupportedOperation("seek a partir do fim não é suportado em streams compactados")
+
+        if offset < self._position:
+            self._stream.close()
+            self._stream = self._opener()
+            self._position = 0
+        while self._position < offset:
+            skipped = self._stream.read(min(offset - self._position, _COPY_BUFFER_SIZE))
+            if not skipped:
+                break
+            self._position += len(skipped)
+        return self._position
+
+    def close(self) -> None:
+        if not self.closed:
+            self._stream.close()
+        super().close()
+
+
+def expand_inputs(path: Path, sheets: bool = False) -> List[InputSource]:
+    """
+    Expande um arquivo do diretório de entrada em suas fontes de dados.
+
+    Args:
+        path (Path): O arquivo encontrado no diretório de entrada.
+        sheets (bool): Se True, pastas de trabalho com mais de uma planilha são
+                       expandidas em uma fonte por planilha.
+
+    Returns:
+        List[InputSource]: Uma fonte por membro suportado de um `.zip` (ou por
+                           planilha), ou uma única fonte para os demais
+                           arquivos. Lista vazia se o formato do conteúdo não
+                           for suportado.
+    """
+    path = Path(path)
+    if path.suffix.lower() in ZIP_SUFFIXES:
+        with zipfile.ZipFile(path) as archive:
+            sources = [
+                InputSource(path, info.filename)
+                for info in archive.infolist()
+                if not info.is_dir()
+                and not info.filename.startswith('__MACOSX/')
+                and PurePosixPath(info.filename).suffix.lower() in SUPPORTED_SUFFIXES
+            ]
+    else:
+        source = InputSource(path)
+        sources = [source] if source.suffix.lower() in SUPPORTED_SUFFIXES else []
+
+    if sheets:
+        sources = [sheet for source in sources for sheet in expand_sheets(source)]
+    return sources
+
+
+def expand_sheets(source: InputSource) -> List[InputSource]:
+    """
+    Expande uma pasta de trabalho em uma fonte por planilha.
+
+    Apenas os nomes das planilhas são lidos: as fontes guardam o hash base,
+    comum a todas as planilhas, mas não o conteúdo (carregado só no
+    processamento, com `load_workbooks`). Pastas de trabalho com uma única
+    planilha (e demais formatos) continuam sendo uma única fonte, com o mesmo
+    nome e hash de antes.
+
+    Args:
+        source (InputSource): A fonte a expandir.
+
+    Returns:
+        List[InputSource]: As fontes de cada planilha, na ordem da pasta de trabalho.
+    """
+    if source.suffix.lower() not in XLSX_SUFFIXES + ODS_SUFFIXES:
+        return [source]
+
+    with source.open() as stream:
+        names = list_sheets(stream, source.suffix)
+    if len(names) <= 1:
+        return [source]
+
+    workbook_hash = source.content_hash()
+    return [replace(source, sheet=name, workbook_hash=workbook_hash) for name in names]
+
+
+def load_workbooks(sources: List[InputSource]) -> List[InputSource]:
+    """
+    Carrega em memória o conteúdo das pastas de trabalho das planilhas, uma
+    única vez por pasta de trabalho (e descompactado, se for o caso).
+
+    As fontes originais não são alteradas: a cópia em memória vive enquanto
+    as fontes retornadas forem usadas (ex: o processamento de um arquivo).
+
+    Args:
+        sources (list): As fontes, como retornadas por `expand_inputs`.
+
+    Returns:
+        List[InputSource]: As mesmas fontes, na mesma ordem; as planilhas com
+                           o conteúdo da pasta de trabalho em `data`.
+    """
+    loaded = {}
+    result = []
+    for source in sources:
+        if source.sheet is None or source.data is not None:
+            result.append(source)
+            continue
+        workbook = (source.path, source.member)
+        if workbook not in loaded:
+            with source.open() as stream:
+                loaded[workbook] = stream.read()
+        result.append(replace(source, data=loaded[workbook]))
+    return result
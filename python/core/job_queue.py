@@ -0,0 +1,242 @@
+"""
+Este módulo, `job_queue`, implementa uma fila de trabalho no PostgreSQL
+(`auditoria.fila_ingestao`) para que vários workers, em containers ou hosts
+diferentes, dividam os arquivos do diretório de entrada sem processar o mesmo
+arquivo duas vezes.
+
+- Cada worker enfileira os arquivos que encontra. Um índice único parcial
+  impede que o mesmo arquivo (nome, tamanho e data de modificação) tenha mais
+  de um job pendente.
+- Um job é reservado com `SELECT ... FOR UPDATE SKIP LOCKED`: o lock da linha
+  é mantido, em uma conexão dedicada, durante todo o processamento, e os
+  demais workers simplesmente pulam a linha. Se o worker morrer, a conexão cai,
+  o lock é liberado e o job volta a ficar disponível, sem intervenção manual.
+- Dentro da carga, `advisory_lock` serializa o processamento de um mesmo
+  conteúdo (hash do arquivo), para que a checagem de duplicatas de um worker
+  enxergue o resultado do outro.
+
+Os workers precisam enxergar o mesmo diretório de entrada (ex: um volume
+compartilhado); os arquivos são identificados pelo nome relativo a ele.
+"""
+
+import os
+import socket
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from python.utils.db_connection import acquire_connection, get_cursor, release_connection
+
+DDL = """
+    CREATE TABLE IF NOT EXISTS auditoria.fila_ingestao (
+        id bigserial PRIMARY KEY,
+        arquivo text NOT NULL,
+        tamanho_bytes bigint NOT NULL,
+        data_modificacao timestamp NOT NULL,
+        status varchar(20) NOT NULL DEFAULT 'pendente',
+        worker text,
+        tentativas integer NOT NULL DEFAULT 0,
+        data_criacao timestamp NOT NULL DEFAULT now(),
+        data_inicio timestamp,
+        data_fim timestamp,
+        mensagem_erro text
+    );
+    CREATE UNIQUE INDEX IF NOT EXISTS uq_fila_ingestao_pendente
+        ON auditoria.fila_ingestao (arquivo, tamanho_bytes, data_modificacao)
+        WHERE status = 'pendente';
+"""
+
+# Chave do advisory lock que serializa a criação da tabela da fila
+_DDL_LOCK_KEY = 0x6669_6c61_5f69_6e67  # 'fila_ing'
+
+
+def worker_name(index: int = 0) -> str:
+    """Identificação do worker na fila: `host:pid:thread`."""
+    return f"{socket.gethostname()}:{os.getpid()}:{index}"
+
+
+def _lock_key(file_hash: str) -> int:
+    """Converte os primeiros 64 bits de um hash MD5 na chave (bigint) do advisory lock."""
+    key = int(file_hash[:16], 16)
+    return key - (1 << 64) if key >= (1 << 63) else key
+
+
+@contextmanager
+def advisory_lock(conn, file_hash: str) -> Iterator[None]:
+    """
+    Mantém um advisory lock de sessão do PostgreSQL para um hash de arquivo.
+
+    Se outro worker estiver processando o mesmo conteúdo, aguarda o término.
+    O lock pertence à conexão (não à transação), então sobrevive aos `commit`
+    da carga, e é liberado ao final do bloco ou se a conexão cair.
+
+    Args:
+        conn: Conexão com o banco de dados (sem transação pendente).
+        file_hash (str): Hash MD5 do arquivo.
+    """
+    from psycopg2.extensions import TRANSACTION_STATUS_INERROR
+
+    key = _lock_key(file_hash)
+    with get_cursor(conn) as cur:
+        cur.execute("SELECT pg_try_advisory_lock(%s)", (key,))
+        acquired = cur.fetchone()[0]
+        if not acquired:
+            print(f"   ⏳ Outro worker está processando o mesmo conteúdo (Hash: {file_hash}). Aguardando...")
+            cur.execute("SELECT pg_advisory_lock(%s)", (key,))
+    conn.commit()
+    try:
+        yield
+    finally:
+        if not conn.closed:
+            if conn.info.transaction_status == TRANSACTION_STATUS_INERROR:
+                conn.rollback()
+            with get_cursor(conn) as cur:
+                cur.execute("SELECT pg_advisory_unlock(%s)", (key,))
+            conn.commit()
+
+
+@dataclass
+class Job:
+    """
+    Um arquivo reservado da fila.
+
+    Attributes:
+        id (int): Identificador do job.
+        path (Path): O arquivo no diretório de entrada.
+        attempts (int): Tentativas anteriores deste job.
+        status (str): Status final, definido pelo worker (padrão 'sucesso').
+        message (str, optional): Mensagem de erro, se houver.
+    """
+    id: int
+    path: Path
+    attempts: int
+    status: str = 'sucesso'
+    message: Optional[str] = None
+
+    def fail(self, message: str) -> None:
+        """Marca o job como concluído com erro."""
+        self.status = 'erro'
+        self.message = message
+
+
+class JobQueue:
+    """
+    Fila de arquivos a ingerir, compartilhada entre workers.
+    """
+
+    def __init__(self, input_dir: Path):
+        """
+        Args:
+            input_dir (Path): O diretório de entrada compartilhado pelos workers.
+        """
+        self.input_dir = Path(input_dir)
+
+    @staticmethod
+    def ensure_schema(conn) -> None:
+        """
+        Cria a tabela da fila, se ainda não existir.
+
+        Workers iniciados ao mesmo tempo são serializados por um advisory lock
+        de transação (o `CREATE ... IF NOT EXISTS` concorrente falha no catálogo).
+        """
+        with get_cursor(conn) as cur:
+            cur.execute("SELECT pg_advisory_xact_lock(%s)", (_DDL_LOCK_KEY,))
+            cur.execute(DDL)
+        conn.commit()
+
+    def enqueue(self, conn, files: List[Path]) -> int:
+        """
+        Enfileira arquivos do diretório de entrada.
+
+        Um arquivo que já tem um job pendente (ou em processamento) não é
+        enfileirado de novo.
+
+        Returns:
+            int: Quantidade de jobs criados.
+        """
+        created = 0
+        with get_cursor(conn) as cur:
+            for path in files:
+                try:
+                    stat = Path(path).stat()
+                except FileNotFoundError:
+                    continue  # Já movido por outro worker
+                cur.execute("""
+                    INSERT INTO auditoria.fila_ingestao (arquivo, tamanho_bytes, data_modificacao)
+                    VALUES (%s, %s, %s)
+                    ON CONFLICT (arquivo, tamanho_bytes, data_modificacao) WHERE status = 'pendente'
+                    DO NOTHING
+                """, (Path(path).name, stat.st_size, datetime.fromtimestamp(stat.st_mtime)))
+                created += cur.rowcount
+        conn.commit()
+        return created
+
+    @contextmanager
+    def claim(self, worker: str) -> Iterator[Optional[Job]]:
+        """
+        Reserva o próximo job pendente durante o bloco.
+
+        Ao final do bloco, o job é atualizado com o status definido pelo
+        worker (`Job.fail` em caso de erro); uma exceção no bloco também marca
+        o job como 'erro'. Jobs cujo arquivo não existe mais (ex: já movido
+        por quem enfileirou de novo) são encerrados como 'ausente'.
+
+        Args:
+            worker (str): Identificação do worker (ver `worker_name`).
+
+        Yields:
+            Job: O job reservado, ou `None` se não houver jobs pendentes.
+        """
+        conn = acquire_connection()
+        try:
+            job = self._next(conn, worker)
+            if job is None:
+                yield None
+                return
+
+            started = datetime.now()
+            try:
+                yield job
+            except Exception as e:
+                job.fail(str(e))
+                raise
+            finally:
+                self._finish(conn, job, worker, started)
+        finally:
+            release_connection(conn)
+
+    def _next(self, conn, worker: str) -> Optional[Job]:
+        """Trava o próximo job pendente cujo arquivo ainda existe."""
+        while True:
+            with get_cursor(conn) as cur:
+                cur.execute("""
+                    SELECT id, arquivo, tentativas FROM auditoria.fila_ingestao
+                    WHERE status = 'pendente'
+                    ORDER BY id
+                    FOR UPDATE SKIP LOCKED
+                    LIMIT 1
+                """)
+                row = cur.fetchone()
+            if row is None:
+                conn.rollback()
+                return None
+
+            job = Job(row[0], self.input_dir / row[1], row[2])
+            if job.path.exists():
+                return job
+            job.status = 'ausente'
+            self._finish(conn, job, worker, datetime.now())
+
+    @staticmethod
+    def _finish(conn, job: Job, worker: str, started: datetime) -> None:
+        """Grava o resultado do job e libera o lock da linha (commit)."""
+        with get_cursor(conn) as cur:
+            cur.execute("""
+                UPDATE auditoria.fila_ingestao
+                SET status = %s, worker = %s, tentativas = tentativas + 1,
+                    data_inicio = %s, data_fim = %s, mensagem_erro = %s
+                WHERE id = %s
+            """, (job.status, worker, started, datetime.now(), job.message, job.id))
+        conn.commit()
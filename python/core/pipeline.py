@@ -0,0 +1,95 @@
+"""
+Este módulo, `pipeline`, implementa a execução em estágios da ingestão.
+
+O trabalho de CPU (leitura, limpeza e serialização dos lotes) e o trabalho de
+I/O com o banco (`COPY` e logs) rodam em threads diferentes, ligadas por uma
+fila limitada: enquanto o banco grava um lote, o próximo já está sendo
+preparado. Quando a fila enche, o estágio produtor espera (back-pressure),
+então a memória fica limitada a `depth` lotes preparados.
+
+O `COPY` do psycopg2 e o parser C do pandas liberam o GIL durante a maior
+parte do trabalho, o que permite a sobreposição real dos dois estágios.
+"""
+
+import queue
+import threading
+from typing import Iterable, Iterator, TypeVar
+
+T = TypeVar('T')
+
+# Marca o fim dos itens produzidos
+_END = object()
+
+# Intervalo com que o produtor confere se o consumidor desistiu
+_POLL_SECONDS = 0.1
+
+
+class _Failure:
+    """Transporta para o consumidor uma exceção ocorrida no produtor."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def prefetch(items: Iterable[T], depth: int = 2, name: str = 'prefetch') -> Iterator[T]:
+    """
+    Consome `items` em uma thread de fundo e entrega os itens na ordem, por uma
+    fila de no máximo `depth` itens.
+
+    Exceções do produtor são relançadas no consumidor. Se o consumidor parar
+    antes do fim (erro ou `close()`), o produtor é interrompido no próximo item
+    e a thread é aguardada antes de retornar, de forma que nenhum recurso
+    usado pelo produtor (ex: o arquivo aberto) continue em uso.
+
+    Args:
+        items (Iterable): Os itens a produzir (a iteração roda na thread de fundo).
+        depth (int): Tamanho máximo da fila. Com 0, os itens são consumidos
+                     na própria thread do chamador, sem paralelismo.
+        name (str): Nome da thread produtora (aparece em logs e profilers).
+
+    Yields:
+        Os itens de `items`, na mesma ordem.
+    """
+    if depth <= 0:
+        yield from items
+        return
+
+    buffer: queue.Queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        iterator = iter(items)
+        try:
+            for item in iterator:
+                if not put(item):
+                    return
+            put(_END)
+        except BaseException as e:
+            put(_Failure(e))
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                close()
+
+    thread = threading.Thread(target=produce, name=name, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _END:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        thread.join()
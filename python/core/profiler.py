@@ -0,0 +1,226 @@
+"""
+Este módulo, `profiler`, implementa o perfil de desempenho da carga de um
+arquivo, habilitado por `ETL_PROFILING=true`.
+
+Durante a carga, uma thread de amostragem registra a pilha de chamadas da
+thread que processa o arquivo e da thread que prepara os seus lotes (o
+`cProfile` enxergaria apenas a primeira, e o trabalho de CPU roda na
+segunda), e o `tracemalloc` acompanha o pico de memória. Ao final, são
+gravados no diretório de logs, em `profiles/`, com o nome do arquivo e o id
+da execução:
+
+- `<base>.profile.txt`: as funções com mais amostras (tempo próprio e total).
+- `<base>.collapsed`: as pilhas no formato "collapsed" (uma pilha por linha,
+  com a contagem de amostras), aceito por `flamegraph.pl`, speedscope e
+  similares.
+- `<base>.memory.json`: o pico de memória e os maiores pontos de alocação.
+
+Um resumo das funções mais quentes vai para o logger `profiler`.
+
+O `tracemalloc` é global no processo: com planilhas carregadas em paralelo, o
+pico de memória inclui as alocações das demais planilhas.
+"""
+
+import json
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+# Intervalo entre as amostras das pilhas
+SAMPLE_INTERVAL_SECONDS = 0.005
+
+# Funções listadas no resumo e no logger, e pontos de alocação no relatório de memória
+TOP_FUNCTIONS = 15
+TOP_ALLOCATIONS = 15
+
+# Arquivos cujas funções, no topo da pilha, indicam uma thread ociosa (ex: a
+# carga esperando o próximo lote): ficam nas pilhas, mas fora do resumo
+IDLE_FILES = ('threading.py', 'queue.py')
+
+# Quadros do tracemalloc com mais níveis custam mais; 1 basta para o local da alocação
+_TRACEMALLOC_FRAMES = 1
+
+# Perfis em andamento: o tracemalloc só é parado quando o último termina
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+
+
+def _start_tracing() -> None:
+    global _tracing_users
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(_TRACEMALLOC_FRAMES)
+        _tracing_users += 1
+        tracemalloc.reset_peak()
+
+
+def _stop_tracing() -> None:
+    global _tracing_users
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0:
+            tracemalloc.stop()
+
+
+def _frame_label(code) -> str:
+    """Nome de um quadro da pilha: 'função (arquivo.py:linha)'."""
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class FileProfiler:
+    """
+    Perfil (amostragem de pilhas e pico de memória) da carga de um arquivo.
+
+    Uso:
+        profiler = FileProfiler(logs_dir, thread_names={'faturamento-prepare:x.csv'})
+        with profiler:
+            ...  # processamento do arquivo
+        profiler.write('x.csv', execution_id)
+    """
+
+    def __init__(self, logs_dir: Path, thread_names: Iterable[str] = (),
+                 interval: float = SAMPLE_INTERVAL_SECONDS):
+        """
+        Args:
+            logs_dir (Path): Diretório de logs (os perfis vão para `profiles/`).
+            thread_names (Iterable[str]): Nomes das threads auxiliares do
+                                          arquivo, amostradas além da thread
+                                          que entra no bloco.
+            interval (float): Intervalo entre as amostras, em segundos.
+        """
+        self.output_dir = Path(logs_dir) / 'profiles'
+        self.thread_names = set(thread_names)
+        self.interval = interval
+        self.samples = 0
+        self.duration = 0.0
+        self.memory_peak = 0
+        self.allocations: List[Tuple[str, int, int]] = []
+        self._stacks: Counter = Counter()
+        self._idle: Counter = Counter()
+        self._owner = None
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._start = 0.0
+
+    def __enter__(self) -> 'FileProfiler':
+        self._owner = threading.current_thread()
+        _start_tracing()
+        self._start = time.perf_counter()
+        self._sampler = threading.Thread(target=self._run, name='profiler-sampler', daemon=True)
+        self._sampler.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._sampler.join()
+        self.duration = time.perf_counter() - self._start
+        _, self.memory_peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+        self.allocations = [
+            (f"{Path(stat.traceback[0].filename).name}:{stat.traceback[0].lineno}", stat.size, stat.count)
+            for stat in snapshot.statistics('lineno')[:TOP_ALLOCATIONS]
+        ]
+        _stop_tracing()
+
+    def _run(self) -> None:
+        """Laço da thread de amostragem."""
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def _sample(self) -> None:
+        """Registra a pilha atual de cada thread acompanhada."""
+        threads = [self._owner] + [thread for thread in threading.enumerate()
+                                   if thread.name in self.thread_names]
+        frames = sys._current_frames()
+        for thread in threads:
+            frame = frames.get(thread.ident)
+            if frame is None:
+                continue
+            idle = Path(frame.f_code.co_filename).name in IDLE_FILES
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            stack.append(thread.name)
+            key = tuple(reversed(stack))
+            self._stacks[key] += 1
+            if idle:
+                self._idle[key] += 1
+        self.samples += 1
+
+    def hot_functions(self, limit: int = TOP_FUNCTIONS) -> List[Tuple[str, int, int]]:
+        """
+        As funções com mais amostras.
+
+        Returns:
+            list: Tuplas `(função, amostras próprias, amostras totais)`, em
+                  ordem decrescente de amostras próprias. A thread de cada
+                  pilha não conta como função, e as pilhas ociosas (ver
+                  `IDLE_FILES`) ficam de fora.
+        """
+        own, total = Counter(), Counter()
+        for stack, count in (self._stacks - self._idle).items():
+            frames = stack[1:]
+            own[frames[-1]] += count
+            for label in set(frames):
+                total[label] += count
+        return [(label, count, total[label]) for label, count in own.most_common(limit)]
+
+    def write(self, name: str, execution_id: Optional[str] = None) -> Path:
+        """
+        Grava o perfil, as pilhas "collapsed" e o relatório de memória do arquivo.
+
+        Args:
+            name (str): Nome do arquivo (fonte) processado.
+            execution_id (str, optional): Id da execução na auditoria.
+
+        Returns:
+            Path: O caminho base dos arquivos gravados (sem a extensão).
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        safe_name = re.sub(r'[^\w.-]+', '_', name)
+        base = self.output_dir / (f"{datetime.now():%Y%m%d_%H%M%S}_{safe_name}_"
+                                  f"{execution_id or 'sem_execucao'}")
+
+        with open(f"{base}.collapsed", 'w', encoding='utf-8') as f:
+            for stack, count in sorted(self._stacks.items()):
+                f.write(f"{';'.join(label.replace(';', ',') for label in stack)} {count}\n")
+
+        with open(f"{base}.profile.txt", 'w', encoding='utf-8') as f:
+            f.write(f"Arquivo: {name}\nExecução: {execution_id}\n")
+            f.write(f"Duração: {self.duration:.2f}s | Amostras: {self.samples} "
+                    f"(a cada {self.interval * 1000:g} ms) | Pico de memória: "
+                    f"{self.memory_peak / 1024 ** 2:.1f} MB | Amostras em espera: "
+                    f"{sum(self._idle.values())}\n\n")
+            f.write(f"{'próprio':>8} {'total':>8}  função\n")
+            for label, own, total in self.hot_functions(limit=None):
+                f.write(f"{own / max(self.samples, 1):8.1%} {total / max(self.samples, 1):8.1%}  {label}\n")
+
+        with open(f"{base}.memory.json", 'w', encoding='utf-8') as f:
+            json.dump({
+                'arquivo': name,
+                'execucao_id': execution_id,
+                'pico_bytes': self.memory_peak,
+                'maiores_alocacoes': [{'local': location, 'bytes': size, 'blocos': count}
+                                      for location, size, count in self.allocations],
+            }, f, ensure_ascii=False, indent=2)
+        return base
+
+    def summary(self, limit: int = 5) -> str:
+        """Resumo para o log: pico de memória e as funções com mais tempo próprio."""
+        idle = sum(self._idle.values())
+        lines = [f"{self.duration:.2f}s, {self.samples} amostras ({idle} em espera), "
+                 f"pico de memória {self.memory_peak / 1024 ** 2:.1f} MB"]
+        for label, own, total in self.hot_functions(limit):
+            lines.append(f"  {own / max(self.samples, 1):6.1%} próprio | "
+                         f"{total / max(self.samples, 1):6.1%} total | {label}")
+        return '\n'.join(lines)
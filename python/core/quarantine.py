@@ -0,0 +1,170 @@
+"""
+Este módulo, `quarantine`, grava em Parquet as linhas rejeitadas e avisadas de
+uma carga, no modo de quarentena do log de rejeições
+(`ETL_REJECTION_LOG_MODE=quarantine`).
+
+Em arquivos com muitas rejeições, gravar uma linha de `auditoria.log_rejeicao`
+por registro custa mais que a própria carga. Na quarentena:
+- As linhas, com as colunas e os valores do arquivo, o número da linha, a
+  severidade, o campo e o motivo, vão para
+  `processed/AAAA/MM/DD/quarentena_<execucao>_<linha>.parquet`, ao lado do
+  arquivo arquivado. Com o acervo (`ETL_ARCHIVE_MODE=store`), o diretório é o
+  do conteúdo no acervo (`ArchiveStore.quarantine_dir`).
+- O banco recebe apenas a contagem por severidade, campo e motivo
+  (`auditoria.resumo_rejeicao`), na mesma transação dos dados.
+- Com checkpoints, cada trecho confirmado tem o seu arquivo (o sufixo é a
+  primeira linha em quarentena do trecho); o trecho em andamento é descartado
+  se a carga falhar, e as suas linhas são gravadas de novo na retomada.
+
+As linhas com ERROR podem ser corrigidas e carregadas de novo com
+`python/scripts/reingest_quarantine.py`.
+"""
+
+import os
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from python.core.archive import open_archive
+from python.utils.rejection_summary import reason_category
+
+QUARANTINE_PREFIX = 'quarentena_'
+
+# Colunas acrescentadas às do arquivo em cada linha da quarentena
+META_COLUMNS = ('_numero_linha', '_severidade', '_campo_falha', '_motivo_rejeicao')
+
+
+def quarantine_files(processed_dir: Path, execucao_id: str) -> List[Path]:
+    """
+    Os arquivos de quarentena de uma execução, na ordem das linhas.
+
+    No acervo, o diretório vem do catálogo (o conteúdo que a execução
+    carregou); fora dele (ou em recargas da quarentena), dos diretórios
+    `AAAA/MM/DD`.
+    """
+    pattern = f"{QUARANTINE_PREFIX}{execucao_id}_*.parquet"
+    paths = set(Path(processed_dir).glob(f"[0-9][0-9][0-9][0-9]/*/*/{pattern}"))
+    archive = open_archive(processed_dir)
+    if archive is not None:
+        for archived in archive.find(execution_id=execucao_id):
+            paths.update(archive.quarantine_dir(archived.file_hash).glob(pattern))
+    return sorted(paths, key=lambda path: path.name)
+
+
+class QuarantineWriter:
+    """
+    Acumula as linhas em quarentena de uma execução em um Parquet temporário,
+    publicado a cada trecho confirmado (`publish`).
+    """
+
+    def __init__(self, processed_dir: Path, execucao_id: str, directory: Optional[Path] = None):
+        """
+        Args:
+            processed_dir (Path): Diretório de arquivos processados.
+            execucao_id (str): A execução (`historico_execucao`) da carga.
+            directory (Path, optional): Onde gravar os arquivos (ex: ao lado do
+                                        conteúdo no acervo). Por padrão,
+                                        `processed/AAAA/MM/DD/`.
+        """
+        self.processed_dir = Path(processed_dir)
+        self.execucao_id = execucao_id
+        self.directory = Path(directory) if directory is not None else None
+        # Contagens `{(severidade, campo, motivo): quantidade}` do trecho em andamento
+        self.counts = Counter()
+        # Arquivos já publicados e as suas linhas
+        self.files: List[Path] = []
+        self.rows = 0
+        self._pending_rows = 0
+        self._writer = None
+        self._schema = None
+        self._path: Optional[Path] = None
+        self._tmp_path: Optional[Path] = None
+
+    @staticmethod
+    def frame(batch, entries: List[Dict]):
+        """
+        Monta as linhas em quarentena de um lote: as colunas do arquivo, como
+        lidas, e as colunas de `META_COLUMNS`. Pode rodar fora da thread que
+        grava (ex: na preparação do lote).
+
+        Args:
+            batch (pd.DataFrame): O lote lido do arquivo (índice = linha - 2).
+            entries (list): As entradas de log do lote (avisos e rejeições).
+
+        Returns:
+            pd.DataFrame: As linhas, ou None se o lote não tiver entradas.
+        """
+        import pandas as pd
+
+        if not entries:
+            return None
+        meta = pd.DataFrame({
+            '_numero_linha': [entry['numero_linha'] for entry in entries],
+            '_severidade': [entry['severidade'] for entry in entries],
+            '_campo_falha': [entry['campo_falha'] for entry in entries],
+            '_motivo_rejeicao': [entry['motivo_rejeicao'] for entry in entries],
+        })
+        rows = batch.loc[meta['_numero_linha'].to_numpy() - 2]
+        rows = rows.loc[:, ~rows.columns.duplicated()].reset_index(drop=True)
+        # Texto continua texto (células vazias como nulo); colunas tipadas (Parquet) mantêm o tipo
+        for col in rows.columns:
+            if rows[col].dtype == object:
+                values = rows[col]
+                rows[col] = values.where(values.isna(), values.astype(str))
+        rows.columns = [str(col) for col in rows.columns]
+        return pd.concat([meta, rows], axis=1)
+
+    def write(self, frame) -> None:
+        """Acrescenta as linhas de `frame` ao trecho em andamento."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if frame is None or frame.empty:
+            return
+        if self._writer is None:
+            first_line = int(frame['_numero_linha'].min())
+            directory = self.directory or self.processed_dir / datetime.now().strftime("%Y/%m/%d")
+            directory.mkdir(parents=True, exist_ok=True)
+            self._path = directory / f"{QUARANTINE_PREFIX}{self.execucao_id}_{first_line:010d}.parquet"
+            self._tmp_path = self._path.with_name(f".{self._path.name}.{os.getpid()}.tmp")
+            if self._schema is None:
+                schema = pa.Schema.from_pandas(frame, preserve_index=False)
+                # Colunas só com nulos no primeiro lote ficam como texto
+                self._schema = pa.schema([pa.field(field.name, pa.string()) if field.type == pa.null()
+                                          else field for field in schema])
+            self._writer = pq.ParquetWriter(self._tmp_path, self._schema, compression='zstd')
+        self._writer.write_table(pa.Table.from_pandas(frame, schema=self._schema, preserve_index=False))
+
+        keys = zip(frame['_severidade'], frame['_campo_falha'], frame['_motivo_rejeicao'].map(reason_category))
+        self.counts.update(keys)
+        self._pending_rows += len(frame)
+
+    def publish(self) -> Optional[Path]:
+        """
+        Fecha e publica o arquivo do trecho em andamento (chamado depois de o
+        trecho ser confirmado no banco) e zera as contagens.
+
+        Returns:
+            Path: O arquivo publicado, ou None se o trecho não teve linhas.
+        """
+        self.counts = Counter()
+        if self._writer is None:
+            return None
+        self._writer.close()
+        self._writer = None
+        self._tmp_path.replace(self._path)
+        self.files.append(self._path)
+        self.rows += self._pending_rows
+        self._pending_rows = 0
+        return self._path
+
+    def discard(self) -> None:
+        """Descarta o trecho em andamento (a transação foi desfeita)."""
+        self.counts = Counter()
+        self._pending_rows = 0
+        if self._writer is None:
+            return
+        self._writer.close()
+        self._writer = None
+        self._tmp_path.unlink(missing_ok=True)
@@ -0,0 +1,582 @@
+"""
+Este módulo, `readers`, concentra a leitura dos arquivos de entrada do pipeline.
+
+Ele oferece as seguintes operações sobre um stream binário já aberto:
+- `read_header`: uma sonda que lê apenas o necessário para extrair a linha de
+  cabeçalho de arquivos CSV, XLSX e ODS. Isso permite rejeitar um arquivo com
+  o template errado em milissegundos, antes do parse completo.
+- `iter_batches`: a leitura dos dados em lotes (DataFrames de tamanho limitado),
+  para que arquivos grandes sejam processados com memória limitada.
+- `list_sheets`: os nomes das planilhas de uma pasta de trabalho (XLSX/ODS);
+  as duas operações acima aceitam o nome da planilha a ler.
+
+Parquet e Arrow IPC (Feather v2) são lidos com memory-map e mantêm os tipos
+das colunas: o cabeçalho vem do schema do arquivo (sem ler dados) e os lotes
+seguem tipados para a limpeza e o `COPY`, sem passar por texto.
+
+Planilhas são lidas por backends plugáveis de leitura em streaming
+(`SPREADSHEET_BACKENDS`): `calamine` (Rust, o mais rápido, se instalado) e
+`openpyxl` em modo read-only para XLSX / `iterparse` para ODS. Nenhum deles
+monta o DOM completo da pasta de trabalho, como faz o `pd.read_excel`.
+
+A sonda e a leitura compartilham o mesmo stream: o chamador faz `seek(0)` entre
+as duas etapas.
+"""
+
+import codecs
+import csv
+import io
+import os
+import zipfile
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+
+from python.core.file_handler import FileHandler
+
+CSV_SUFFIXES = ('.csv',)
+XLSX_SUFFIXES = ('.xlsx', '.xlsm')
+ODS_SUFFIXES = ('.ods',)
+PARQUET_SUFFIXES = ('.parquet',)
+ARROW_SUFFIXES = ('.arrow', '.feather', '.ipc')
+COLUMNAR_SUFFIXES = PARQUET_SUFFIXES + ARROW_SUFFIXES
+# Formatos de conteúdo aceitos pelo pipeline (.xls é lido pelo pandas, sem sonda)
+SUPPORTED_SUFFIXES = CSV_SUFFIXES + XLSX_SUFFIXES + ODS_SUFFIXES + COLUMNAR_SUFFIXES + ('.xls',)
+
+# Namespaces do formato OpenDocument usados na leitura do `content.xml`
+_ODF_TABLE = 'urn:oasis:names:tc:opendocument:xmlns:table:1.0'
+_ODF_TEXT = 'urn:oasis:names:tc:opendocument:xmlns:text:1.0'
+_ODS_TABLE_TAG = f'{{{_ODF_TABLE}}}table'
+_ODS_TABLE_NAME_ATTR = f'{{{_ODF_TABLE}}}name'
+_ODS_ROW_TAG = f'{{{_ODF_TABLE}}}table-row'
+_ODS_CELL_TAGS = (f'{{{_ODF_TABLE}}}table-cell', f'{{{_ODF_TABLE}}}covered-table-cell')
+_ODS_REPEAT_ATTR = f'{{{_ODF_TABLE}}}number-columns-repeated'
+_ODS_PARAGRAPH_TAG = f'{{{_ODF_TEXT}}}p'
+_ODS_SPACE_TAG = f'{{{_ODF_TEXT}}}s'
+_ODS_SPACE_COUNT_ATTR = f'{{{_ODF_TEXT}}}c'
+_ODS_TAB_TAG = f'{{{_ODF_TEXT}}}tab'
+_ODS_LINE_BREAK_TAG = f'{{{_ODF_TEXT}}}line-break'
+_ODS_VALUE_TYPE_ATTR = '{urn:oasis:names:tc:opendocument:xmlns:office:1.0}value-type'
+_ODS_VALUE_ATTR = '{urn:oasis:names:tc:opendocument:xmlns:office:1.0}value'
+_ODS_REPEAT_ROWS_ATTR = f'{{{_ODF_TABLE}}}number-rows-repeated'
+
+# Bytes que não formam UTF-8 válido são decodificados como Latin-1, byte a byte.
+# Substitui o antigo fallback de reler o arquivo inteiro em Latin-1, que não é
+# possível quando os lotes já foram entregues ao pipeline.
+def _latin1_fallback(error: UnicodeDecodeError):
+    return error.object[error.start:error.end].decode('latin-1'), error.end
+
+codecs.register_error('latin1_fallback', _latin1_fallback)
+
+
+@dataclass
+class HeaderInfo:
+    """
+    Resultado da sonda de cabeçalho de um arquivo.
+
+    Attributes:
+        columns (List[str]): Os nomes das colunas, na ordem do arquivo.
+        sep (str, optional): O separador detectado (apenas para CSV).
+        encoding (str, optional): O encoding que decodificou o cabeçalho (apenas para CSV).
+    """
+    columns: List[str]
+    sep: Optional[str] = None
+    encoding: Optional[str] = None
+
+
+def read_header(stream: BinaryIO, suffix: str, sheet: Optional[str] = None) -> Optional[HeaderInfo]:
+    """
+    Lê apenas o cabeçalho de um arquivo de entrada.
+
+    Args:
+        stream (BinaryIO): Stream binário posicionado no início do arquivo.
+        suffix (str): A extensão do arquivo (ex: '.csv', '.xlsx', '.ods', '.parquet').
+        sheet (str, optional): A planilha a ler, em pastas de trabalho (padrão: a primeira).
+
+    Returns:
+        HeaderInfo: As colunas do cabeçalho, ou `None` se o formato não tiver
+                    sonda disponível (o cabeçalho deve então ser validado após
+                    o parse completo).
+    """
+    suffix = suffix.lower()
+    if suffix in CSV_SUFFIXES:
+        return _read_csv_header(stream)
+    if suffix in XLSX_SUFFIXES:
+        return HeaderInfo(columns=_read_xlsx_header(stream, sheet))
+    if suffix in ODS_SUFFIXES:
+        return HeaderInfo(columns=_read_ods_header(stream, sheet))
+    if suffix in COLUMNAR_SUFFIXES:
+        return HeaderInfo(columns=list(_read_columnar_schema(stream, suffix).names))
+    return None
+
+
+def _read_csv_header(stream: BinaryIO) -> HeaderInfo:
+    """Lê a primeira linha do CSV, detectando encoding e separador."""
+    raw_line = stream.readline()
+    try:
+        # 'utf-8-sig' descarta o BOM (ex: CSVs exportados pelo Excel), como o parser do pandas
+        line, encoding = raw_line.decode('utf-8-sig'), 'utf-8'
+    except UnicodeDecodeError:
+        line, encoding = raw_line.decode('latin-1'), 'latin-1'
+
+    line = line.rstrip('\r\n')
+    sep = FileHandler.separator_from_line(line)
+    columns = next(csv.reader([line], delimiter=sep), [])
+    return HeaderInfo(columns=columns, sep=sep, encoding=encoding)
+
+
+def _read_xlsx_header(stream: BinaryIO, sheet: Optional[str] = None) -> List[str]:
+    """Lê a primeira linha não vazia de uma planilha (padrão: a primeira) em modo read-only."""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet else workbook.worksheets[0]
+        for row in worksheet.iter_rows(values_only=True):
+            if any(value is not None and str(value).strip() != '' for value in row):
+                return _normalize_header(list(row))
+        return []
+    finally:
+        workbook.close()
+
+
+def _read_ods_header(stream: BinaryIO, sheet: Optional[str] = None) -> List[str]:
+    """
+    Lê a primeira linha não vazia de uma tabela (padrão: a primeira) de um ODS.
+
+    O `content.xml` é percorrido com `iterparse` e a leitura é interrompida
+    assim que a linha de cabeçalho termina, evitando descompactar e montar a
+    árvore do documento inteiro (como faz o engine `odf` do pandas).
+    """
+    for values, _ in _iter_ods_table(stream, sheet, lambda cell: _ods_cell_text(cell) or None):
+        if any(value is not None and value.strip() != '' for value in values):
+            return _normalize_header(values)
+    return []
+
+
+def list_sheets(stream: BinaryIO, suffix: str) -> List[str]:
+    """
+    Lista os nomes das planilhas de uma pasta de trabalho, na ordem do arquivo.
+
+    Args:
+        stream (BinaryIO): Stream binário posicionado no início do arquivo.
+        suffix (str): A extensão do arquivo.
+
+    Returns:
+        List[str]: Os nomes das planilhas (lista vazia para formatos que não
+                   são pastas de trabalho, como CSV).
+    """
+    suffix = suffix.lower()
+    if suffix not in XLSX_SUFFIXES + ODS_SUFFIXES:
+        return []
+    try:
+        from python_calamine import CalamineWorkbook
+    except ImportError:
+        CalamineWorkbook = None
+
+    if CalamineWorkbook is not None:
+        workbook = CalamineWorkbook.from_filelike(stream)
+        try:
+            return list(workbook.sheet_names)
+        finally:
+            workbook.close()
+
+    if suffix in XLSX_SUFFIXES:
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(stream, read_only=True)
+        try:
+            return list(workbook.sheetnames)
+        finally:
+            workbook.close()
+
+    names = []
+    with zipfile.ZipFile(stream) as archive:
+        with archive.open('content.xml') as content:
+            for event, elem in ET.iterparse(content, events=('start', 'end')):
+                if event == 'start':
+                    if elem.tag == _ODS_TABLE_TAG:
+                        names.append(elem.get(_ODS_TABLE_NAME_ATTR))
+                elif elem.tag in (_ODS_ROW_TAG, _ODS_TABLE_TAG):
+                    elem.clear()
+    return names
+
+
+def iter_batches(stream: BinaryIO, suffix: str, header: Optional[HeaderInfo],
+                 batch_size: int, backend: str = 'auto',
+                 sheet: Optional[str] = None, track_offsets: bool = False,
+                 start_offset: Optional[int] = None, start_row: int = 0) -> Iterator['pd.DataFrame']:
+    """
+    Lê os dados de um arquivo em lotes de no máximo `batch_size` linhas.
+
+    Todas as colunas são entregues como texto (equivalente a `dtype=str`),
+    exceto em Parquet/Arrow IPC, que preservam os tipos do arquivo. O
+    índice dos lotes é contínuo ao longo do arquivo (o primeiro lote começa
+    em 0), de forma que `indice + 2` continua sendo o número da linha no arquivo.
+
+    Args:
+        stream (BinaryIO): Stream binário posicionado no início do arquivo.
+        suffix (str): A extensão do arquivo.
+        header (HeaderInfo, optional): O resultado da sonda de cabeçalho, se houver.
+        batch_size (int): Número máximo de linhas por lote.
+        backend (str): Backend de planilhas ('auto', 'calamine', 'openpyxl').
+        sheet (str, optional): A planilha a ler, em pastas de trabalho (padrão: a primeira).
+        track_offsets (bool): Apenas CSV: registra em `df.attrs['end_offset']`
+                              a posição no stream logo após o último registro
+                              de cada lote (ver `_iter_csv_batches_tracked`).
+        start_offset (int, optional): Apenas CSV com `track_offsets`: retoma a
+                              leitura nesta posição (um `end_offset` anterior).
+        start_row (int): Índice do primeiro registro lido a partir de `start_offset`.
+
+    Yields:
+        pd.DataFrame: Os lotes de dados do arquivo.
+    """
+    suffix = suffix.lower()
+    if suffix in CSV_SUFFIXES and track_offsets:
+        yield from _iter_csv_batches_tracked(stream, header, batch_size, start_offset, start_row)
+    elif suffix in CSV_SUFFIXES:
+        yield from _iter_csv_batches(stream, header, batch_size)
+    elif suffix in XLSX_SUFFIXES + ODS_SUFFIXES:
+        rows = _spreadsheet_backend(suffix, backend)(stream, suffix, sheet)
+        yield from _rows_to_batches(rows, batch_size)
+    elif suffix in COLUMNAR_SUFFIXES:
+        yield from _iter_columnar_batches(stream, suffix, batch_size)
+    else:
+        # Formatos legados (ex: .xls) continuam no pandas, em um único lote
+        import pandas as pd
+        yield pd.read_excel(stream, dtype=str)
+
+
+def _iter_csv_batches(stream: BinaryIO, header: HeaderInfo, batch_size: int) -> Iterator['pd.DataFrame']:
+    """Lê um CSV em lotes com o parser C do pandas."""
+    import pandas as pd
+
+    encoding = header.encoding if header and header.encoding else 'utf-8'
+    yield from pd.read_csv(stream, sep=header.sep if header else ',', encoding=encoding,
+                           encoding_errors='latin1_fallback', dtype=str, engine='c',
+                           on_bad_lines='skip', chunksize=batch_size)
+
+
+def _iter_csv_batches_tracked(stream: BinaryIO, header: HeaderInfo, batch_size: int,
+                              start_offset: Optional[int] = None,
+                              start_row: int = 0) -> Iterator['pd.DataFrame']:
+    """
+    Lê um CSV em lotes cujos limites em bytes são conhecidos, para checkpoints.
+
+    Os registros são separados em Python (uma quebra de linha só termina um
+    registro fora de aspas, e aspas duplicadas `""` mantêm a paridade), e
+    cada lote é então analisado pelo parser C do pandas, com as mesmas opções
+    de `_iter_csv_batches`. `df.attrs['end_offset']` guarda a posição logo
+    após o lote, de onde `start_offset` retoma a leitura sem reler o início.
+    """
+    import pandas as pd
+
+    sep = header.sep if header else ','
+    encoding = header.encoding if header and header.encoding else 'utf-8'
+    header_line = stream.readline()
+    offset = len(header_line)
+    if not header_line.endswith(b'\n'):
+        header_line += b'\n'
+    if start_offset is not None:
+        stream.seek(start_offset)
+        offset = start_offset
+
+    def parse(lines, row):
+        # Cada lote é analisado com a linha de cabeçalho original (mesmo
+        # tratamento de nomes repetidos), repetida como primeira linha de
+        # dados e descartada em seguida: sem ela, um lote que começa por uma
+        # linha com colunas a mais faria o pandas usar a primeira coluna como
+        # índice, em vez de descartar a linha como no restante do arquivo.
+        df = pd.read_csv(io.BytesIO(b''.join([header_line, header_line] + lines)), sep=sep,
+                         encoding=encoding, encoding_errors='latin1_fallback', dtype=str,
+                         engine='c', on_bad_lines='skip').iloc[1:]
+        df.index = pd.RangeIndex(row, row + len(df))
+        df.attrs['end_offset'] = offset
+        return df
+
+    row = start_row
+    lines = []
+    records = 0
+    quoted = False
+    for line in stream:
+        offset += len(line)
+        lines.append(line)
+        if line.count(b'"') % 2:
+            quoted = not quoted
+        if quoted:
+            continue
+        records += 1
+        if records >= batch_size:
+            df = parse(lines, row)
+            row += len(df)
+            lines, records = [], 0
+            yield df
+
+    if lines or row == start_row:
+        yield parse(lines, row)
+
+
+def _arrow_source(stream: BinaryIO):
+    """
+    Retorna uma fonte do pyarrow para o stream: um memory-map do arquivo em
+    disco (leitura sem cópia) ou, para streams sem caminho, o próprio stream.
+    """
+    import pyarrow as pa
+
+    name = getattr(stream, 'name', None)
+    if isinstance(name, str) and os.path.isfile(name):
+        return pa.memory_map(name, 'r')
+    return pa.PythonFile(stream, mode='r')
+
+
+def _read_columnar_schema(stream: BinaryIO, suffix: str) -> 'pa.Schema':
+    """Lê o schema de um Parquet (rodapé) ou Arrow IPC (mensagem inicial), sem ler dados."""
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+
+    with _arrow_source(stream) as source:
+        if suffix in PARQUET_SUFFIXES:
+            return pq.read_schema(source)
+        return ipc.open_file(source).schema
+
+
+def _iter_columnar_batches(stream: BinaryIO, suffix: str, batch_size: int) -> Iterator['pd.DataFrame']:
+    """
+    Lê um Parquet ou Arrow IPC em lotes tipados.
+
+    Inteiros viram o tipo inteiro anulável do pandas (para não virarem float
+    com nulos), decimais viram float e datas viram `datetime64`, tipos que a
+    limpeza aceita sem parse.
+    """
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+
+    def types_mapper(arrow_type):
+        if pa.types.is_integer(arrow_type):
+            return pd.Int64Dtype()
+        return None
+
+    with _arrow_source(stream) as source:
+        if suffix in PARQUET_SUFFIXES:
+            parquet_file = pq.ParquetFile(source)
+            schema = parquet_file.schema_arrow
+            record_batches = parquet_file.iter_batches(batch_size=batch_size)
+        else:
+            reader = ipc.open_file(source)
+            schema = reader.schema
+            record_batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+
+        # Decimais viram float64, como os valores numéricos lidos de texto
+        target_schema = pa.schema([
+            field.with_type(pa.float64()) if pa.types.is_decimal(field.type) else field
+            for field in schema
+        ])
+
+        offset = 0
+        for record_batch in record_batches:
+            if target_schema != schema:
+                record_batch = record_batch.cast(target_schema)
+            # Fatias sem cópia para respeitar o tamanho do lote em arquivos IPC
+            for start in range(0, record_batch.num_rows, batch_size):
+                chunk = record_batch.slice(start, batch_size)
+                df = chunk.to_pandas(date_as_object=False, types_mapper=types_mapper)
+                df.index = pd.RangeIndex(offset, offset + len(df))
+                offset += len(df)
+                yield df
+        if offset == 0:
+            yield target_schema.empty_table().to_pandas(date_as_object=False, types_mapper=types_mapper)
+
+
+def _iter_calamine_rows(stream: BinaryIO, suffix: str, sheet: Optional[str] = None) -> Iterator[List[Any]]:
+    """Itera as linhas de uma planilha (padrão: a primeira) com o `python-calamine` (XLSX e ODS)."""
+    from python_calamine import CalamineWorkbook
+
+    workbook = CalamineWorkbook.from_filelike(stream)
+    try:
+        worksheet = workbook.get_sheet_by_name(sheet) if sheet else workbook.get_sheet_by_index(0)
+        yield from worksheet.iter_rows()
+    finally:
+        workbook.close()
+
+
+def _iter_openpyxl_rows(stream: BinaryIO, suffix: str, sheet: Optional[str] = None) -> Iterator[List[Any]]:
+    """Itera as linhas de uma planilha (padrão: a primeira) de um XLSX com o openpyxl em modo read-only."""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet else workbook.worksheets[0]
+        yield from worksheet.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def _iter_ods_rows(stream: BinaryIO, suffix: str, sheet: Optional[str] = None) -> Iterator[List[Any]]:
+    """
+    Itera as linhas de uma tabela (padrão: a primeira) de um ODS com
+    `iterparse`, liberando cada linha da memória assim que ela é entregue.
+    """
+    for values, row_repeat in _iter_ods_table(stream, sheet, _ods_cell_value):
+        # Linhas vazias repetidas (preenchimento do LibreOffice até o fim
+        # da planilha) não são expandidas
+        if all(value is None for value in values):
+            continue
+        for _ in range(row_repeat):
+            yield values
+
+
+def _iter_ods_table(stream: BinaryIO, sheet: Optional[str],
+                    cell_value: Callable[[Any], Any]) -> Iterator[Tuple[List[Any], int]]:
+    """
+    Percorre o `content.xml` de um ODS e entrega as linhas da tabela `sheet`
+    (ou da primeira tabela) como `(valores, repetições da linha)`.
+
+    As linhas das demais tabelas são descartadas da memória à medida que são
+    lidas, e a leitura termina ao fim da tabela desejada.
+    """
+    with zipfile.ZipFile(stream) as archive:
+        with archive.open('content.xml') as content:
+            in_table = False
+            for event, elem in ET.iterparse(content, events=('start', 'end')):
+                if event == 'start':
+                    if elem.tag == _ODS_TABLE_TAG and (sheet is None or elem.get(_ODS_TABLE_NAME_ATTR) == sheet):
+                        in_table = True
+                    continue
+
+                if elem.tag == _ODS_TABLE_TAG:
+                    if in_table:
+                        return
+                    elem.clear()
+                    continue
+                if elem.tag != _ODS_ROW_TAG:
+                    continue
+                if not in_table:
+                    elem.clear()
+                    continue
+
+                values = []
+                for cell in elem:
+                    if cell.tag not in _ODS_CELL_TAGS:
+                        continue
+                    repeat = int(cell.get(_ODS_REPEAT_ATTR, 1))
+                    values.extend([cell_value(cell)] * repeat)
+                row_repeat = int(elem.get(_ODS_REPEAT_ROWS_ATTR, 1))
+                elem.clear()
+                yield values, row_repeat
+
+
+def _ods_cell_value(cell) -> Any:
+    """Extrai o valor de uma célula ODS, preferindo o valor numérico bruto."""
+    if cell.get(_ODS_VALUE_TYPE_ATTR) in ('float', 'percentage', 'currency'):
+        return float(cell.get(_ODS_VALUE_ATTR))
+    return _ods_cell_text(cell) or None
+
+
+def _ods_cell_text(cell) -> str:
+    """
+    Monta o texto de uma célula ODS, expandindo os espaços codificados como
+    `<text:s text:c="N"/>` (espaços iniciais e repetidos), tabulações e quebras.
+    """
+    def element_text(elem) -> str:
+        parts = [elem.text or '']
+        for child in elem:
+            if child.tag == _ODS_SPACE_TAG:
+                parts.append(' ' * int(child.get(_ODS_SPACE_COUNT_ATTR, 1)))
+            elif child.tag == _ODS_TAB_TAG:
+                parts.append('\t')
+            elif child.tag == _ODS_LINE_BREAK_TAG:
+                parts.append('\n')
+            else:
+                parts.append(element_text(child))
+            parts.append(child.tail or '')
+        return ''.join(parts)
+
+    return '\n'.join(element_text(p) for p in cell.iter(_ODS_PARAGRAPH_TAG))
+
+
+def _spreadsheet_backend(suffix: str, backend: str) -> Callable[..., Iterator[List[Any]]]:
+    """Escolhe o backend de leitura de planilhas, priorizando o `calamine` no modo 'auto'."""
+    if backend == 'auto':
+        try:
+            import python_calamine  # noqa: F401
+            backend = 'calamine'
+        except ImportError:
+            backend = 'openpyxl'
+
+    try:
+        backends = SPREADSHEET_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Backend de planilhas desconhecido: '{backend}'. "
+                         f"Opções: {', '.join(SPREADSHEET_BACKENDS)}")
+    return backends['ods' if suffix in ODS_SUFFIXES else 'xlsx']
+
+
+# Backends de leitura de planilhas. Cada backend fornece uma função por formato
+# que recebe o stream, a extensão e o nome da planilha (None para a primeira) e
+# devolve um iterador de linhas (listas de valores).
+SPREADSHEET_BACKENDS: Dict[str, Dict[str, Callable[..., Iterator[List[Any]]]]] = {
+    'calamine': {'xlsx': _iter_calamine_rows, 'ods': _iter_calamine_rows},
+    'openpyxl': {'xlsx': _iter_openpyxl_rows, 'ods': _iter_ods_rows},
+}
+
+
+def _rows_to_batches(rows: Iterator[List[Any]], batch_size: int) -> Iterator['pd.DataFrame']:
+    """
+    Agrupa as linhas de uma planilha em DataFrames de texto, usando a primeira
+    linha não vazia como cabeçalho e ignorando linhas totalmente vazias (como
+    o `pd.read_excel`).
+    """
+    import pandas as pd
+
+    columns = None
+    batch = []
+    offset = 0
+    for row in rows:
+        values = [_cell_to_str(value) for value in row]
+        if all(value is None or value.strip() == '' for value in values):
+            continue
+        if columns is None:
+            columns = _normalize_header(list(row))
+            continue
+
+        width = len(columns)
+        values = values[:width] + [None] * (width - len(values))
+        batch.append(values)
+        if len(batch) >= batch_size:
+            yield pd.DataFrame(batch, columns=columns, dtype=object,
+                               index=pd.RangeIndex(offset, offset + len(batch)))
+            offset += len(batch)
+            batch = []
+
+    if batch or offset == 0:
+        yield pd.DataFrame(batch, columns=columns or [], dtype=object,
+                           index=pd.RangeIndex(offset, offset + len(batch)))
+
+
+def _cell_to_str(value: Any) -> Optional[str]:
+    """Converte o valor de uma célula para texto, com as mesmas regras do `pd.read_excel(dtype=str)`."""
+    if value is None:
+        return None
+    if isinstance(value, float):
+        return str(int(value)) if value.is_integer() else str(value)
+    if isinstance(value, datetime):
+        return str(value)
+    if isinstance(value, date):
+        return str(datetime(value.year, value.month, value.day))
+    value = str(value)
+    return value if value != '' else None
+
+
+def _normalize_header(values: List) -> List[str]:
+    """
+    Normaliza uma linha de cabeçalho de planilha para o mesmo formato que o
+    `pd.read_excel` produziria: remove células vazias ao final e nomeia as
+    vazias intermediárias como `Unnamed: N`.
+    """
+    values = [_cell_to_str(value) for value in values]
+    while values and values[-1] is None:
+        values.pop()
+    return [f"Unnamed: {i}" if value is None else value for i, value in enumerate(values)]
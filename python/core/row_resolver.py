@@ -0,0 +1,283 @@
+"""
+Este módulo, `row_resolver`, recupera sob demanda as linhas originais de um
+arquivo já carregado, a partir da cópia arquivada em `processed/`.
+
+No modo compacto do log de rejeições (`ETL_REJECTION_LOG_MODE=compact`),
+`auditoria.log_rejeicao` guarda apenas a execução, o número da linha e os
+campos com falha. O registro completo é lido do arquivo arquivado quando
+alguém precisa dele:
+
+- O arquivo é localizado em `processed/AAAA/MM/DD/HHMMSS_<nome>` pelo nome
+  gravado na execução e confirmado pelo hash (`historico_execucao.file_hash`).
+  Com o acervo (`processed/archive`, ver `python.core.archive`), ele é
+  procurado primeiro no catálogo, pelo hash ou pela execução, e lido em
+  streaming do objeto compactado.
+- Em CSV (inclusive compactados e membros de `.zip`), um índice esparso com a
+  posição em bytes de um a cada `INDEX_STRIDE` registros é montado na primeira
+  consulta e guardado em `ROW_INDEX_DIR`, pelo hash. As consultas seguintes
+  leem no máximo `INDEX_STRIDE` registros a partir da posição mais próxima.
+- Planilhas e formatos colunares são relidos pelo mesmo leitor da carga.
+
+A numeração é a da carga (`numero_linha` = índice do registro + 2): linhas em
+branco e registros com colunas a mais, descartados pelo parser, não contam.
+"""
+
+import csv
+from array import array
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from python.core.archive import open_archive
+from python.core.inputs import InputSource
+from python.core.readers import CSV_SUFFIXES, iter_batches, read_header
+
+# Diretório padrão dos índices de posição, por hash do arquivo
+ROW_INDEX_DIR = Path("docker/data/cache/row_offsets")
+
+# Registros entre duas posições guardadas no índice
+INDEX_STRIDE = 1000
+
+
+def split_source_name(name: str):
+    """
+    Separa o nome de uma fonte (`InputSource.name`) em arquivo, membro do `.zip`
+    e planilha. Ex: 'exportacao.zip/faturamento.csv' → ('exportacao.zip', 'faturamento.csv', None).
+    """
+    sheet = None
+    if '#' in name:
+        name, sheet = name.rsplit('#', 1)
+    file_name, _, member = name.partition('/')
+    return file_name, member or None, sheet
+
+
+class ArchivedRowResolver:
+    """
+    Lê linhas de arquivos arquivados em `processed/` pelo número da linha.
+    """
+
+    def __init__(self, processed_dir: Path, index_dir: Path = ROW_INDEX_DIR, stride: int = INDEX_STRIDE,
+                 archive=None):
+        """
+        Args:
+            processed_dir (Path): Diretório de arquivos processados.
+            index_dir (Path): Diretório dos índices de posição (um por hash).
+            stride (int): Registros entre duas posições do índice.
+            archive (ArchiveStore, optional): O acervo; por padrão, o de
+                                              `processed_dir`, se existir.
+        """
+        self.processed_dir = Path(processed_dir)
+        self.index_dir = Path(index_dir)
+        self.stride = stride
+        self.archive = archive if archive is not None else open_archive(self.processed_dir)
+
+    def locate(self, source_name: str, file_hash: str, processed_at: Optional[datetime] = None,
+               execution_id: Optional[str] = None) -> Optional[InputSource]:
+        """
+        Localiza a cópia arquivada de uma fonte e confirma o seu hash.
+
+        Args:
+            source_name (str): O nome da fonte (`historico_execucao.tabela_origem`).
+            file_hash (str): O hash gravado na execução.
+            processed_at (datetime, optional): Início da execução: as pastas
+                                               desse dia e do seguinte são
+                                               verificadas primeiro.
+            execution_id (str, optional): A execução, procurada no catálogo do acervo.
+
+        Returns:
+            InputSource: A fonte no arquivo arquivado, ou None se não encontrada.
+        """
+        file_name, member, sheet = split_source_name(source_name)
+        if self.archive is not None:
+            source = self._locate_archived(file_name, member, sheet, file_hash, execution_id)
+            if source is not None:
+                return source
+
+        candidates = [path for path in self.processed_dir.glob('*/*/*/*')
+                      if path.name[6:7] == '_' and path.name[7:] == file_name]
+        if processed_at is not None:
+            days = {(processed_at + timedelta(days=offset)).strftime('%Y/%m/%d') for offset in (0, 1)}
+            candidates.sort(key=lambda path: path.parent.relative_to(self.processed_dir).as_posix() not in days)
+
+        for path in candidates:
+            source = InputSource(path, member, sheet)
+            try:
+                if source.content_hash() == file_hash:
+                    return source
+            except (OSError, KeyError):
+                continue
+        return None
+
+    def _locate_archived(self, file_name: str, member: Optional[str], sheet: Optional[str],
+                         file_hash: str, execution_id: Optional[str]) -> Optional[InputSource]:
+        """Procura a fonte no acervo: pelo hash (arquivos simples) ou pela execução e pelo nome."""
+        if member is None and sheet is None:
+            # O hash de um arquivo simples é o do próprio objeto
+            return self.archive.source(file_hash)
+
+        candidates = self.archive.find(execution_id=execution_id) if execution_id is not None else []
+        candidates += self.archive.find(name=file_name)
+        for archived in candidates:
+            source = InputSource(archived.path, member, sheet)
+            try:
+                if source.content_hash() == file_hash:
+                    return source
+            except (OSError, KeyError):
+                continue
+        return None
+
+    def rows(self, source: InputSource, file_hash: str, line_numbers: Iterable[int]) -> Dict[int, Dict]:
+        """
+        Lê as linhas pedidas de uma fonte.
+
+        Args:
+            source (InputSource): A fonte arquivada (ver `locate`).
+            file_hash (str): O hash da fonte (chave do índice de posições).
+            line_numbers (Iterable[int]): Números de linha, como em `log_rejeicao`.
+
+        Returns:
+            dict: `{numero_linha: {coluna: valor}}`, com os nomes de coluna do
+                  arquivo. Linhas fora do arquivo não aparecem.
+        """
+        targets = sorted({int(line) - 2 for line in line_numbers if line is not None and int(line) >= 2})
+        if not targets:
+            return {}
+        if source.suffix.lower() in CSV_SUFFIXES:
+            return self._csv_rows(source, file_hash, targets)
+        return self._batch_rows(source, targets)
+
+    def _batch_rows(self, source: InputSource, targets: List[int]) -> Dict[int, Dict]:
+        """Planilhas e formatos colunares: relê os lotes até a última linha pedida."""
+        found = {}
+        wanted = set(targets)
+        with source.open() as stream:
+            header = read_header(stream, source.suffix, source.sheet)
+            stream.seek(0)
+            for batch in iter_batches(stream, source.suffix, header, 10000, sheet=source.sheet):
+                hits = batch[batch.index.isin(wanted)]
+                for index, record in zip(hits.index, hits.astype(object).where(hits.notna(), None)
+                                         .to_dict('records')):
+                    found[index + 2] = record
+                if len(batch) and batch.index[-1] >= targets[-1]:
+                    break
+        return found
+
+    def _csv_rows(self, source: InputSource, file_hash: str, targets: List[int]) -> Dict[int, Dict]:
+        """CSV: posiciona o stream pelo índice e lê apenas os registros pedidos."""
+        with source.open() as stream:
+            header = read_header(stream, source.suffix)
+            offsets = self._load_index(file_hash)
+            if offsets is None:
+                stream.seek(0)
+                offsets = self._build_index(stream, header)
+                self._save_index(file_hash, offsets)
+
+            found = {}
+            pending = list(targets)
+            while pending:
+                block = pending[0] // self.stride
+                if block >= len(offsets):
+                    break
+                stream.seek(offsets[block])
+                record_index = block * self.stride
+                for fields in self._records(stream, header):
+                    if record_index == pending[0]:
+                        found[record_index + 2] = dict(zip(header.columns, fields + [None] * (
+                            len(header.columns) - len(fields))))
+                        pending.pop(0)
+                        if not pending or pending[0] // self.stride != block:
+                            break
+                    record_index += 1
+                else:
+                    break
+        return found
+
+    def _records(self, stream, header, with_offsets: bool = False):
+        """
+        Percorre os registros do CSV a partir da posição atual do stream, com
+        as regras do parser da carga (aspas com quebras de linha, linhas em
+        branco e registros com colunas a mais descartados).
+
+        Yields:
+            list: Os campos de cada registro (ou `(posição, campos)` com `with_offsets`).
+        """
+        columns = len(header.columns)
+        offset = stream.tell() if with_offsets else 0
+        start = offset
+        lines = []
+        quoted = False
+        for line in stream:
+            offset += len(line)
+            lines.append(line)
+            if line.count(b'"') % 2:
+                quoted = not quoted
+            if quoted:
+                continue
+            raw = b''.join(lines).decode(header.encoding or 'utf-8', errors='latin1_fallback')
+            lines = []
+            record_start, start = start, offset
+            if not raw.strip('\r\n'):
+                continue
+            fields = next(csv.reader([raw.rstrip('\r\n')], delimiter=header.sep or ','), [])
+            if len(fields) > columns:
+                continue
+            yield (record_start, fields) if with_offsets else fields
+
+    def _build_index(self, stream, header) -> array:
+        """Posição em bytes de um a cada `stride` registros (o stream começa no início do arquivo)."""
+        stream.readline()
+        offsets = array('q')
+        for index, (offset, _) in enumerate(self._records(stream, header, with_offsets=True)):
+            if index % self.stride == 0:
+                offsets.append(offset)
+        return offsets
+
+    def _index_path(self, file_hash: str) -> Path:
+        return self.index_dir / f"{file_hash}_{self.stride}.offsets"
+
+    def _load_index(self, file_hash: str) -> Optional[array]:
+        path = self._index_path(file_hash)
+        if not path.exists():
+            return None
+        offsets = array('q')
+        offsets.frombytes(path.read_bytes())
+        return offsets
+
+    def _save_index(self, file_hash: str, offsets: array) -> None:
+        try:
+            self.index_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self._index_path(file_hash).with_suffix('.tmp')
+            tmp.write_bytes(offsets.tobytes())
+            tmp.replace(self._index_path(file_hash))
+        except OSError as e:
+            print(f"   ⚠️  Não foi possível gravar o índice de posições ({e}); ele será remontado na próxima consulta.")
+
+    def resolve(self, conn, execucao_id: str, line_numbers: Iterable[int]) -> Dict[int, Dict]:
+        """
+        Recupera as linhas de uma execução a partir do arquivo arquivado.
+
+        Args:
+            conn: Conexão com o banco de dados.
+            execucao_id (str): O id da execução (`log_rejeicao.execucao_fk`).
+            line_numbers (Iterable[int]): Números de linha, como em `log_rejeicao`.
+
+        Returns:
+            dict: `{numero_linha: {coluna: valor}}`.
+
+        Raises:
+            LookupError: Se a execução ou o arquivo arquivado não forem encontrados.
+        """
+        from python.utils.db_connection import get_cursor
+
+        with get_cursor(conn) as cur:
+            cur.execute("SELECT tabela_origem, file_hash, data_inicio FROM auditoria.historico_execucao "
+                        "WHERE id = %s", (execucao_id,))
+            found = cur.fetchone()
+        if found is None:
+            raise LookupError(f"Execução {execucao_id} não encontrada")
+        source_name, file_hash, started = found
+        source = self.locate(source_name, file_hash, started, execucao_id)
+        if source is None:
+            raise LookupError(f"Arquivo arquivado de '{source_name}' (hash {file_hash}) "
+                              f"não encontrado em {self.processed_dir}")
+        return self.rows(source, file_hash, line_numbers)
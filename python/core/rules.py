@@ -0,0 +1,212 @@
+"""
+Este módulo, `rules`, define as regras de validação que cada ingestor declara
+por coluna e as compila em operações vetorizadas sobre o lote inteiro.
+
+Um ingestor declara as regras junto com as colunas obrigatórias:
+
+    rules={
+        'status_vendedor': [Domain(['Ativo', 'Inativo'])],
+        'cnpj': [CnpjCpf()],
+        'descontos': [NonNegative(severity='ERROR')],
+    }
+
+`compile_rules` transforma a declaração em uma lista de verificações, cada
+uma uma máscara booleana calculada sobre a coluna toda (sem laço Python por
+linha), avaliadas em uma única passada por lote (`CompiledRules.evaluate`).
+As falhas seguem o fluxo de rejeição já existente (ver `BaseIngestor._prepare_batch`):
+- WARN: a linha é carregada e a falha vai para o log de rejeições;
+- ERROR: a linha é rejeitada, como um valor numérico ou uma data inválida.
+
+Células vazias não são verificadas (ver `mandatory_cols`). As regras rodam
+depois da limpeza de tipos: `NonNegative` recebe os números já convertidos.
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+SEVERITIES = ('WARN', 'ERROR')
+
+
+class Rule:
+    """Regra de validação de uma coluna."""
+
+    # Descrição das falhas no resumo da carga (ex: "3 valores fora do domínio")
+    kind = 'valores inválidos'
+
+    def __init__(self, severity: str = 'WARN'):
+        """
+        Args:
+            severity (str): 'WARN' (a linha é carregada) ou 'ERROR' (a linha é rejeitada).
+        """
+        if severity not in SEVERITIES:
+            raise ValueError(f"Severidade inválida: {severity!r} (use {' ou '.join(SEVERITIES)})")
+        self.severity = severity
+
+    def check(self, values):
+        """
+        Verifica uma coluna do lote.
+
+        Args:
+            values (pd.Series): Os valores da coluna (após a limpeza de tipos).
+
+        Returns:
+            pd.Series: Máscara booleana, True para os valores que violam a regra.
+        """
+        raise NotImplementedError
+
+    def reason(self, col: str) -> str:
+        """O motivo da falha no log, sem o valor recebido."""
+        raise NotImplementedError
+
+
+def _as_text(values):
+    """
+    O texto dos valores de uma coluna. Em colunas tipadas (Parquet/Arrow IPC),
+    números inteiros lidos como float (ex: 1.0, por causa de células vazias)
+    viram o texto do inteiro ('1'), como viriam de um CSV.
+    """
+    text = values.astype(str)
+    if values.dtype.kind == 'f':
+        whole = values.notna() & (values % 1 == 0) & (values.abs() < 2 ** 53)
+        text[whole] = values[whole].astype('int64').astype(str)
+    return text
+
+
+class Domain(Rule):
+    """O valor deve pertencer a um conjunto de valores permitidos."""
+
+    kind = 'valores fora do domínio'
+
+    def __init__(self, values: Iterable[str], case_sensitive: bool = False, severity: str = 'WARN'):
+        """
+        Args:
+            values (Iterable[str]): Os valores permitidos.
+            case_sensitive (bool): Se False, 'ATIVO' e 'Ativo' são o mesmo valor.
+            severity (str): 'WARN' ou 'ERROR'.
+        """
+        super().__init__(severity)
+        self.values = list(values)
+        self.case_sensitive = case_sensitive
+        self._normalized = {self._normalize(value) for value in self.values}
+
+    def _normalize(self, value: str) -> str:
+        value = value.strip()
+        return value if self.case_sensitive else value.upper()
+
+    def check(self, values):
+        # Só os valores que não batem exatamente são normalizados (espaços e maiúsculas)
+        failed = ~values.isin(self.values) & values.notna()
+        if failed.any():
+            normalized = _as_text(values[failed]).str.strip()
+            if not self.case_sensitive:
+                normalized = normalized.str.upper()
+            failed.loc[failed] = (~normalized.isin(self._normalized) & (normalized != '')).to_numpy()
+        return failed
+
+    def reason(self, col: str) -> str:
+        return f"Valor fora do domínio em '{col}'"
+
+
+class MaxLength(Rule):
+    """O texto não pode passar de um tamanho máximo."""
+
+    kind = 'valores acima do tamanho máximo'
+
+    def __init__(self, length: int, severity: str = 'WARN'):
+        """
+        Args:
+            length (int): Quantidade máxima de caracteres.
+            severity (str): 'WARN' ou 'ERROR'.
+        """
+        super().__init__(severity)
+        self.length = length
+
+    def check(self, values):
+        return values.fillna('').astype(str).str.len() > self.length
+
+    def reason(self, col: str) -> str:
+        return f"Valor com mais de {self.length} caracteres em '{col}'"
+
+
+class NonNegative(Rule):
+    """O número não pode ser negativo."""
+
+    kind = 'valores negativos'
+
+    def check(self, values):
+        import pandas as pd
+
+        return pd.to_numeric(values, errors='coerce') < 0
+
+    def reason(self, col: str) -> str:
+        return f"Valor negativo em '{col}'"
+
+
+class CnpjCpf(Rule):
+    """
+    O valor deve ser um CNPJ ou CPF com os dígitos verificadores corretos
+    (ver `validators.mascara_cnpj_cpf_invalidos`: CNPJs sem os zeros à
+    esquerda são aceitos).
+    """
+
+    kind = 'CPFs/CNPJs inválidos'
+
+    def check(self, values):
+        from python.utils.validators import mascara_cnpj_cpf_invalidos
+
+        return mascara_cnpj_cpf_invalidos(values)
+
+    def reason(self, col: str) -> str:
+        return f"CPF/CNPJ inválido em '{col}'"
+
+
+class CompiledRules:
+    """As regras de um ingestor, prontas para rodar sobre os lotes."""
+
+    def __init__(self, checks: List[Tuple[str, Rule]]):
+        """
+        Args:
+            checks (list): `(coluna, regra)`, na ordem de avaliação.
+        """
+        self.checks = checks
+
+    def __bool__(self) -> bool:
+        return bool(self.checks)
+
+    def evaluate(self, df) -> List[Tuple[str, Rule, object]]:
+        """
+        Avalia todas as regras sobre um lote, em uma passada.
+
+        Args:
+            df (pd.DataFrame): O lote, já com os nomes e os tipos do banco.
+
+        Returns:
+            list: `(coluna, regra, máscara)` das regras com alguma falha no lote.
+                  Colunas ausentes do lote são ignoradas.
+        """
+        failures = []
+        for col, rule in self.checks:
+            if col not in df.columns:
+                continue
+            failed = rule.check(df[col])
+            if failed.any():
+                failures.append((col, rule, failed))
+        return failures
+
+
+def compile_rules(rules: Dict[str, List[Rule]]) -> CompiledRules:
+    """
+    Compila as regras declaradas por um ingestor. As regras ERROR rodam antes
+    das WARN, e cada linha é rejeitada pela primeira regra ERROR que violar.
+
+    Args:
+        rules (dict): `{coluna: [regra, ...]}`.
+
+    Returns:
+        CompiledRules: As regras prontas para `evaluate`.
+    """
+    checks = [(col, rule) for col, col_rules in rules.items() for rule in col_rules]
+    for col, rule in checks:
+        if not isinstance(rule, Rule):
+            raise TypeError(f"Regra inválida para a coluna '{col}': {rule!r}")
+    checks.sort(key=lambda check: check[1].severity != 'ERROR')
+    return CompiledRules(checks)
@@ -0,0 +1,206 @@
+"""
+Este módulo, `scheduler`, executa as etapas do pipeline (ingestores e etapas
+pós-carga) como um grafo de dependências (DAG).
+
+Cada etapa declara de quais outras depende. As etapas são agrupadas em níveis
+(nível 0: sem dependências; nível N: depende de alguma etapa do nível N-1), e
+uma etapa é iniciada assim que todas as suas dependências terminam com
+sucesso, com no máximo `max_workers` etapas simultâneas. Assim, o tempo total
+se aproxima da cadeia de dependências mais longa (o caminho crítico), e não da
+soma de todas as etapas.
+
+Se uma etapa falha, as etapas que dependem dela (direta ou indiretamente) não
+são executadas; as demais seguem normalmente.
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+@dataclass
+class Step:
+    """
+    Uma etapa do pipeline.
+
+    Attributes:
+        name (str): Nome único da etapa (ex: 'ingest_faturamento').
+        action (Callable): Função sem argumentos que executa a etapa.
+        depends_on (tuple): Nomes das etapas que precisam terminar antes.
+    """
+    name: str
+    action: Callable[[], Any]
+    depends_on: Tuple[str, ...] = ()
+
+
+@dataclass
+class StepResult:
+    """
+    O resultado da execução de uma etapa.
+
+    Attributes:
+        name (str): Nome da etapa.
+        status (str): 'sucesso', 'erro' ou 'ignorado' (dependência falhou).
+        start (float): Instante de início (relativo ao início do DAG).
+        end (float): Instante de término (relativo ao início do DAG).
+        value (Any): O retorno de `action`, em caso de sucesso.
+        error (str, optional): A mensagem de erro, em caso de falha.
+    """
+    name: str
+    status: str
+    start: float = 0.0
+    end: float = 0.0
+    value: Any = field(default=None, repr=False)
+    error: Optional[str] = None
+
+    @property
+    def duration(self) -> float:
+        """Duração da etapa, em segundos."""
+        return self.end - self.start
+
+
+class Dag:
+    """
+    Grafo de dependências entre as etapas do pipeline.
+    """
+
+    def __init__(self, steps: List[Step]):
+        """
+        Monta e valida o grafo.
+
+        Raises:
+            ValueError: Se houver nomes repetidos, dependências desconhecidas
+                        ou ciclos.
+        """
+        self.steps: Dict[str, Step] = {}
+        for step in steps:
+            if step.name in self.steps:
+                raise ValueError(f"Etapa duplicada no DAG: {step.name}")
+            self.steps[step.name] = step
+
+        for step in steps:
+            unknown = [dep for dep in step.depends_on if dep not in self.steps]
+            if unknown:
+                raise ValueError(f"Etapa '{step.name}' depende de etapas inexistentes: {', '.join(unknown)}")
+
+        self._levels = self._compute_levels()
+
+    def _compute_levels(self) -> List[List[str]]:
+        """Agrupa as etapas em níveis topológicos (algoritmo de Kahn)."""
+        pending = {name: set(step.depends_on) for name, step in self.steps.items()}
+        levels = []
+        done = set()
+        while pending:
+            level = [name for name, deps in pending.items() if deps <= done]
+            if not level:
+                raise ValueError(f"Ciclo de dependências no DAG entre: {', '.join(sorted(pending))}")
+            levels.append(level)
+            done.update(level)
+            for name in level:
+                del pending[name]
+        return levels
+
+    @property
+    def levels(self) -> List[List[str]]:
+        """As etapas de cada nível, na ordem de declaração."""
+        return [list(level) for level in self._levels]
+
+    def print_plan(self, max_workers: int) -> None:
+        """Imprime os níveis do DAG e a concorrência de cada um."""
+        print(f"🗺️  Plano de execução ({len(self.steps)} etapas, até {max_workers} em paralelo):")
+        for index, level in enumerate(self._levels):
+            concurrency = min(len(level), max_workers)
+            print(f"   Nível {index} (concorrência {concurrency}): {', '.join(level)}")
+
+    def run(self, max_workers: int = 1) -> Dict[str, StepResult]:
+        """
+        Executa as etapas respeitando as dependências.
+
+        Args:
+            max_workers (int): Número máximo de etapas executadas ao mesmo tempo.
+
+        Returns:
+            Dict[str, StepResult]: O resultado de cada etapa, pelo nome.
+        """
+        max_workers = max(1, max_workers)
+        results: Dict[str, StepResult] = {}
+        origin = time.time()
+
+        def execute(step: Step) -> StepResult:
+            start = time.time() - origin
+            try:
+                value = step.action()
+            except Exception as e:
+                print(f"   ❌ Etapa '{step.name}' falhou: {e}")
+                return StepResult(step.name, 'erro', start, time.time() - origin, error=str(e))
+            return StepResult(step.name, 'sucesso', start, time.time() - origin, value)
+
+        order = [name for level in self._levels for name in level]
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='dag') as executor:
+            running = {}
+            while len(results) < len(self.steps):
+                for name in order:
+                    if name in results or name in running.values():
+                        continue
+                    deps = self.steps[name].depends_on
+                    if any(results.get(dep) and results[dep].status != 'sucesso' for dep in deps):
+                        now = time.time() - origin
+                        results[name] = StepResult(name, 'ignorado', now, now,
+                                                   error="dependência não concluída com sucesso")
+                        print(f"   ⏭️  Etapa '{name}' ignorada: dependência não concluída com sucesso")
+                    elif all(dep in results for dep in deps) and len(running) < max_workers:
+                        running[executor.submit(execute, self.steps[name])] = name
+
+                if not running:
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    result = future.result()
+                    results[result.name] = result
+                    del running[future]
+
+        return {name: results[name] for name in order}
+
+    def critical_path(self, results: Dict[str, StepResult]) -> Tuple[List[str], float]:
+        """
+        Calcula o caminho crítico: a cadeia de dependências com a maior soma
+        de durações.
+
+        Args:
+            results (dict): Os resultados retornados por `run`.
+
+        Returns:
+            Tuple[List[str], float]: As etapas do caminho, em ordem, e a
+                                     soma das suas durações.
+        """
+        best: Dict[str, Tuple[float, Optional[str]]] = {}
+        for level in self._levels:
+            for name in level:
+                previous = max(self.steps[name].depends_on, key=lambda dep: best[dep][0], default=None)
+                total = results[name].duration + (best[previous][0] if previous else 0.0)
+                best[name] = (total, previous)
+
+        if not best:
+            return [], 0.0
+        name = max(best, key=lambda step: best[step][0])
+        length = best[name][0]
+        path = []
+        while name is not None:
+            path.append(name)
+            name = best[name][1]
+        return path[::-1], length
+
+    def print_report(self, results: Dict[str, StepResult]) -> None:
+        """Imprime a duração de cada etapa e o caminho crítico."""
+        icons = {'sucesso': '✓', 'erro': '❌', 'ignorado': '⏭️ '}
+        print("⏱️  Etapas do pipeline:")
+        for name, result in results.items():
+            print(f"   {icons[result.status]} {name}: {result.duration:.2f}s "
+                  f"(início em {result.start:.2f}s)")
+
+        path, length = self.critical_path(results)
+        wall = max((result.end for result in results.values()), default=0.0)
+        total = sum(result.duration for result in results.values())
+        print(f"   🧭 Caminho crítico ({length:.2f}s): {' → '.join(path)}")
+        print(f"   Tempo total {wall:.2f}s | soma das etapas {total:.2f}s")
@@ -0,0 +1,164 @@
+"""
+Este módulo, `stage_metrics`, mede o tempo e a vazão de cada etapa da carga
+de um arquivo (hash, leitura, validação do cabeçalho, campos obrigatórios,
+limpeza numérica e de datas, serialização, `COPY`, logs de rejeição e
+movimentação do arquivo).
+
+As medições de um arquivo são acumuladas em um `StageMetrics` (as etapas de
+CPU e de banco rodam em threads diferentes do pipeline) e gravadas em
+`auditoria.metrica_etapa`, ligadas ao id da execução, para acompanhar a
+evolução de cada ingestor e encontrar regressões. Cada medição também vai
+para o histograma `credits_etl_stage_duration_seconds` (ver `python.utils.metrics`).
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from python.utils.audit import criar_tabela_metricas, registrar_metricas
+from python.utils.metrics import STAGE_DURATION
+
+# Etapas medidas, na ordem em que acontecem na carga
+STAGES = (
+    'hash',
+    'validacao_cabecalho',
+    'leitura',
+    'obrigatorios',
+    'limpeza_numerica',
+    'limpeza_datas',
+    'serializacao',
+    'copy',
+    'log_rejeicao',
+    'movimentacao',
+)
+
+
+@dataclass
+class StageStats:
+    """
+    As medições acumuladas de uma etapa.
+
+    Attributes:
+        seconds (float): Tempo total gasto na etapa.
+        rows (int): Linhas processadas pela etapa.
+        bytes (int): Bytes processados pela etapa (0 se não se aplica).
+        calls (int): Quantas vezes a etapa foi executada (ex: uma por lote).
+    """
+    seconds: float = 0.0
+    rows: int = 0
+    bytes: int = 0
+    calls: int = 0
+
+    @property
+    def rows_per_second(self) -> Optional[float]:
+        """Vazão em linhas por segundo (None sem linhas ou sem tempo medido)."""
+        return self.rows / self.seconds if self.rows and self.seconds > 0 else None
+
+    @property
+    def bytes_per_second(self) -> Optional[float]:
+        """Vazão em bytes por segundo (None sem bytes ou sem tempo medido)."""
+        return self.bytes / self.seconds if self.bytes and self.seconds > 0 else None
+
+
+class StageMetrics:
+    """
+    Acumula o tempo, as linhas e os bytes de cada etapa da carga de um arquivo.
+
+    É seguro usar a mesma instância em várias threads (ex: a preparação dos
+    lotes e o `COPY`, que rodam em paralelo no pipeline).
+    """
+
+    def __init__(self, ingestor: Optional[str] = None):
+        """
+        Args:
+            ingestor (str, optional): Nome do ingestor, rótulo das medições no
+                                      histograma de latência das etapas.
+        """
+        self.ingestor = ingestor
+        self.execution_id: Optional[str] = None
+        self._stages: Dict[str, StageStats] = {}
+        self._lock = threading.Lock()
+        self._table_ready = False
+
+    def add(self, stage: str, seconds: float, rows: int = 0, nbytes: int = 0) -> None:
+        """Soma uma medição à etapa."""
+        with self._lock:
+            stats = self._stages.setdefault(stage, StageStats())
+            stats.seconds += seconds
+            stats.rows += int(rows)
+            stats.bytes += int(nbytes)
+            stats.calls += 1
+        if self.ingestor is not None:
+            STAGE_DURATION.observe(seconds, self.ingestor, stage)
+
+    @contextmanager
+    def stage(self, stage: str, rows: int = 0, nbytes: int = 0) -> Iterator[None]:
+        """Mede o bloco como uma execução da etapa (também se o bloco falhar)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start, rows, nbytes)
+
+    def timed_iter(self, stage: str, items: Iterable, rows: Callable = len,
+                   nbytes: int = 0) -> Iterator:
+        """
+        Mede o tempo gasto para produzir cada item de um iterador (ex: a
+        leitura dos lotes), contando `rows(item)` linhas por item e `nbytes`
+        bytes quando o iterador termina.
+        """
+        iterator = iter(items)
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    self.add(stage, time.perf_counter() - start, nbytes=nbytes)
+                    return
+                self.add(stage, time.perf_counter() - start, rows(item))
+                yield item
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                close()
+
+    def stats(self) -> Dict[str, StageStats]:
+        """Cópia das medições, na ordem de `STAGES` (etapas desconhecidas ao final)."""
+        with self._lock:
+            order = {name: index for index, name in enumerate(STAGES)}
+            return {name: StageStats(s.seconds, s.rows, s.bytes, s.calls)
+                    for name, s in sorted(self._stages.items(),
+                                          key=lambda item: order.get(item[0], len(STAGES)))}
+
+    def summary(self, limit: int = 4) -> str:
+        """Resumo das etapas mais demoradas (ex: 'copy 1.2s (80k linhas/s) | ...')."""
+        stages = sorted(self.stats().items(), key=lambda item: item[1].seconds, reverse=True)
+        parts = []
+        for name, stats in stages[:limit]:
+            part = f"{name} {stats.seconds:.2f}s"
+            if stats.rows_per_second:
+                part += f" ({stats.rows_per_second:,.0f} linhas/s)"
+            parts.append(part)
+        return ' | '.join(parts)
+
+    def save(self, conn) -> None:
+        """
+        Grava as medições em `auditoria.metrica_etapa` (uma linha por etapa,
+        atualizada se já existir) e confirma a transação.
+
+        Não faz nada se a execução ainda não tiver id (ex: arquivo duplicado).
+        """
+        if self.execution_id is None:
+            return
+        if not self._table_ready:
+            criar_tabela_metricas(conn)
+            self._table_ready = True
+        rows: List[tuple] = [
+            (name, stats.seconds, stats.rows, stats.bytes, stats.calls,
+             stats.rows_per_second, stats.bytes_per_second)
+            for name, stats in self.stats().items()
+        ]
+        registrar_metricas(conn, self.execution_id, rows)
@@ -0,0 +1,177 @@
+"""
+Este módulo, `template_registry`, mantém um registro compilado dos templates
+de validação de cabeçalho.
+
+Cada template é lido uma única vez (com a sonda de cabeçalho de `readers`, sem
+o engine `odf` do pandas) e o cabeçalho esperado é guardado como uma tupla,
+indexada pelo caminho e pelo `mtime` do arquivo. A validação de um arquivo de
+entrada passa a ser apenas uma comparação de tuplas em memória.
+
+Opcionalmente, o registro pode ser persistido em um arquivo JSON, para que
+execuções seguintes nem precisem abrir os templates que não mudaram.
+"""
+
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from python.core.readers import read_header
+
+
+class TemplateRegistry:
+    """
+    Registro em memória (e opcionalmente em disco) dos cabeçalhos esperados
+    para cada template de ingestão.
+    """
+
+    # Um registro compartilhado por diretório de templates, reaproveitado por
+    # todos os ingestores do processo.
+    _instances: Dict[Path, 'TemplateRegistry'] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, template_dir: Path, cache_file: Optional[Path] = None):
+        """
+        Inicializa o registro.
+
+        Args:
+            template_dir (Path): O diretório onde os templates estão localizados.
+            cache_file (Path, optional): Arquivo JSON para persistir os cabeçalhos
+                                         compilados entre execuções.
+        """
+        self.template_dir = Path(template_dir)
+        self.cache_file = Path(cache_file) if cache_file else None
+        self._lock = threading.Lock()
+        # nome do ingestor -> caminho do template
+        self._paths: Dict[str, Path] = {}
+        # caminho do template -> (mtime_ns, cabeçalho esperado)
+        self._headers: Dict[str, Tuple[int, Tuple[str, ...]]] = {}
+        self._disk_cache_dirty = False
+
+        self._load_disk_cache()
+        self.refresh()
+
+    @classmethod
+    def for_dir(cls, template_dir: Path, cache_file: Optional[Path] = None) -> 'TemplateRegistry':
+        """
+        Retorna o registro compartilhado para um diretório de templates,
+        criando-o na primeira chamada.
+        """
+        key = Path(template_dir).resolve()
+        with cls._instances_lock:
+            registry = cls._instances.get(key)
+            if registry is None:
+                registry = cls(template_dir, cache_file)
+                cls._instances[key] = registry
+            return registry
+
+    def refresh(self) -> None:
+        """
+        Varre o diretório de templates e compila os cabeçalhos de todos os
+        arquivos `template_<ingestor>.*` novos ou alterados.
+        """
+        with self._lock:
+            paths = {}
+            if self.template_dir.exists():
+                for path in sorted(self.template_dir.glob("template_*.*")):
+                    name = path.stem[len("template_"):]
+                    # Mantém o primeiro template encontrado, como no glob original
+                    paths.setdefault(name, path)
+            self._paths = paths
+
+            for path in paths.values():
+                self._compile(path)
+            self._save_disk_cache()
+
+    def get(self, ingestor_name: str) -> Optional[Tuple[Path, Tuple[str, ...]]]:
+        """
+        Retorna o template e o cabeçalho esperado para um ingestor.
+
+        O `mtime` do template é conferido a cada consulta (um `stat`, sem
+        leitura), e o cabeçalho só é recompilado se o arquivo mudou.
+
+        Args:
+            ingestor_name (str): O nome do ingestor.
+
+        Returns:
+            tuple: `(caminho_do_template, cabecalho_esperado)`, ou `None` se não
+                   houver template para o ingestor.
+        """
+        path = self._paths.get(ingestor_name)
+        if path is None or not path.exists():
+            # Template novo ou removido desde a última varredura
+            self.refresh()
+            path = self._paths.get(ingestor_name)
+            if path is None:
+                return None
+
+        with self._lock:
+            header = self._compile(path)
+            self._save_disk_cache()
+        return path, header
+
+    def find(self, columns) -> Optional[str]:
+        """
+        Procura o ingestor cujo template tem exatamente o cabeçalho informado.
+
+        Args:
+            columns (list): As colunas do cabeçalho de um arquivo ou planilha.
+
+        Returns:
+            str: O nome do ingestor, ou `None` se nenhum template corresponder.
+        """
+        columns = tuple(columns)
+        for name in list(self._paths):
+            template = self.get(name)
+            if template is not None and template[1] == columns:
+                return name
+        return None
+
+    def _compile(self, path: Path) -> Tuple[str, ...]:
+        """Lê o cabeçalho do template se ele não estiver em cache para o `mtime` atual."""
+        mtime_ns = path.stat().st_mtime_ns
+        cached = self._headers.get(str(path))
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+
+        with open(path, 'rb') as stream:
+            info = read_header(stream, path.suffix)
+        if info is None:
+            # Formatos sem sonda (ex: .xls) ainda dependem do pandas
+            import pandas as pd
+            info_columns = list(pd.read_excel(path, nrows=0).columns)
+        else:
+            info_columns = info.columns
+
+        header = tuple(info_columns)
+        self._headers[str(path)] = (mtime_ns, header)
+        self._disk_cache_dirty = True
+        return header
+
+    def _load_disk_cache(self) -> None:
+        """Carrega os cabeçalhos persistidos em disco, se houver."""
+        if not self.cache_file or not self.cache_file.exists():
+            return
+        try:
+            data = json.loads(self.cache_file.read_text(encoding='utf-8'))
+            for path, entry in data.items():
+                self._headers[path] = (int(entry['mtime_ns']), tuple(entry['columns']))
+        except (ValueError, KeyError, TypeError, OSError) as e:
+            print(f"   ⚠️  Cache de templates ignorado ({self.cache_file}): {e}")
+
+    def _save_disk_cache(self) -> None:
+        """Persiste os cabeçalhos compilados em disco, se configurado e houver mudanças."""
+        if not self.cache_file or not self._disk_cache_dirty:
+            return
+        data = {
+            path: {'mtime_ns': mtime_ns, 'columns': list(columns)}
+            for path, (mtime_ns, columns) in self._headers.items()
+        }
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_suffix(self.cache_file.suffix + '.tmp')
+            tmp_file.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding='utf-8')
+            tmp_file.replace(self.cache_file)
+            self._disk_cache_dirty = False
+        except OSError as e:
+            print(f"   ⚠️  Não foi possível salvar o cache de templates ({self.cache_file}): {e}")
@@ -9,6 +9,7 @@ Assim como o ingestor de usuários, o mapeamento de colunas é direto, pois
 os nomes no arquivo de origem já estão alinhados com o esquema do banco de dados.
 """
 from python.core.base_ingestor import BaseIngestor
+from python.core.rules import CnpjCpf
 
 class IngestBaseOficial(BaseIngestor):
     """
@@ -24,6 +25,8 @@ class IngestBaseOficial(BaseIngestor):
           
           Campos obrigatórios refletem a estrutura mínima necessária para identificar
           e categorizar um cliente na hierarquia comercial (empresa > grupo > lider > responsável).
+        - `rules`: O CNPJ deve ter os dígitos verificadores corretos (aviso; CNPJs
+          sem os zeros à esquerda são aceitos).
         """
         super().__init__(
             name="base_oficial",
@@ -43,7 +46,10 @@ class IngestBaseOficial(BaseIngestor):
                 'corte',             # Corte/segmentação
                 'segmento',          # Segmento de mercado
                 'obs'                # Observações importantes
-            ]
+            ],
+            rules={
+                'cnpj': [CnpjCpf()],
+            }
         )
 
     def get_column_mapping(self):
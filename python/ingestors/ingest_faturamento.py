@@ -11,6 +11,7 @@ traduzir os nomes das colunas do arquivo CSV para os nomes correspondentes
 na tabela `bronze.faturamento`.
 """
 from python.core.base_ingestor import BaseIngestor
+from python.core.rules import CnpjCpf, NonNegative
 
 class IngestFaturamento(BaseIngestor):
     """
@@ -27,6 +28,8 @@ class IngestFaturamento(BaseIngestor):
           Nota: Na camada Bronze, validações devem ser mínimas. Campos são marcados como
           obrigatórios apenas quando sua ausência tornaria o registro completamente inútil.
           Validações de negócio mais rigorosas devem ser feitas na camada Silver.
+        - `rules`: CNPJ do cliente e valores que não podem ser negativos. São
+          avisos (WARN): a linha é carregada e a falha vai para o log.
         """
         super().__init__(
             name="faturamento",
@@ -39,7 +42,13 @@ class IngestFaturamento(BaseIngestor):
                 'data_fat',          # Data de faturamento (essencial para análises temporais)
                 'valor_da_conta',    # Valor principal do documento
                 'empresa'            # Empresa emissora (multi-tenant)
-            ]
+            ],
+            rules={
+                'cnpj': [CnpjCpf()],
+                'impostos_retidos': [NonNegative()],
+                'descontos': [NonNegative()],
+                'juros_multa': [NonNegative()],
+            }
         )
 
     def get_column_mapping(self):
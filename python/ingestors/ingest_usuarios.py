@@ -9,6 +9,7 @@ O mapeamento de colunas neste ingestor é direto, pois os nomes das colunas
 no arquivo de origem já correspondem aos da tabela de destino.
 """
 from python.core.base_ingestor import BaseIngestor
+from python.core.rules import Domain, MaxLength
 
 class IngestUsuarios(BaseIngestor):
     """
@@ -21,6 +22,9 @@ class IngestUsuarios(BaseIngestor):
         - `name`: Identificador para logs e busca de templates.
         - `target_table`: Tabela de destino no schema bronze.
         - `mandatory_cols`: Colunas essenciais para a validade de um registro.
+        - `rules`: Domínio do status do vendedor (os valores usados em
+          QUERIES.md) e o tamanho máximo de um e-mail nas colunas de acesso
+          (avisos: a linha é carregada).
         """
         super().__init__(
             name="usuarios",
@@ -28,7 +32,15 @@ class IngestUsuarios(BaseIngestor):
             mandatory_cols=[
                 'cargo', 'status_vendedor', 'consultor', 'nivel', 'time',
                 'acesso_vendedor', 'acesso_gerente', 'acesso_diretoria'
-            ]
+            ],
+            rules={
+                'status_vendedor': [Domain(['Ativo', 'Inativo'])],
+                'acesso_vendedor': [MaxLength(254)],
+                'acesso_gerente': [MaxLength(254)],
+                'acesso_indireto': [MaxLength(254)],
+                'acesso_diretoria': [MaxLength(254)],
+                'acesso_temporario': [MaxLength(254)],
+            }
         )
 
     def get_column_mapping(self):
@@ -0,0 +1,280 @@
+"""
+Este script mede o desempenho da carga (`BaseIngestor.process_file`) com
+arquivos sintéticos no formato dos templates, gera um relatório JSON e falha
+(código de saída 1) se alguma etapa regredir em relação a um relatório anterior.
+
+Para cada ingestor e tamanho (`10k`, `1m`, `10m` linhas):
+- Um arquivo é gerado por `synthetic_data.py` (e reaproveitado em `--data-dir`
+  enquanto os parâmetros forem os mesmos).
+- O arquivo é carregado `--repeat` vezes no banco configurado (`DB_*`), e vale
+  a execução mais rápida. Depois de cada carga, as linhas do arquivo na bronze
+  e os registros da execução na auditoria são removidos, para que a próxima
+  não seja ignorada como duplicata.
+- São registrados o tempo total e o tempo, as linhas e a vazão de cada etapa
+  (as mesmas de `auditoria.metrica_etapa`).
+
+O banco deve ser local (ex: um container PostgreSQL na própria máquina): um
+`DB_HOST` remoto só é aceito com `--allow-remote-db`.
+
+Há regressão quando uma etapa (ou o total) fica mais de `--threshold` mais
+lenta que no relatório de `--baseline` e a diferença passa de `--min-delta`
+segundos (etapas muito curtas oscilam demais para uma comparação relativa).
+
+Uso:
+    python python/scripts/benchmark_ingestion.py --sizes 10k,1m --report bench.json
+    python python/scripts/benchmark_ingestion.py --sizes 10k,1m --baseline bench.json --threshold 0.2
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Adiciona o diretório raiz do projeto ao path do sistema para permitir
+# importações de outros módulos do projeto.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from python.scripts.synthetic_data import SIZES, parse_rows
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# Hosts aceitos sem `--allow-remote-db` (além de diretórios de socket Unix)
+LOCAL_HOSTS = ('localhost', '127.0.0.1', '::1')
+
+# Tabelas de auditoria ligadas a uma execução, na ordem de remoção (por causa das FKs)
+AUDIT_TABLES = ('auditoria.log_rejeicao', 'auditoria.resumo_rejeicao', 'auditoria.metrica_etapa',
+                'auditoria.checkpoint_ingestao')
+
+
+def is_local_host(host: str) -> bool:
+    """True para `localhost`/loopback ou um diretório de socket Unix."""
+    return not host or host in LOCAL_HOSTS or host.startswith('/')
+
+
+def git_commit() -> str:
+    """O commit atual do repositório (None fora de um repositório git)."""
+    result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                            capture_output=True, text=True)
+    return result.stdout.strip() or None
+
+
+def prepare_file(ingestor, rows: int, label: str, args) -> Path:
+    """Gera o arquivo sintético do ingestor, ou reaproveita o já gerado com os mesmos parâmetros."""
+    from python.scripts.synthetic_data import generate
+
+    path = args.data_dir / (f"{ingestor.name}_benchmark_{label}_s{args.seed}"
+                            f"_b{args.blank_rate:g}_i{args.invalid_rate:g}.csv")
+    if path.exists():
+        print(f"   📄 Reaproveitando {path.name} ({path.stat().st_size / 1024 ** 2:.1f} MB)")
+        return path
+
+    start = time.perf_counter()
+    tmp = path.with_suffix('.csv.tmp')
+    generate(ingestor, rows, tmp, args.blank_rate, args.invalid_rate, args.seed)
+    tmp.replace(path)
+    print(f"   📄 {path.name} gerado em {time.perf_counter() - start:.1f}s "
+          f"({path.stat().st_size / 1024 ** 2:.1f} MB)")
+    return path
+
+
+def delete_execution(cur, execution_id: str) -> None:
+    """Remove uma execução e os seus registros (logs, métricas, checkpoint) da auditoria."""
+    for table in AUDIT_TABLES:
+        cur.execute("SELECT to_regclass(%s)", (table,))
+        if cur.fetchone()[0] is not None:
+            cur.execute(f"DELETE FROM {table} WHERE execucao_fk = %s", (execution_id,))
+    cur.execute("DELETE FROM auditoria.historico_execucao WHERE id = %s", (execution_id,))
+
+
+def cleanup(conn, ingestor, source_name: str, execution_id: str) -> None:
+    """Remove da bronze e da auditoria o que a carga de benchmark gravou."""
+    from python.utils.db_connection import get_cursor
+
+    conn.rollback()
+    with get_cursor(conn) as cur:
+        cur.execute(f"DELETE FROM {ingestor.target_table} WHERE source_filename = %s", (source_name,))
+        if execution_id is not None:
+            delete_execution(cur, execution_id)
+    conn.commit()
+
+
+def run_once(conn, ingestor, path: Path) -> dict:
+    """
+    Carrega o arquivo uma vez e desfaz a carga.
+
+    Returns:
+        dict: `{'total_seconds': ..., 'stages': {etapa: {...}}}`.
+    """
+    from python.core.inputs import InputSource
+    from python.core.stage_metrics import StageMetrics
+
+    source = InputSource(path)
+    metrics = StageMetrics(ingestor.name)
+    start = time.perf_counter()
+    try:
+        is_duplicate = ingestor.process_file(conn, source, metrics=metrics)
+        total = time.perf_counter() - start
+    finally:
+        cleanup(conn, ingestor, source.name, metrics.execution_id)
+    if is_duplicate:
+        raise RuntimeError(f"{path.name} já carregado fora do benchmark (mesmo hash): remova-o da auditoria")
+
+    return {
+        'total_seconds': total,
+        'stages': {
+            name: {
+                'seconds': stats.seconds,
+                'rows': stats.rows,
+                'bytes': stats.bytes,
+                'calls': stats.calls,
+                'rows_per_second': stats.rows_per_second,
+                'bytes_per_second': stats.bytes_per_second,
+            }
+            for name, stats in metrics.stats().items()
+        },
+    }
+
+
+def compare(results: list, baseline: dict, threshold: float, min_delta: float) -> list:
+    """
+    Compara os resultados com os do relatório de referência.
+
+    Returns:
+        list: Tuplas `(ingestor, tamanho, etapa, antes, depois)` das regressões.
+    """
+    previous = {(r['ingestor'], r['rows']): r for r in baseline.get('results', [])}
+    regressions = []
+    for result in results:
+        before = previous.get((result['ingestor'], result['rows']))
+        if before is None:
+            continue
+        pairs = [('total', before['total_seconds'], result['total_seconds'])]
+        pairs += [(stage, before['stages'][stage]['seconds'], stats['seconds'])
+                  for stage, stats in result['stages'].items() if stage in before['stages']]
+        for stage, old, new in pairs:
+            if new - old > min_delta and new > old * (1 + threshold):
+                regressions.append((result['ingestor'], result['label'], stage, old, new))
+    return regressions
+
+
+def print_result(result: dict) -> None:
+    """Imprime o tempo de cada etapa de um resultado."""
+    print(f"   ⏱️  Total: {result['total_seconds']:.2f}s "
+          f"({result['rows_per_second']:,.0f} linhas/s)")
+    for stage, stats in result['stages'].items():
+        # Etapas de poucos microssegundos (ex: limpeza sem colunas) teriam uma vazão sem sentido
+        throughput = (f"{stats['rows_per_second']:,.0f} linhas/s"
+                      if stats['rows_per_second'] and stats['seconds'] >= 0.001 else '')
+        print(f"      {stage:<20} {stats['seconds']:8.3f}s  {throughput}")
+
+
+def main() -> int:
+    from python.scripts.run_pipeline import INGESTOR_MAPPING
+
+    parser = argparse.ArgumentParser(description="Benchmark da carga com arquivos sintéticos.")
+    parser.add_argument('--sizes', default='10k',
+                        help=f"tamanhos separados por vírgula ({', '.join(SIZES)} ou números)")
+    parser.add_argument('--ingestors', default=','.join(sorted(INGESTOR_MAPPING)),
+                        help="ingestores separados por vírgula")
+    parser.add_argument('--blank-rate', type=float, default=0.02,
+                        help="fração de vazios em cada coluna obrigatória")
+    parser.add_argument('--invalid-rate', type=float, default=0.005,
+                        help="fração de valores inválidos em cada coluna numérica ou de data")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=3, help="cargas por arquivo (vale a mais rápida)")
+    parser.add_argument('--data-dir', type=Path, default=Path(tempfile.gettempdir()) / 'credits-etl-benchmark',
+                        help="diretório dos arquivos gerados (reaproveitados entre execuções)")
+    parser.add_argument('--report', type=Path, help="arquivo JSON do relatório")
+    parser.add_argument('--baseline', type=Path, help="relatório de referência para detectar regressões")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="aumento relativo máximo do tempo de uma etapa (0.2 = 20%%)")
+    parser.add_argument('--min-delta', type=float, default=0.05,
+                        help="aumento mínimo, em segundos, para contar como regressão")
+    parser.add_argument('--allow-remote-db', action='store_true',
+                        help="aceita um DB_HOST que não seja local")
+    args = parser.parse_args()
+
+    from python.utils.config import get_db_config
+    from python.utils.db_connection import get_connection
+
+    db_config = get_db_config()
+    if not is_local_host(db_config.host) and not args.allow_remote_db:
+        print(f"❌ DB_HOST={db_config.host} não é local: o benchmark grava e apaga dados na bronze. "
+              f"Use um PostgreSQL local ou --allow-remote-db.")
+        return 2
+
+    baseline = json.loads(args.baseline.read_text(encoding='utf-8')) if args.baseline else None
+    labels = [label.strip() for label in args.sizes.split(',') if label.strip()]
+    names = [name.strip() for name in args.ingestors.split(',') if name.strip()]
+    unknown = [name for name in names if name not in INGESTOR_MAPPING]
+    if unknown:
+        print(f"❌ Ingestores desconhecidos: {', '.join(unknown)}")
+        return 2
+
+    print("=" * 60)
+    print("⏱️  BENCHMARK DE INGESTÃO")
+    print("=" * 60)
+
+    results = []
+    with get_connection() as conn:
+        for name in names:
+            ingestor = INGESTOR_MAPPING[name]()
+            ingestor.warm_up(conn)
+            for label in labels:
+                rows = parse_rows(label)
+                print(f"\n▶️  {name} — {rows:,} linhas")
+                path = prepare_file(ingestor, rows, label, args)
+                runs = [run_once(conn, ingestor, path) for _ in range(args.repeat)]
+                best = min(runs, key=lambda run: run['total_seconds'])
+                result = {
+                    'ingestor': name,
+                    'label': label,
+                    'rows': rows,
+                    'file_bytes': path.stat().st_size,
+                    'total_seconds': best['total_seconds'],
+                    'all_totals': [run['total_seconds'] for run in runs],
+                    'rows_per_second': rows / best['total_seconds'] if best['total_seconds'] > 0 else None,
+                    'stages': best['stages'],
+                }
+                print_result(result)
+                results.append(result)
+
+    report = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': sys.version.split()[0],
+        'config': {
+            'sizes': labels,
+            'ingestors': names,
+            'blank_rate': args.blank_rate,
+            'invalid_rate': args.invalid_rate,
+            'seed': args.seed,
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }
+    if args.report:
+        args.report.parent.mkdir(parents=True, exist_ok=True)
+        args.report.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"\n📝 Relatório gravado em {args.report}")
+
+    print("=" * 60)
+    if baseline is None:
+        print("✅ Benchmark concluído (sem relatório de referência para comparar)")
+        return 0
+    regressions = compare(results, baseline, args.threshold, args.min_delta)
+    if regressions:
+        print(f"❌ Regressões acima de {args.threshold:.0%} em relação a {args.baseline}:")
+        for name, label, stage, old, new in regressions:
+            print(f"   - {name} {label} / {stage}: {old:.3f}s → {new:.3f}s (+{(new - old) / old:.0%})"
+                  if old > 0 else f"   - {name} {label} / {stage}: {old:.3f}s → {new:.3f}s")
+        return 1
+    print(f"✅ Nenhuma etapa regrediu mais de {args.threshold:.0%} em relação a {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,379 @@
+"""
+Este script mede as consultas de `QUERIES.md` com e sem os índices de
+`INDEXES.md`, para que a criação (ou remoção) de um índice seja decidida com
+números, e gera um relatório comparativo (JSON e Markdown).
+
+Para cada escala (linhas de faturamento; a base oficial recebe um décimo
+disso e os usuários, `USUARIOS_ROWS` linhas):
+- Um schema temporário (`--schema`) é criado com cópias vazias das tabelas da
+  bronze (sem índices), e os arquivos de `synthetic_data.py` são carregados
+  nele pelos próprios ingestores. As tabelas reais da bronze não são tocadas;
+  os registros das cargas são removidos da auditoria.
+- Cada consulta roda com `EXPLAIN (ANALYZE, BUFFERS)`: uma vez para aquecer o
+  cache e depois `--repeat` vezes, valendo a mediana do tempo de execução.
+- Os índices da bronze de `INDEXES.md` são criados no schema temporário (sem
+  `CONCURRENTLY`: não há escritas concorrentes), as tabelas são analisadas e
+  as consultas rodam de novo.
+- O relatório traz, por consulta, os tempos, os buffers lidos, os nós do
+  plano e os índices usados; e, por índice, o tamanho, o tempo de criação e
+  as consultas que o usaram. Ao final, o schema temporário é removido.
+
+Os índices de `INDEXES.md` sobre a auditoria não são medidos: nenhuma consulta
+de `QUERIES.md` usa essas tabelas.
+
+Uso:
+    python python/scripts/benchmark_queries.py --scales 10k,100k,1m --report consultas.json --markdown consultas.md
+"""
+import argparse
+import json
+import re
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Adiciona o diretório raiz do projeto ao path do sistema para permitir
+# importações de outros módulos do projeto.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from python.scripts.benchmark_ingestion import delete_execution, git_commit, is_local_host
+from python.scripts.synthetic_data import parse_rows
+
+ROOT = Path(__file__).resolve().parents[2]
+QUERIES_FILE = ROOT / 'QUERIES.md'
+INDEXES_FILE = ROOT / 'INDEXES.md'
+
+# Linhas de usuários em todas as escalas (a equipe não cresce com o faturamento)
+USUARIOS_ROWS = 300
+
+# Proporção de linhas da base oficial em relação ao faturamento
+BASE_OFICIAL_RATIO = 10
+
+_QUERY_HEADING = re.compile(r'^## Query (\d+): (.+)$', re.MULTILINE)
+_SQL_BLOCK = re.compile(r'```sql\n(.*?)```', re.DOTALL)
+_INDEX_STATEMENT = re.compile(r'CREATE INDEX (?:CONCURRENTLY )?(?:IF NOT EXISTS )?(\w+)\s+ON\s+bronze\.(\w+)',
+                              re.IGNORECASE)
+
+
+def parse_queries(text: str) -> list:
+    """
+    As consultas de `QUERIES.md`.
+
+    Returns:
+        list: Tuplas `(número, título, sql)`, na ordem do documento.
+    """
+    headings = list(_QUERY_HEADING.finditer(text))
+    queries = []
+    for heading, following in zip(headings, headings[1:] + [None]):
+        section = text[heading.end():following.start() if following else len(text)]
+        block = _SQL_BLOCK.search(section)
+        if block:
+            queries.append((int(heading.group(1)), heading.group(2).strip(), block.group(1).strip().rstrip(';')))
+    return queries
+
+
+def parse_indexes(text: str) -> list:
+    """
+    Os índices da bronze em `INDEXES.md`.
+
+    Returns:
+        list: Tuplas `(nome, tabela, sql)`, com o `CREATE INDEX` sem `CONCURRENTLY`.
+    """
+    indexes = []
+    for block in _SQL_BLOCK.findall(text):
+        code = '\n'.join(line for line in block.splitlines() if not line.strip().startswith('--'))
+        for statement in code.split(';'):
+            statement = ' '.join(statement.split())
+            match = _INDEX_STATEMENT.search(statement)
+            if match:
+                indexes.append((match.group(1), match.group(2),
+                                re.sub(r'\s+CONCURRENTLY\b', '', statement, flags=re.IGNORECASE)))
+    return indexes
+
+
+def in_schema(sql: str, schema: str) -> str:
+    """Troca as referências ao schema `bronze` pelo schema temporário."""
+    return re.sub(r'\bbronze\.', f'{schema}.', sql)
+
+
+def plan_nodes(plan: dict) -> list:
+    """Todos os nós de um plano do `EXPLAIN (FORMAT JSON)`, em pré-ordem."""
+    nodes = [plan]
+    for child in plan.get('Plans', []):
+        nodes.extend(plan_nodes(child))
+    return nodes
+
+
+def explain(cur, sql: str) -> dict:
+    """Executa a consulta com `EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)`."""
+    cur.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}")
+    result = cur.fetchone()[0]
+    result = json.loads(result) if isinstance(result, str) else result
+    plan = result[0]['Plan']
+    nodes = plan_nodes(plan)
+    return {
+        'execution_ms': result[0]['Execution Time'],
+        'planning_ms': result[0]['Planning Time'],
+        'shared_hit_blocks': plan.get('Shared Hit Blocks', 0),
+        'shared_read_blocks': plan.get('Shared Read Blocks', 0),
+        'rows': plan.get('Actual Rows', 0),
+        'scans': sorted({node['Node Type'] for node in nodes if 'Scan' in node['Node Type']}),
+        'indexes': sorted({node['Index Name'] for node in nodes if 'Index Name' in node}),
+    }
+
+
+def measure(conn, queries: list, schema: str, repeat: int) -> dict:
+    """
+    Mede as consultas: uma execução de aquecimento e `repeat` medidas.
+
+    Returns:
+        dict: `{número: resultado da execução mediana}` (ou `{'error': ...}`).
+    """
+    from python.utils.db_connection import get_cursor
+
+    results = {}
+    for number, title, sql in queries:
+        sql = in_schema(sql, schema)
+        try:
+            with get_cursor(conn) as cur:
+                explain(cur, sql)
+                runs = sorted((explain(cur, sql) for _ in range(repeat)), key=lambda r: r['execution_ms'])
+            result = runs[len(runs) // 2]
+            result['all_execution_ms'] = [run['execution_ms'] for run in runs]
+            print(f"   Query {number}: {result['execution_ms']:9.2f} ms | "
+                  f"buffers {result['shared_hit_blocks'] + result['shared_read_blocks']:>7} | "
+                  f"{', '.join(result['indexes']) or ', '.join(result['scans'])}")
+        except Exception as e:
+            conn.rollback()
+            result = {'error': str(e).strip()}
+            print(f"   ❌ Query {number}: {result['error']}")
+        conn.commit()
+        results[number] = result
+    return results
+
+
+def create_schema(conn, schema: str, tables: list) -> None:
+    """(Re)cria o schema temporário com cópias vazias e sem índices das tabelas da bronze."""
+    from python.utils.db_connection import get_cursor
+
+    with get_cursor(conn) as cur:
+        cur.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+        cur.execute(f"CREATE SCHEMA {schema}")
+        for table in tables:
+            cur.execute(f"CREATE TABLE {schema}.{table} (LIKE bronze.{table} "
+                        f"INCLUDING DEFAULTS INCLUDING IDENTITY INCLUDING GENERATED)")
+    conn.commit()
+
+
+def load(conn, schema: str, rows_by_ingestor: dict, args) -> dict:
+    """
+    Gera e carrega os arquivos sintéticos no schema temporário, pelos ingestores.
+
+    Returns:
+        dict: `{ingestor: linhas na tabela}`.
+    """
+    from python.core.inputs import InputSource
+    from python.core.stage_metrics import StageMetrics
+    from python.scripts.run_pipeline import INGESTOR_MAPPING
+    from python.scripts.synthetic_data import generate
+    from python.utils.db_connection import get_cursor
+
+    # Um CNPJ por linha da base oficial: cada cliente aparece uma vez, como na base real
+    cnpjs = max(rows_by_ingestor['base_oficial'], 1)
+    loaded = {}
+    for name, rows in rows_by_ingestor.items():
+        ingestor = INGESTOR_MAPPING[name]()
+        ingestor.target_table = f"{schema}.{name}"
+        path = args.data_dir / f"{name}_consultas_{rows}_s{args.seed}_c{cnpjs}.csv"
+        if not path.exists():
+            generate(ingestor, rows, path, args.blank_rate, args.invalid_rate, args.seed, cnpjs)
+        metrics = StageMetrics(name)
+        try:
+            ingestor.process_file(conn, InputSource(path), metrics=metrics)
+        finally:
+            conn.rollback()
+            if metrics.execution_id is not None:
+                with get_cursor(conn) as cur:
+                    delete_execution(cur, metrics.execution_id)
+                conn.commit()
+        with get_cursor(conn) as cur:
+            cur.execute(f"SELECT count(*) FROM {ingestor.target_table}")
+            loaded[name] = cur.fetchone()[0]
+    return loaded
+
+
+def analyze(conn, schema: str, tables: list) -> None:
+    """Atualiza as estatísticas do planejador das tabelas do schema temporário."""
+    from python.utils.db_connection import get_cursor
+
+    with get_cursor(conn) as cur:
+        for table in tables:
+            cur.execute(f"ANALYZE {schema}.{table}")
+    conn.commit()
+
+
+def create_indexes(conn, schema: str, indexes: list) -> dict:
+    """
+    Cria os índices no schema temporário.
+
+    Returns:
+        dict: `{índice: {'table', 'seconds', 'bytes'}}`.
+    """
+    from python.utils.db_connection import get_cursor
+
+    created = {}
+    with get_cursor(conn) as cur:
+        for name, table, sql in indexes:
+            start = time.perf_counter()
+            cur.execute(in_schema(sql, schema))
+            seconds = time.perf_counter() - start
+            cur.execute("SELECT pg_relation_size(%s::regclass)", (f"{schema}.{name}",))
+            created[name] = {'table': table, 'seconds': seconds, 'bytes': cur.fetchone()[0]}
+            print(f"   🗂️  {name}: {seconds:.2f}s, {created[name]['bytes'] / 1024 ** 2:.1f} MB")
+    conn.commit()
+    return created
+
+
+def compare_scale(queries: list, without: dict, with_indexes: dict, indexes: dict) -> dict:
+    """Junta as medidas de uma escala: por consulta e por índice."""
+    comparison = {'queries': [], 'indexes': []}
+    for number, title, _ in queries:
+        before, after = without[number], with_indexes[number]
+        speedup = None
+        if 'error' not in before and 'error' not in after and after['execution_ms'] > 0:
+            speedup = before['execution_ms'] / after['execution_ms']
+        comparison['queries'].append({'query': number, 'title': title, 'sem_indices': before,
+                                      'com_indices': after, 'speedup': speedup})
+    for name, info in indexes.items():
+        used_by = [number for number, _, _ in queries if name in with_indexes[number].get('indexes', [])]
+        comparison['indexes'].append(dict(info, name=name, used_by=used_by))
+    return comparison
+
+
+def render_markdown(report: dict) -> str:
+    """O relatório comparativo em Markdown."""
+    lines = ["# Benchmark das consultas de QUERIES.md", "",
+             f"Gerado em {report['generated_at']} (commit {report['commit']}), "
+             f"mediana de {report['config']['repeat']} execuções com `EXPLAIN (ANALYZE, BUFFERS)`.", ""]
+    for scale in report['scales']:
+        rows = ', '.join(f"{name} {count:,}" for name, count in scale['rows'].items())
+        lines += [f"## {scale['label']} ({rows})", "",
+                  "| Consulta | Sem índices (ms) | Com índices (ms) | Ganho | Buffers sem → com | Índices usados |",
+                  "|---|---:|---:|---:|---:|---|"]
+        for query in scale['queries']:
+            before, after = query['sem_indices'], query['com_indices']
+            if 'error' in before or 'error' in after:
+                lines.append(f"| {query['query']}. {query['title']} | erro | erro | | | |")
+                continue
+            lines.append(
+                f"| {query['query']}. {query['title']} | {before['execution_ms']:.2f} | "
+                f"{after['execution_ms']:.2f} | {query['speedup']:.2f}x | "
+                f"{before['shared_hit_blocks'] + before['shared_read_blocks']} → "
+                f"{after['shared_hit_blocks'] + after['shared_read_blocks']} | "
+                f"{', '.join(after['indexes']) or '—'} |")
+        lines += ["", "| Índice | Tabela | Tamanho (MB) | Criação (s) | Usado por |", "|---|---|---:|---:|---|"]
+        for index in scale['indexes']:
+            used_by = ', '.join(f"Query {number}" for number in index['used_by']) or '**nenhuma consulta**'
+            lines.append(f"| {index['name']} | {index['table']} | {index['bytes'] / 1024 ** 2:.1f} | "
+                         f"{index['seconds']:.2f} | {used_by} |")
+        lines.append("")
+    return '\n'.join(lines)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark das consultas de QUERIES.md com e sem os índices.")
+    parser.add_argument('--scales', default='10k,100k',
+                        help="linhas de faturamento por escala, separadas por vírgula (ex: 10k,100k,1m)")
+    parser.add_argument('--repeat', type=int, default=5, help="execuções medidas por consulta (vale a mediana)")
+    parser.add_argument('--schema', default='benchmark_consultas', help="schema temporário das tabelas")
+    parser.add_argument('--blank-rate', type=float, default=0.02,
+                        help="fração de vazios em cada coluna obrigatória")
+    parser.add_argument('--invalid-rate', type=float, default=0.005,
+                        help="fração de valores inválidos em cada coluna numérica ou de data")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--data-dir', type=Path, default=Path(tempfile.gettempdir()) / 'credits-etl-benchmark',
+                        help="diretório dos arquivos gerados (reaproveitados entre execuções)")
+    parser.add_argument('--report', type=Path, help="arquivo JSON do relatório")
+    parser.add_argument('--markdown', type=Path, help="arquivo Markdown do relatório comparativo")
+    parser.add_argument('--keep', action='store_true', help="mantém o schema temporário da última escala")
+    parser.add_argument('--allow-remote-db', action='store_true',
+                        help="aceita um DB_HOST que não seja local")
+    args = parser.parse_args()
+
+    if not re.fullmatch(r'[a-z_][a-z0-9_]*', args.schema) or args.schema in ('bronze', 'auditoria', 'public'):
+        print(f"❌ Schema temporário inválido: {args.schema}")
+        return 2
+
+    from python.utils.config import get_db_config
+    from python.utils.db_connection import get_connection, get_cursor
+
+    db_config = get_db_config()
+    if not is_local_host(db_config.host) and not args.allow_remote_db:
+        print(f"❌ DB_HOST={db_config.host} não é local: o benchmark cria e carrega tabelas no banco. "
+              f"Use um PostgreSQL local ou --allow-remote-db.")
+        return 2
+
+    queries = parse_queries(QUERIES_FILE.read_text(encoding='utf-8'))
+    indexes = parse_indexes(INDEXES_FILE.read_text(encoding='utf-8'))
+    tables = ['base_oficial', 'faturamento', 'usuarios']
+    labels = [label.strip() for label in args.scales.split(',') if label.strip()]
+
+    print("=" * 60)
+    print(f"⏱️  BENCHMARK DE CONSULTAS ({len(queries)} consultas, {len(indexes)} índices da bronze)")
+    print("=" * 60)
+
+    scales = []
+    with get_connection() as conn:
+        try:
+            for label in labels:
+                rows = parse_rows(label)
+                rows_by_ingestor = {
+                    'base_oficial': max(rows // BASE_OFICIAL_RATIO, 1),
+                    'usuarios': USUARIOS_ROWS,
+                    'faturamento': rows,
+                }
+                print(f"\n▶️  Escala {label}: {rows_by_ingestor}")
+                create_schema(conn, args.schema, tables)
+                loaded = load(conn, args.schema, rows_by_ingestor, args)
+                analyze(conn, args.schema, tables)
+
+                print("\n📊 Sem índices")
+                without = measure(conn, queries, args.schema, args.repeat)
+                print("\n🗂️  Criando os índices de INDEXES.md")
+                created = create_indexes(conn, args.schema, indexes)
+                analyze(conn, args.schema, tables)
+                print("\n📊 Com índices")
+                with_indexes = measure(conn, queries, args.schema, args.repeat)
+
+                scale = compare_scale(queries, without, with_indexes, created)
+                scales.append(dict(scale, label=label, rows=loaded))
+        finally:
+            conn.rollback()
+            if not args.keep:
+                with get_cursor(conn) as cur:
+                    cur.execute(f"DROP SCHEMA IF EXISTS {args.schema} CASCADE")
+                conn.commit()
+
+    report = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'config': {'scales': labels, 'repeat': args.repeat, 'seed': args.seed,
+                   'blank_rate': args.blank_rate, 'invalid_rate': args.invalid_rate},
+        'scales': scales,
+    }
+    markdown = render_markdown(report)
+    print("\n" + markdown)
+    if args.report:
+        args.report.parent.mkdir(parents=True, exist_ok=True)
+        args.report.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"📝 Relatório gravado em {args.report}")
+    if args.markdown:
+        args.markdown.parent.mkdir(parents=True, exist_ok=True)
+        args.markdown.write_text(markdown, encoding='utf-8')
+        print(f"📝 Relatório comparativo gravado em {args.markdown}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""
+Este script mede o tempo de inicialização do pipeline com `python -X importtime`
+e falha (código de saída 1) se houver regressão.
+
+Cenários medidos, cada um em um processo novo:
+- A importação dos scripts de entrada (`run_pipeline`, `watch_pipeline`,
+  `check_usuarios_schema`).
+- Uma execução completa do pipeline com o diretório de entrada vazio, que
+  deve terminar sem importar pandas nem abrir conexão com o banco (as
+  credenciais apontam para um host inexistente, `EMPTY_RUN_DB_ENV`).
+
+Há regressão se o tempo de importação passar de `--max-ms` ou se algum módulo
+pesado (`HEAVY_MODULES`) for importado na inicialização: eles devem ser
+carregados apenas quando um arquivo é de fato lido ou o banco é acessado.
+
+Uso:
+    python python/scripts/benchmark_startup.py [--repeat 5] [--max-ms 250] [--top 10]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# Módulos que não podem ser importados na inicialização
+HEAVY_MODULES = ('pandas', 'numpy', 'pyarrow', 'psycopg2', 'tenacity',
+                 'openpyxl', 'python_calamine', 'zstandard', 'odf')
+
+# Módulos de entrada medidos por importação
+ENTRY_MODULES = (
+    'python.scripts.run_pipeline',
+    'python.scripts.watch_pipeline',
+    'python.scripts.check_usuarios_schema',
+)
+
+# Banco inexistente: qualquer tentativa de conexão faz a execução vazia falhar
+EMPTY_RUN_DB_ENV = {
+    'DB_HOST': 'benchmark.invalid', 'DB_PORT': '5432', 'DB_NAME': 'benchmark',
+    'DB_USER': 'benchmark', 'DB_PASSWORD': 'benchmark', 'DB_CONNECT_TIMEOUT': '1',
+}
+
+# Linha do `-X importtime`: "import time: self [us] | cumulative | imported package"
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def parse_importtime(stderr: str) -> list:
+    """
+    Interpreta a saída do `-X importtime`.
+
+    Returns:
+        list: Tuplas `(módulo, self_us, cumulative_us, nível)`, na ordem da saída.
+    """
+    entries = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return entries
+
+
+def run_importtime(args: list, cwd: Path, extra_env: dict = None) -> tuple:
+    """
+    Executa o Python com `-X importtime` em um processo novo.
+
+    Returns:
+        tuple: `(entradas do importtime, código de saída)`.
+    """
+    env = dict(os.environ, PYTHONPATH=str(ROOT), **(extra_env or {}))
+    result = subprocess.run([sys.executable, '-X', 'importtime'] + args, cwd=cwd, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    return parse_importtime(result.stderr), result.returncode
+
+
+def heavy_modules(entries: list) -> list:
+    """Os módulos de `HEAVY_MODULES` presentes nas entradas do importtime."""
+    found = {module.split('.')[0] for module, *_ in entries}
+    return sorted(found.intersection(HEAVY_MODULES))
+
+
+def project_import_ms(entries: list) -> float:
+    """Soma do tempo cumulativo das importações de nível 0 feitas pelo projeto (ms)."""
+    return sum(cumulative for module, _, cumulative, level in entries
+               if level == 0 and module.startswith('python.')) / 1000
+
+
+def benchmark_import(module: str, repeat: int) -> tuple:
+    """
+    Mede a importação de um módulo, `repeat` vezes.
+
+    Returns:
+        tuple: `(menor tempo em ms, entradas da execução mais rápida)`.
+    """
+    best = None
+    for _ in range(repeat):
+        entries, _ = run_importtime(['-c', f'import {module}'], ROOT)
+        total = project_import_ms(entries)
+        if best is None or total < best[0]:
+            best = (total, entries)
+    return best
+
+
+def benchmark_empty_run(repeat: int) -> tuple:
+    """
+    Executa o pipeline completo com o diretório de entrada vazio, `repeat` vezes.
+
+    Returns:
+        tuple: `(menor tempo de importação em ms, entradas da execução mais
+               rápida, código de saída)`.
+    """
+    best = None
+    with tempfile.TemporaryDirectory() as workdir:
+        (Path(workdir) / 'docker' / 'data' / 'input').mkdir(parents=True)
+        script = ROOT / 'python' / 'scripts' / 'run_pipeline.py'
+        for _ in range(repeat):
+            entries, returncode = run_importtime([str(script)], Path(workdir), EMPTY_RUN_DB_ENV)
+            total = sum(cumulative for _, _, cumulative, level in entries if level == 0) / 1000
+            if best is None or total < best[0]:
+                best = (total, entries, returncode)
+    return best
+
+
+def print_top(entries: list, top: int) -> None:
+    """Imprime os módulos com maior tempo próprio (self) de importação."""
+    for module, self_us, cumulative_us, _ in sorted(entries, key=lambda e: e[1], reverse=True)[:top]:
+        print(f"      {self_us / 1000:7.1f} ms  (cumulativo {cumulative_us / 1000:7.1f} ms)  {module}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de inicialização do pipeline (-X importtime).")
+    parser.add_argument('--repeat', type=int, default=5, help="execuções por cenário (vale a mais rápida)")
+    parser.add_argument('--max-ms', type=float, default=250.0,
+                        help="tempo máximo de importação de cada script de entrada, em ms")
+    parser.add_argument('--top', type=int, default=10, help="módulos mais lentos exibidos por cenário")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("⏱️  BENCHMARK DE INICIALIZAÇÃO (-X importtime)")
+    print("=" * 60)
+
+    failures = []
+    for module in ENTRY_MODULES:
+        total, entries = benchmark_import(module, args.repeat)
+        heavy = heavy_modules(entries)
+        ok = total <= args.max_ms and not heavy
+        print(f"{'✓' if ok else '❌'} import {module}: {total:.1f} ms (limite {args.max_ms:g} ms)")
+        if heavy:
+            print(f"   ❌ Módulos pesados importados na inicialização: {', '.join(heavy)}")
+        print_top(entries, args.top)
+        if not ok:
+            failures.append(module)
+
+    total, entries, returncode = benchmark_empty_run(args.repeat)
+    heavy = heavy_modules(entries)
+    ok = returncode == 0 and not heavy
+    print(f"{'✓' if ok else '❌'} run_pipeline.py com diretório de entrada vazio: "
+          f"{total:.1f} ms de importação (código de saída {returncode})")
+    if heavy:
+        print(f"   ❌ Módulos pesados importados: {', '.join(heavy)}")
+    if not ok:
+        failures.append('run_pipeline.py (diretório vazio)')
+
+    print("=" * 60)
+    if failures:
+        print(f"❌ Regressão de inicialização em: {', '.join(failures)}")
+        return 1
+    print("✅ Inicialização dentro dos limites")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""
+Este script consulta o acervo de arquivos processados (`ETL_ARCHIVE_MODE=store`,
+ver `python.core.archive`) e lê o conteúdo original de um arquivo, descompactado
+em streaming.
+
+Uso:
+    python python/scripts/read_archive.py --nome faturamento.csv
+    python python/scripts/read_archive.py --execucao <execucao_id>
+    python python/scripts/read_archive.py --hash <hash> --output faturamento.csv
+    python python/scripts/read_archive.py --hash <hash> --output - | head
+
+Sem `--output`, lista os conteúdos encontrados no catálogo (nomes, datas,
+execuções e tamanhos).
+"""
+import argparse
+import shutil
+import sys
+from pathlib import Path
+
+# Adiciona o diretório raiz do projeto ao path do sistema para permitir
+# importações de outros módulos do projeto.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from python.core.archive import open_archive
+from python.core.base_ingestor import PROCESSED_DIR
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Consulta e leitura do acervo de arquivos processados.")
+    parser.add_argument('--hash', help="hash MD5 do conteúdo")
+    parser.add_argument('--nome', help="nome com que o arquivo foi recebido")
+    parser.add_argument('--execucao', help="id de uma execução que carregou o arquivo")
+    parser.add_argument('--output', help="grava o conteúdo original neste arquivo ('-' = saída padrão)")
+    parser.add_argument('--processed-dir', type=Path, default=PROCESSED_DIR,
+                        help="diretório de arquivos processados")
+    args = parser.parse_args()
+
+    archive = open_archive(args.processed_dir)
+    if archive is None:
+        print(f"❌ Nenhum acervo em {args.processed_dir}", file=sys.stderr)
+        return 1
+
+    found = archive.find(file_hash=args.hash, name=args.nome, execution_id=args.execucao)
+    if not found:
+        print("Nenhum arquivo encontrado no acervo.", file=sys.stderr)
+        return 1
+
+    if args.output is None:
+        for archived in found:
+            stored = f"{archived.stored_size} bytes" if archived.stored_size is not None else "compactando"
+            print(f"{archived.file_hash}  {archived.size} bytes → {stored}  {archived.path.relative_to(archive.root)}")
+            for name, archived_at in zip(archived.names, archived.archived_at):
+                print(f"    {archived_at}  {name}")
+            if archived.execution_ids:
+                print(f"    execuções: {', '.join(archived.execution_ids)}")
+        return 0
+
+    if len(found) > 1:
+        print(f"❌ {len(found)} arquivos encontrados; informe --hash", file=sys.stderr)
+        return 1
+    with archive.open(found[0].file_hash) as stream:
+        if args.output == '-':
+            shutil.copyfileobj(stream, sys.stdout.buffer, 1024 * 1024)
+        else:
+            with open(args.output, 'wb') as target:
+                shutil.copyfileobj(stream, target, 1024 * 1024)
+            print(f"✓ {found[0].names[-1]} gravado em {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
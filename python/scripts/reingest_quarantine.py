@@ -0,0 +1,126 @@
+"""
+Este script recarrega as linhas rejeitadas (ERROR) que ficaram em quarentena
+em uma execução (`ETL_REJECTION_LOG_MODE=quarantine`), sem reprocessar o
+arquivo inteiro.
+
+Fluxo:
+1. Exportar as rejeições para um CSV editável:
+       python python/scripts/reingest_quarantine.py <execucao_id> --export correcoes.csv
+2. Corrigir os valores no CSV, sem alterar a coluna `_numero_linha` (linhas
+   removidas do CSV não são recarregadas).
+3. Recarregar as linhas corrigidas:
+       python python/scripts/reingest_quarantine.py <execucao_id> --input correcoes.csv
+
+Sem `--input`, as linhas da quarentena são recarregadas como estão (ex: depois
+de um ajuste na limpeza dos dados). As linhas vão para a tabela do ingestor da
+execução original, com o mesmo `source_filename`, em uma nova execução; as que
+falharem de novo vão para uma nova quarentena. Avisos (WARN) não são
+recarregados: essas linhas já foram inseridas na carga original.
+"""
+import argparse
+import hashlib
+import sys
+from pathlib import Path
+
+# Adiciona o diretório raiz do projeto ao path do sistema para permitir
+# importações de outros módulos do projeto.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from python.core.base_ingestor import PROCESSED_DIR
+from python.core.quarantine import META_COLUMNS, quarantine_files
+
+
+def read_rows(paths, batch_size: int):
+    """
+    Lê as linhas com ERROR de arquivos de quarentena (ou de um CSV exportado e
+    corrigido), com o índice das linhas originais e apenas as colunas do arquivo.
+    """
+    from python.core.inputs import InputSource
+    from python.core.readers import iter_batches, read_header
+
+    seen = set()
+    for path in paths:
+        source = InputSource(path)
+        with source.open() as stream:
+            header = read_header(stream, source.suffix)
+            stream.seek(0)
+            for batch in iter_batches(stream, source.suffix, header, batch_size):
+                if '_severidade' in batch.columns:
+                    batch = batch[batch['_severidade'] == 'ERROR']
+                lines = batch['_numero_linha'].astype(int)
+                # Uma mesma linha só é carregada uma vez
+                keep = ~lines.isin(seen) & ~lines.duplicated()
+                seen.update(lines[keep])
+                batch = batch[keep.to_numpy()].drop(columns=[col for col in META_COLUMNS if col in batch.columns])
+                batch.index = (lines[keep] - 2).to_numpy()
+                if len(batch):
+                    yield batch
+
+
+def export_rows(paths, output: Path) -> int:
+    """Grava as linhas com ERROR da quarentena em um CSV (`;`) para correção."""
+    import pandas as pd
+    import pyarrow.parquet as pq
+
+    frames = [pq.read_table(path).to_pandas() for path in paths]
+    rows = pd.concat(frames, ignore_index=True)
+    rows = rows[rows['_severidade'] == 'ERROR'].drop(columns=['_severidade', '_campo_falha'])
+    rows.to_csv(output, sep=';', index=False, encoding='utf-8')
+    return len(rows)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Recarrega as rejeições em quarentena de uma execução.")
+    parser.add_argument('execucao_id', help="id da execução que gerou a quarentena")
+    parser.add_argument('--export', type=Path, help="grava as rejeições em um CSV para correção e sai")
+    parser.add_argument('--input', type=Path, help="CSV (ou Parquet) corrigido a recarregar")
+    parser.add_argument('--processed-dir', type=Path, default=PROCESSED_DIR,
+                        help="diretório de arquivos processados")
+    args = parser.parse_args()
+
+    paths = quarantine_files(args.processed_dir, args.execucao_id)
+    if not paths and not args.input:
+        print(f"❌ Nenhum arquivo de quarentena da execução {args.execucao_id} em {args.processed_dir}")
+        return 1
+
+    if args.export:
+        count = export_rows(paths, args.export)
+        print(f"📝 {count} linhas rejeitadas exportadas para {args.export}")
+        return 0
+
+    from python.core.file_handler import FileHandler
+    from python.scripts.run_pipeline import INGESTOR_MAPPING
+    from python.utils.config import get_config
+    from python.utils.db_connection import get_connection, get_cursor
+
+    if args.input:
+        sources = [args.input]
+        file_hash = FileHandler.calculate_hash(args.input)
+    else:
+        sources = paths
+        file_hash = hashlib.md5(''.join(FileHandler.calculate_hash(path) for path in paths)
+                                .encode()).hexdigest()
+
+    with get_connection() as conn:
+        with get_cursor(conn) as cur:
+            cur.execute("SELECT script_nome, tabela_origem FROM auditoria.historico_execucao WHERE id = %s",
+                        (args.execucao_id,))
+            found = cur.fetchone()
+        if found is None:
+            print(f"❌ Execução {args.execucao_id} não encontrada")
+            return 1
+        script_nome, source_name = found
+        ingestor_cls = INGESTOR_MAPPING.get(script_nome.removeprefix('ingest_'))
+        if ingestor_cls is None:
+            print(f"❌ Nenhum ingestor para a execução {args.execucao_id} ({script_nome})")
+            return 1
+
+        ingestor = ingestor_cls()
+        print(f"[{ingestor.name}] 🔁 Recarregando as rejeições de {source_name} "
+              f"({', '.join(path.name for path in sources)})")
+        ingestor.reingest(conn, source_name, file_hash, read_rows(sources, get_config().csv.chunk_size))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
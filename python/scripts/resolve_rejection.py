@@ -0,0 +1,79 @@
+"""
+Este script mostra as rejeições de uma execução com o registro completo de
+cada linha.
+
+No modo compacto do log (`ETL_REJECTION_LOG_MODE=compact`), o registro não
+está em `auditoria.log_rejeicao`: ele é lido do arquivo arquivado em
+`processed/` (ver `python.core.row_resolver`). Entradas gravadas no modo
+completo são exibidas com o registro do próprio log.
+
+Uso:
+    python python/scripts/resolve_rejection.py <execucao_id> [--linha 15 --linha 42] [--limit 20]
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Adiciona o diretório raiz do projeto ao path do sistema para permitir
+# importações de outros módulos do projeto.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from python.core.base_ingestor import PROCESSED_DIR
+from python.core.row_resolver import ArchivedRowResolver
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Rejeições de uma execução, com o registro completo.")
+    parser.add_argument('execucao_id', help="id da execução (log_rejeicao.execucao_fk)")
+    parser.add_argument('--linha', type=int, action='append', help="número da linha (pode repetir)")
+    parser.add_argument('--limit', type=int, default=20, help="máximo de entradas exibidas")
+    parser.add_argument('--processed-dir', type=Path, default=PROCESSED_DIR,
+                        help="diretório de arquivos processados")
+    args = parser.parse_args()
+
+    from python.utils.db_connection import get_connection, get_cursor
+
+    with get_connection() as conn:
+        with get_cursor(conn) as cur:
+            query = """
+                SELECT numero_linha, severidade, campo_falha, motivo_rejeicao, registro_completo
+                FROM auditoria.log_rejeicao
+                WHERE execucao_fk = %s {filtro}
+                ORDER BY numero_linha
+                LIMIT %s
+            """
+            if args.linha:
+                cur.execute(query.format(filtro="AND numero_linha = ANY(%s)"),
+                            (args.execucao_id, args.linha, args.limit))
+            else:
+                cur.execute(query.format(filtro=""), (args.execucao_id, args.limit))
+            entries = cur.fetchall()
+
+        if not entries:
+            print(f"Nenhuma rejeição encontrada para a execução {args.execucao_id}.")
+            return 1
+
+        missing = [line for line, *_, record in entries if record is None]
+        resolved = {}
+        if missing:
+            try:
+                resolved = ArchivedRowResolver(args.processed_dir).resolve(conn, args.execucao_id, missing)
+            except LookupError as e:
+                print(f"⚠️  {e}")
+
+    for line, severity, field, reason, record in entries:
+        if record is None:
+            record = resolved.get(line)
+        elif isinstance(record, str):
+            try:
+                record = json.loads(record)
+            except ValueError:
+                pass  # Entradas antigas, gravadas como texto
+        print(json.dumps({'numero_linha': line, 'severidade': severity, 'campo_falha': field,
+                          'motivo_rejeicao': reason, 'registro': record}, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
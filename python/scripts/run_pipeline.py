@@ -2,8 +2,20 @@
 Este script é o orquestrador principal do pipeline de ingestão de dados para a
 camada Bronze. Ele automatiza a descoberta de arquivos no diretório de entrada
 e aciona o ingestor correspondente para cada arquivo encontrado.
+
+Os ingestores e as etapas pós-carga são executados como um DAG (ver
+`PIPELINE_DAG`): etapas independentes rodam em paralelo, até
+`ETL_PARALLEL_INGESTORS` ao mesmo tempo.
+
+Com `ETL_JOB_QUEUE=true`, o script atua como worker da fila de ingestão no
+banco (ver `python.core.job_queue`): vários workers, em containers ou hosts
+diferentes, podem rodar ao mesmo tempo sobre o mesmo diretório de entrada.
+
+Com `ETL_METRICS_TEXTFILE`, as métricas da execução (ver `python.utils.metrics`)
+são gravadas ao final para o textfile collector do node_exporter.
 """
 import sys
+import threading
 import time
 from pathlib import Path
 
@@ -14,6 +26,17 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 from python.ingestors.ingest_base_oficial import IngestBaseOficial
 from python.ingestors.ingest_faturamento import IngestFaturamento
 from python.ingestors.ingest_usuarios import IngestUsuarios
+from python.core.base_ingestor import INPUT_DIR, PROCESSED_DIR, TEMPLATE_DIR
+from python.core.archive import close_archive_store, get_archive_store
+from python.core.file_handler import FileHandler
+from python.core.inputs import COMPRESSION_SUFFIXES, expand_inputs, load_workbooks
+from python.core.job_queue import JobQueue, worker_name
+from python.core.readers import SUPPORTED_SUFFIXES, read_header
+from python.core.scheduler import Dag, Step
+from python.core.template_registry import TemplateRegistry
+from python.utils.config import get_etl_config
+from python.utils.db_connection import acquire_connection, release_connection, get_cursor
+from python.utils import metrics as prometheus
 
 # Mapeia padrões de nomes de arquivo para suas respectivas classes de ingestor.
 # Isso permite que o pipeline descubra automaticamente qual ingestor usar
@@ -24,64 +47,387 @@ INGESTOR_MAPPING = {
     'usuarios': IngestUsuarios,
 }
 
-def auto_discover_files():
+# DAG do pipeline: cada etapa ('tipo:ingestor') e as etapas das quais depende.
+# As tabelas bronze não têm chaves estrangeiras entre si, então os três
+# ingestores ficam no primeiro nível e rodam em paralelo. As etapas pós-carga
+# atualizam as estatísticas do planejador (ANALYZE) de cada tabela assim que
+# ela é carregada, antes das consultas que cruzam faturamento com as dimensões
+# base_oficial e usuarios.
+PIPELINE_DAG = {
+    'ingest:base_oficial': (),
+    'ingest:usuarios': (),
+    'ingest:faturamento': (),
+    'analyze:base_oficial': ('ingest:base_oficial',),
+    'analyze:usuarios': ('ingest:usuarios',),
+    'analyze:faturamento': ('ingest:faturamento',),
+}
+
+# Extensões de arquivo reconhecidas no diretório de entrada: os formatos dos
+# leitores e os arquivos compactados
+INPUT_PATTERNS = tuple(f"*{suffix}" for suffix in SUPPORTED_SUFFIXES + COMPRESSION_SUFFIXES)
+
+def match_ingestor(name):
     """
-    Busca por arquivos CSV e XLSX no diretório de entrada e os associa a um
-    ingestor com base no mapeamento `INGESTOR_MAPPING`.
+    Retorna a classe de ingestor cujo padrão aparece no nome informado (nome
+    de arquivo sem extensão ou nome de planilha), ou `None` se nenhum padrão
+    corresponder.
+    """
+    name = name.lower()  # Compara em minúsculas
+    for pattern, ingestor_class in INGESTOR_MAPPING.items():
+        if pattern in name:
+            return ingestor_class  # Para no primeiro match encontrado
+    return None
 
-    Returns:
-        list: Uma lista de tuplas, onde cada tupla contém o nome do arquivo
-              e uma instância da classe de ingestor correspondente.
+def route_source(source, registry, first_sheet):
     """
+    Escolhe o ingestor de uma fonte de dados.
+
+    Planilhas são associadas pelo nome da planilha ou, se o nome não
+    corresponder a nenhum padrão, pelo cabeçalho (o template idêntico). A
+    primeira planilha de uma pasta de trabalho também pode ser associada pelo
+    nome do arquivo, como acontecia quando apenas ela era lida. As demais
+    fontes são associadas pelo nome do arquivo (ou do membro do `.zip`).
+    """
+    if source.sheet:
+        ingestor_class = match_ingestor(source.sheet)
+        if ingestor_class:
+            return ingestor_class
+        try:
+            with source.open() as stream:
+                header = read_header(stream, source.suffix, source.sheet)
+        except Exception:
+            header = None
+        name = registry.find(header.columns) if header else None
+        if name in INGESTOR_MAPPING:
+            return INGESTOR_MAPPING[name]
+        if not first_sheet:
+            return None
+    return match_ingestor(source.stem)
+
+def list_input_files():
+    """Lista os arquivos do diretório de entrada com extensões reconhecidas."""
     input_dir = Path("docker/data/input")
-    files = list(input_dir.glob('*.csv')) + list(input_dir.glob('*.xlsx'))
+    return [file for pattern in INPUT_PATTERNS for file in input_dir.glob(pattern)]
+
+def auto_discover_files(files=None, ingestors=None):
+    """
+    Busca por arquivos CSV, XLSX, ODS, Parquet e Arrow IPC (inclusive compactados
+    em .gz, .zst ou .zip) no diretório de entrada e os associa a
+    um ingestor com base no mapeamento `INGESTOR_MAPPING`.
+
+    Os membros de um `.zip` e as planilhas de uma pasta de trabalho são
+    associados individualmente (ver `route_source`) e podem ser processados
+    por ingestores diferentes.
+
+    Args:
+        files (list, optional): Arquivos a considerar. Por padrão, todos os
+                                arquivos do diretório de entrada.
+        ingestors (dict, optional): Instâncias de ingestor já criadas, por
+                                    classe, reaproveitadas entre chamadas (o
+                                    esquema das tabelas fica em cache na
+                                    instância). Novas instâncias são
+                                    adicionadas ao dicionário.
+
+    Returns:
+        list: Uma lista de tuplas `(nome_do_arquivo, ingestor, fontes)`, onde
+              `fontes` é a lista de fontes (`InputSource`) destinadas ao
+              ingestor, ou `None` para arquivos simples.
+    """
+    if files is None:
+        files = list_input_files()
+    if ingestors is None:
+        ingestors = {}
+
+    def ingestor_for(ingestor_class):
+        if ingestor_class not in ingestors:
+            ingestors[ingestor_class] = ingestor_class()
+        return ingestors[ingestor_class]
+
+    registry = TemplateRegistry.for_dir(TEMPLATE_DIR, get_etl_config().template_cache_file)
     
     discovered = []
     for file in files:
-        file_stem = file.stem.lower()  # Usa o nome do arquivo sem extensão, em minúsculas
-        for pattern, ingestor_class in INGESTOR_MAPPING.items():
-            if pattern in file_stem:
-                discovered.append((file.name, ingestor_class()))
-                break  # Para no primeiro match encontrado
+        try:
+            sources = expand_inputs(file, sheets=True)
+        except Exception as e:
+            print(f"⚠️  Arquivo ignorado ({file.name}): {e}")
+            continue
+        if len(sources) == 1 and sources[0].member is None and sources[0].sheet is None:
+            ingestor_class = match_ingestor(sources[0].stem)
+            if ingestor_class:
+                discovered.append((file.name, ingestor_for(ingestor_class), None))
+            continue
+
+        sources_by_ingestor = {}
+        seen_workbooks = set()
+        # O conteúdo das pastas de trabalho fica em memória só durante a
+        # associação; as fontes guardadas não o carregam
+        for source, loaded in zip(sources, load_workbooks(sources)):
+            workbook = (source.path, source.member)
+            first_sheet = workbook not in seen_workbooks
+            seen_workbooks.add(workbook)
+
+            ingestor_class = route_source(loaded, registry, first_sheet)
+            if ingestor_class:
+                sources_by_ingestor.setdefault(ingestor_class, []).append(source)
+            elif source.sheet:
+                print(f"⚠️  Planilha ignorada ({source.name}): nenhum ingestor ou template corresponde")
+        for ingestor_class, ingestor_sources in sources_by_ingestor.items():
+            discovered.append((file.name, ingestor_for(ingestor_class), ingestor_sources))
     
     return discovered
 
-def run_pipeline():
+def analyze_table(ingestor_class):
+    """
+    Etapa pós-carga: atualiza as estatísticas da tabela de destino de um
+    ingestor, para que o planejador use as contagens da carga recém-feita.
+    """
+    target_table = ingestor_class().target_table
+    conn = acquire_connection()
+    try:
+        with get_cursor(conn) as cur:
+            cur.execute(f"ANALYZE {target_table}")
+        conn.commit()
+    finally:
+        release_connection(conn)
+    print(f"📊 Estatísticas atualizadas: {target_table}")
+
+# Ações das etapas pós-carga do DAG, pelo tipo da etapa
+POST_LOAD_ACTIONS = {
+    'analyze': analyze_table,
+}
+
+def build_dag(discovered_files, post_load=True):
+    """
+    Monta o DAG do pipeline a partir de `PIPELINE_DAG` e dos arquivos
+    descobertos.
+
+    Ingestores sem arquivos a processar ficam de fora, assim como as etapas
+    que dependem deles.
+
+    Args:
+        discovered_files (list): O retorno de `auto_discover_files`.
+        post_load (bool): Se False, apenas as etapas de ingestão são incluídas.
+
+    Returns:
+        Dag: O grafo de etapas. O valor de cada etapa de ingestão é o
+             dicionário `{arquivo: [(is_duplicate, execucao_id), ...]}` das
+             fontes expandidas.
+    """
+    work = {}
+    for filename, ingestor, sources in discovered_files:
+        work.setdefault(ingestor.name, []).append((filename, ingestor, sources))
+
+    def ingest(entries):
+        def action():
+            archives = {}
+            for filename, ingestor, sources in entries:
+                results = ingestor.run(filename, sources=sources)
+                if sources is not None:
+                    for file_path, loads in results.items():
+                        archives.setdefault(file_path, []).extend(loads)
+            return archives
+        return action
+
+    def post_load_step(kind, ingestor_class):
+        def action():
+            POST_LOAD_ACTIONS[kind](ingestor_class)
+        return action
+
+    steps = {}
+    for name, depends_on in PIPELINE_DAG.items():
+        kind, target = name.split(':', 1)
+        if any(dep not in steps for dep in depends_on):
+            continue
+        if kind == 'ingest':
+            if target not in work:
+                continue
+            action = ingest(work[target])
+        elif post_load:
+            action = post_load_step(kind, INGESTOR_MAPPING[target])
+        else:
+            continue
+        steps[name] = Step(name, action, depends_on)
+
+    return Dag(list(steps.values()))
+
+def move_archives(step_results):
+    """
+    Move os arquivos `.zip` e as pastas de trabalho depois que todas as suas
+    fontes foram processadas (arquivos simples são movidos pelo ingestor).
+    """
+    archives = {}
+    for result in step_results.values():
+        if result.name.startswith('ingest:') and result.status == 'sucesso':
+            for file_path, loads in result.value.items():
+                archives.setdefault(file_path, []).extend(loads)
+
+    file_handler = FileHandler(PROCESSED_DIR, get_archive_store(PROCESSED_DIR, get_etl_config()))
+    for file_path, loads in archives.items():
+        try:
+            dest = file_handler.move_to_processed(
+                file_path, is_duplicate=bool(loads) and all(duplicate for duplicate, _ in loads),
+                execution_ids=[execution_id for _, execution_id in loads])
+            print(f"📂 Arquivo movido para: {dest.relative_to(PROCESSED_DIR)}")
+        except Exception as e:
+            print(f"⚠️  Erro ao mover o arquivo {file_path.name}: {e}")
+
+def run_queue(files=None, ingestors=None):
+    """
+    Executa o pipeline como worker da fila de ingestão.
+
+    Os arquivos do diretório de entrada são enfileirados e, em seguida,
+    `ETL_QUEUE_WORKERS` threads reservam e processam um arquivo por vez até a
+    fila esvaziar (inclusive arquivos enfileirados por outros workers). As
+    etapas pós-carga rodam uma única vez, ao final, para as tabelas carregadas
+    por este worker.
+
+    Args:
+        files (list, optional): Arquivos a enfileirar. Por padrão, todos os
+                                arquivos do diretório de entrada.
+        ingestors (dict, optional): Instâncias de ingestor reaproveitadas
+                                    (ver `auto_discover_files`).
+
+    Returns:
+        bool: True se todos os arquivos processados por este worker terminaram
+              com sucesso.
+    """
+    etl_config = get_etl_config()
+    queue = JobQueue(INPUT_DIR)
+    if ingestors is None:
+        ingestors = {}
+
+    conn = acquire_connection()
+    try:
+        queue.ensure_schema(conn)
+        created = queue.enqueue(conn, list_input_files() if files is None else files)
+    finally:
+        release_connection(conn)
+    workers = max(1, etl_config.queue_workers)
+    print(f"📋 Arquivos enfileirados: {created} | Workers neste processo: {workers}")
+
+    loaded = set()
+    failed = []
+    lock = threading.Lock()
+
+    def work(index):
+        name = worker_name(index)
+        while True:
+            with queue.claim(name) as job:
+                if job is None:
+                    return
+                print(f"🔒 [{name}] Arquivo reservado: {job.path.name}")
+                discovered = auto_discover_files([job.path], ingestors)
+                if not discovered:
+                    job.status = 'ignorado'
+                    continue
+                step_results = build_dag(discovered, post_load=False).run(etl_config.parallel_ingestors)
+                move_archives(step_results)
+
+                errors = [f"{result.name}: {result.error}" for result in step_results.values()
+                          if result.status != 'sucesso']
+                with lock:
+                    loaded.update(ingestor.name for _, ingestor, _ in discovered)
+                    if errors:
+                        failed.append(job.path.name)
+                if errors:
+                    job.fail('; '.join(errors))
+
+    threads = [threading.Thread(target=work, args=(index,), name=f"fila-{index}")
+               for index in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for name in PIPELINE_DAG:
+        kind, target = name.split(':', 1)
+        if kind != 'ingest' and target in loaded:
+            try:
+                POST_LOAD_ACTIONS[kind](INGESTOR_MAPPING[target])
+            except Exception as e:
+                print(f"   ❌ Etapa '{name}' falhou: {e}")
+                failed.append(name)
+
+    if failed:
+        print(f"⚠️  Falhas neste worker: {', '.join(failed)}")
+    return not failed
+
+def record_run(success, duration):
+    """Registra o resultado de uma execução nas métricas e grava o arquivo `.prom`, se configurado."""
+    prometheus.PIPELINE_RUNS.inc('sucesso' if success else 'erro')
+    prometheus.PIPELINE_LAST_DURATION.set(duration)
+    if success:
+        prometheus.PIPELINE_LAST_SUCCESS.set(time.time())
+    prometheus.export_textfile(get_etl_config().metrics_textfile)
+
+def run_pipeline(files=None, ingestors=None):
     """
     Executa o pipeline de ingestão completo.
 
     Esta função orquestra todo o processo:
     1. Imprime um cabeçalho inicial.
     2. Descobre automaticamente os arquivos e seus respectivos ingestores.
-    3. Itera sobre os arquivos descobertos e executa cada ingestor.
-    4. Mede e imprime o tempo total de execução do pipeline.
+    3. Executa o DAG de ingestores e etapas pós-carga (ou, com
+       `ETL_JOB_QUEUE=true`, processa a fila de ingestão; ver `run_queue`).
+    4. Imprime a duração de cada etapa, o caminho crítico e o tempo total.
+
+    Args:
+        files (list, optional): Arquivos a processar (ver `auto_discover_files`).
+        ingestors (dict, optional): Instâncias de ingestor reaproveitadas entre
+                                    execuções (ver `auto_discover_files`).
+
+    Returns:
+        bool: True se todas as etapas terminaram com sucesso.
     """
     print("="*60)
     print("🚀 PIPELINE DE INGESTÃO BRONZE (RAW-FIRST)")
     print("="*60)
     
     start = time.time()
+
+    if get_etl_config().job_queue:
+        success = run_queue(files, ingestors)
+        duration = time.time() - start
+        record_run(success, duration)
+        print("="*60)
+        print(f"{'✅' if success else '⚠️ '} WORKER DA FILA CONCLUÍDO EM {duration:.2f}s")
+        print("="*60)
+        return success
     
     # Descoberta automática de arquivos
-    discovered_files = auto_discover_files()
+    discovered_files = auto_discover_files(files, ingestors)
     
     if not discovered_files:
         print("⚠️  Nenhum arquivo encontrado no diretório de entrada para processar.")
-        return
+        record_run(True, time.time() - start)
+        return True
     
     print(f"📋 Arquivos detectados para processamento: {len(discovered_files)}")
+    dag = build_dag(discovered_files)
+    max_workers = get_etl_config().parallel_ingestors
+    dag.print_plan(max_workers)
     print()
     
-    # Execução dos ingestores para cada arquivo encontrado
-    for filename, ingestor in discovered_files:
-        ingestor.run(filename)
+    # Execução dos ingestores e etapas pós-carga
+    step_results = dag.run(max_workers)
+    move_archives(step_results)
     
     duration = time.time() - start
+    success = all(result.status == 'sucesso' for result in step_results.values())
+    record_run(success, duration)
     print()
+    dag.print_report(step_results)
     print("="*60)
-    print(f"✅ PIPELINE CONCLUÍDO EM {duration:.2f}s")
+    if success:
+        print(f"✅ PIPELINE CONCLUÍDO EM {duration:.2f}s")
+    else:
+        print(f"⚠️  PIPELINE CONCLUÍDO COM FALHAS EM {duration:.2f}s")
     print("="*60)
+    return success
 
 if __name__ == "__main__":
     # Ponto de entrada para a execução do script
-    run_pipeline()
+    success = run_pipeline()
+    close_archive_store()
+    sys.exit(0 if success else 1)
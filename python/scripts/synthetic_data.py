@@ -0,0 +1,239 @@
+"""
+Este script gera arquivos sintéticos no formato dos templates de ingestão
+(faturamento, base_oficial e usuarios), para benchmarks e testes de carga.
+
+Os dados imitam as exportações reais:
+- Números no formato brasileiro, com espaços e o traço de valor zerado
+  (ex: `" 1.398,23 "`, `" -   "`).
+- Datas `dd/mm/aaaa` misturadas com `mês/aaaa` (ex: `out/2025`).
+- CNPJs de 14 dígitos, alguns sem os zeros à esquerda (como saem do Excel).
+- Chaves em comum entre os templates: os CNPJs do faturamento e da base
+  oficial, e os vendedores e consultores, vêm dos mesmos conjuntos, para que
+  as junções de `QUERIES.md` encontrem correspondências.
+- Campos obrigatórios vazios (`--blank-rate`) e valores numéricos e de data
+  inválidos (`--invalid-rate`), que geram WARN e ERROR na carga.
+
+A geração é determinística (`--seed`) e feita em blocos, com os valores
+sorteados de um conjunto pré-formatado por coluna: 10 milhões de linhas não
+passam de um bloco em memória. Os arquivos são sempre CSV (também para a base
+oficial, cujo template é ODS): o cabeçalho é o do template, então o ingestor os
+aceita normalmente.
+
+Uso:
+    python python/scripts/synthetic_data.py faturamento --rows 1m --output faturamento_sintetico.csv
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Adiciona o diretório raiz do projeto ao path do sistema para permitir
+# importações de outros módulos do projeto.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from python.core.base_ingestor import TEMPLATE_DIR
+from python.core.template_registry import TemplateRegistry
+
+# Tamanhos nomeados aceitos em `--rows`
+SIZES = {'10k': 10_000, '1m': 1_000_000, '10m': 10_000_000}
+
+# Colunas numéricas e de data dos templates (tipadas no banco); as demais são texto
+NUMERIC_COLUMNS = {
+    'valor_da_conta', 'valor_liquido', 'impostos_retidos', 'descontos',
+    'juros_multa', 'valor_recebido', 'valor_a_receber',
+}
+DATE_COLUMNS = {
+    'previsao_recebimento', 'ultimo_recebimento', 'vencimento', 'data_emissao',
+    'data_registro', 'ultima_alteracao', 'data_fat',
+}
+CNPJ_COLUMNS = {'cnpj'}
+PERSON_COLUMNS = {'consultor', 'lider', 'responsavel', 'vendedor', 'incluido_por', 'alterado_por'}
+
+# Domínios das colunas de texto categóricas; as demais recebem textos livres
+CATEGORIES = {
+    'a_vencer_boleto_gerado': ['Recebido', 'A vencer', 'Vencido', 'Boleto gerado'],
+    'parcela': ['001/001', '001/002', '002/002', '001/003', '002/003', '003/003'],
+    'categorioa': ['SPC', 'Serasa', 'Consultoria', 'Cobrança'],
+    'tipo_documento': ['Boleto', 'PIX', 'Cartão', 'Transferência'],
+    'conta_corrente': ['Itaú Unibanco', 'Bradesco', 'Banco do Brasil', 'Santander'],
+    'empresa': ['Credits', 'Credits Brasil', 'Credits Cobrança'],
+    'ms': ['Recorrente', 'Avulso', 'Novo'],
+    'status': ['Ativo', 'Inativo', 'Prospect'],
+    'manter_no_baseline': ['Sim', 'Não'],
+    'canal_1': ['Direto', 'Parceiro', 'Digital'],
+    'canal_2': ['Inside Sales', 'Field Sales', 'Self-service'],
+    'corte': ['A', 'B', 'C', 'D'],
+    'segmento': ['Indústria', 'Comércio', 'Serviços', 'Agronegócio'],
+    'cargo': ['Vendedor', 'Gerente', 'Diretor', 'Consultor'],
+    'status_vendedor': ['Ativo', 'Inativo'],
+    'nivel': ['1', '2', '3', '4'],
+    'time': ['A', 'B', 'C', 'Enterprise'],
+}
+
+# Valores inválidos injetados em colunas numéricas e de data (rejeitados com ERROR)
+INVALID_NUMERIC = ['abc', '12,3,4', 'R$ ??', 'N/D', '1..2,,3']
+INVALID_DATE = ['32/13/2023', '99/99/9999', 'sem data', '31/02/2024', 'xyz/2025']
+
+_MONTHS = ['jan', 'fev', 'mar', 'abr', 'mai', 'jun', 'jul', 'ago', 'set', 'out', 'nov', 'dez']
+_WORDS = ['STARPACK', 'EMBALAGENS', 'COMERCIAL', 'LTDA', 'SERVICOS', 'TECNOLOGIA', 'ALIMENTOS',
+          'DISTRIBUIDORA', 'BRASIL', 'NORTE', 'SUL', 'INDUSTRIA', 'LOGISTICA', 'EPP', 'ME', 'SA']
+_NAMES = ['Joelson', 'Lucélia', 'Maria', 'João', 'Ana', 'Carlos', 'Fernanda', 'Paulo', 'Juliana',
+          'Ricardo', 'Patrícia', 'Marcos']
+_SURNAMES = ['Salles', 'Silva', 'Souza', 'Oliveira', 'Santos', 'Pereira', 'Costa', 'Almeida']
+
+# Valores distintos pré-formatados por coluna, e linhas geradas por bloco
+POOL_SIZE = 4096
+CNPJ_POOL_SIZE = 100_000
+CHUNK_ROWS = 200_000
+
+
+def parse_rows(value: str) -> int:
+    """Converte `--rows` ('10k', '1m', '10m', '250k' ou um número) em quantidade de linhas."""
+    value = value.strip().lower().replace('_', '')
+    if value in SIZES:
+        return SIZES[value]
+    multipliers = {'k': 1_000, 'm': 1_000_000}
+    if value[-1:] in multipliers:
+        return int(float(value[:-1]) * multipliers[value[-1]])
+    return int(value)
+
+
+def _brazilian_number(value: float) -> str:
+    """Formata um valor como nas exportações: `" 1.398,23 "`, ou `" -   "` para zero."""
+    if value == 0:
+        return ' -   '
+    text = f"{value:,.2f}".translate(str.maketrans(',.', '.,'))
+    return f" {text} "
+
+
+def _shared_pools(seed: int, cnpjs: int) -> dict:
+    """
+    Conjuntos das colunas de chave, iguais em todos os ingestores com a mesma
+    semente: `{'cnpj': ..., 'pessoa': ...}`.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    # 12 dígitos aleatórios e os 2 verificadores, para os CNPJs passarem na regra `CnpjCpf`
+    base = rng.integers(0, 10, (cnpjs, 12))
+    first = base @ np.array([5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]) % 11
+    first = np.where(first < 2, 0, 11 - first)
+    second = np.column_stack([base, first]) @ np.array([6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]) % 11
+    second = np.where(second < 2, 0, 11 - second)
+    digits = np.array([''.join(row) for row in np.column_stack([base, first, second]).astype(str).tolist()])
+    # Exportações via Excel perdem os zeros à esquerda de parte dos CNPJs
+    stripped = rng.random(cnpjs) < 0.05
+    cnpjs = np.array([d.lstrip('0') if strip else d for d, strip in zip(digits.tolist(), stripped)],
+                     dtype=object)
+    people = np.array([f"{name} {surname}" for name in _NAMES for surname in _SURNAMES], dtype=object)
+    return {'cnpj': cnpjs, 'pessoa': people}
+
+
+def _pool(column: str, rng):
+    """Conjunto de valores válidos, já formatados, de uma coluna (exceto as de chave)."""
+    import numpy as np
+
+    if column in NUMERIC_COLUMNS:
+        values = np.round(rng.lognormal(6, 1.5, POOL_SIZE), 2)
+        values[rng.random(POOL_SIZE) < 0.15] = 0  # Valores zerados (" -   ")
+        values[rng.random(POOL_SIZE) < 0.02] *= -1  # Estornos
+        return np.array([_brazilian_number(v) for v in values], dtype=object)
+    if column in DATE_COLUMNS:
+        days = rng.integers(0, 365 * 6, POOL_SIZE)
+        dates = np.datetime64('2020-01-01') + days.astype('timedelta64[D]')
+        full = [f"{d.day:02d}/{d.month:02d}/{d.year}" for d in dates.astype(object)]
+        month_year = [f"{_MONTHS[d.month - 1]}/{d.year}" for d in dates.astype(object)]
+        return np.where(rng.random(POOL_SIZE) < 0.2, month_year, full).astype(object)
+    if column in CATEGORIES:
+        return np.array(CATEGORIES[column], dtype=object)
+    if column.startswith('acesso_'):
+        return np.array([f"{rng.choice(_NAMES).lower()}.{i}@credits.com.br" for i in range(256)], dtype=object)
+    words = rng.choice(_WORDS, (POOL_SIZE, 3))
+    return np.array([' '.join(row) for row in words], dtype=object)
+
+
+def generate(ingestor, rows: int, output: Path, blank_rate: float = 0.02,
+             invalid_rate: float = 0.005, seed: int = 42, cnpjs: int = CNPJ_POOL_SIZE) -> Path:
+    """
+    Gera um CSV sintético com o cabeçalho do template de um ingestor.
+
+    Args:
+        ingestor (BaseIngestor): O ingestor a imitar (template e colunas obrigatórias).
+        rows (int): Quantidade de linhas de dados.
+        output (Path): O arquivo CSV a gerar.
+        blank_rate (float): Fração de células vazias em cada coluna obrigatória.
+        invalid_rate (float): Fração de valores inválidos em cada coluna
+                              numérica ou de data.
+        seed (int): Semente do gerador (mesma semente, mesmo arquivo).
+        cnpjs (int): Quantidade de CNPJs distintos (use a mesma em arquivos
+                     que serão cruzados, ex: faturamento e base oficial).
+
+    Returns:
+        Path: O arquivo gerado.
+    """
+    import numpy as np
+    import pandas as pd
+
+    template = TemplateRegistry.for_dir(TEMPLATE_DIR).get(ingestor.name)
+    if template is None:
+        raise ValueError(f"Template não encontrado para o ingestor '{ingestor.name}'")
+    _, header = template
+
+    rng = np.random.default_rng([seed, sum(map(ord, ingestor.name))])
+    shared = _shared_pools(seed, cnpjs)
+    pools = {}
+    for column in header:
+        if column in CNPJ_COLUMNS:
+            pools[column] = shared['cnpj']
+        elif column in PERSON_COLUMNS:
+            pools[column] = shared['pessoa']
+        else:
+            pools[column] = _pool(column, rng)
+    # As colunas obrigatórias têm os nomes do banco: volta ao nome do template
+    mapping = ingestor.get_column_mapping()
+    mandatory = {column for column in header if mapping.get(column, column) in ingestor.mandatory_cols}
+
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8', newline='') as f:
+        for start in range(0, max(rows, 1), CHUNK_ROWS):
+            n = min(CHUNK_ROWS, rows - start)
+            data = {}
+            for column in header:
+                pool = pools[column]
+                values = pool[rng.integers(0, len(pool), n)]
+                if column in NUMERIC_COLUMNS or column in DATE_COLUMNS:
+                    invalid = INVALID_NUMERIC if column in NUMERIC_COLUMNS else INVALID_DATE
+                    mask = rng.random(n) < invalid_rate
+                    values[mask] = np.array(invalid, dtype=object)[rng.integers(0, len(invalid), mask.sum())]
+                if column in mandatory:
+                    values[rng.random(n) < blank_rate] = ''
+                data[column] = values
+            pd.DataFrame(data, columns=list(header)).to_csv(f, index=False, header=start == 0)
+    return output
+
+
+def main() -> int:
+    from python.scripts.run_pipeline import INGESTOR_MAPPING
+
+    parser = argparse.ArgumentParser(description="Gera arquivos sintéticos no formato dos templates.")
+    parser.add_argument('ingestor', choices=sorted(INGESTOR_MAPPING))
+    parser.add_argument('--rows', default='10k', help="linhas de dados: 10k, 1m, 10m ou um número")
+    parser.add_argument('--output', type=Path, help="arquivo de saída (padrão: <ingestor>_sintetico_<rows>.csv)")
+    parser.add_argument('--blank-rate', type=float, default=0.02,
+                        help="fração de vazios em cada coluna obrigatória")
+    parser.add_argument('--invalid-rate', type=float, default=0.005,
+                        help="fração de valores inválidos em cada coluna numérica ou de data")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--cnpjs', type=int, default=CNPJ_POOL_SIZE, help="quantidade de CNPJs distintos")
+    args = parser.parse_args()
+
+    ingestor = INGESTOR_MAPPING[args.ingestor]()
+    rows = parse_rows(args.rows)
+    output = args.output or Path(f"{args.ingestor}_sintetico_{args.rows}.csv")
+    generate(ingestor, rows, output, args.blank_rate, args.invalid_rate, args.seed, args.cnpjs)
+    print(f"✅ {rows} linhas geradas em {output} ({output.stat().st_size / 1024 ** 2:.1f} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+"""
+Este script executa o pipeline de ingestão em modo watch: um processo de longa
+duração que observa o diretório de entrada e ingere cada arquivo poucos
+segundos depois de ele chegar, sem esperar uma execução manual.
+
+O processo é mantido "quente" entre os arquivos: as bibliotecas (pandas,
+pyarrow) já estão importadas, os templates compilados, o esquema das tabelas
+em cache nos ingestores e as conexões abertas em um pool.
+
+A chegada de arquivos é detectada com inotify (pacote `inotify_simple`). Sem
+inotify (ex: macOS ou o pacote não instalado), o diretório é varrido
+periodicamente. Em ambos os casos, um arquivo só é processado depois de ficar
+`ETL_WATCH_DEBOUNCE_SECONDS` sem mudar de tamanho nem de data de modificação,
+para não ler arquivos ainda sendo copiados.
+
+Com `ETL_METRICS_PORT`, as métricas do processo (ver `python.utils.metrics`)
+são servidas em `http://<host>:<porta>/metrics`.
+"""
+import fnmatch
+import signal
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Adiciona o diretório raiz do projeto ao path do sistema para permitir
+# importações de outros módulos do projeto.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from python.core.archive import close_archive_store
+from python.core.base_ingestor import INPUT_DIR
+from python.scripts.run_pipeline import INGESTOR_MAPPING, INPUT_PATTERNS, run_pipeline
+from python.utils.config import get_etl_config
+from python.utils.metrics import start_http_server
+from python.utils.db_connection import (acquire_connection, close_connection_pool,
+                                        init_connection_pool, release_connection)
+
+# Arquivos temporários de cópia ou download, nunca processados
+IGNORED_SUFFIXES = ('.part', '.tmp', '.crdownload', '.swp')
+
+# Intervalo máximo de espera por eventos, para atender a sinais de parada
+_WAIT_SECONDS = 1.0
+
+
+class InputWatcher:
+    """
+    Observa o diretório de entrada e informa os arquivos prontos para ingestão.
+    """
+
+    def __init__(self, input_dir: Path, debounce_seconds: float, poll_seconds: float):
+        """
+        Inicializa o observador.
+
+        Args:
+            input_dir (Path): O diretório de entrada.
+            debounce_seconds (float): Tempo sem alterações para um arquivo ser
+                                      considerado completo.
+            poll_seconds (float): Intervalo entre varreduras do diretório
+                                  quando o inotify não está disponível.
+        """
+        self.input_dir = Path(input_dir)
+        self.debounce_seconds = debounce_seconds
+        self.poll_seconds = poll_seconds
+        # arquivo -> ((tamanho, mtime_ns), instante da última alteração)
+        self._pending = {}
+        # arquivo -> (tamanho, mtime_ns) já entregue (ex: ignorado por nenhum ingestor)
+        self._delivered = {}
+        self._inotify = self._open_inotify()
+
+    def _open_inotify(self):
+        """Abre um watch inotify no diretório, ou retorna `None` se indisponível."""
+        try:
+            from inotify_simple import INotify, flags
+        except ImportError:
+            print("⚠️  inotify_simple não instalado. O diretório de entrada será varrido "
+                  f"a cada {self.poll_seconds:g}s.")
+            return None
+        try:
+            inotify = INotify()
+            inotify.add_watch(self.input_dir, flags.CLOSE_WRITE | flags.MOVED_TO
+                              | flags.CREATE | flags.MODIFY)
+        except OSError as e:
+            print(f"⚠️  inotify indisponível ({e}). O diretório de entrada será varrido "
+                  f"a cada {self.poll_seconds:g}s.")
+            return None
+        return inotify
+
+    @property
+    def mode(self) -> str:
+        """Forma de detecção em uso ('inotify' ou 'varredura')."""
+        return 'inotify' if self._inotify is not None else 'varredura'
+
+    def _wait(self, timeout: float) -> None:
+        """Aguarda eventos no diretório (ou apenas o tempo limite, sem inotify)."""
+        if self._inotify is None:
+            time.sleep(timeout)
+        else:
+            self._inotify.read(timeout=int(timeout * 1000))
+
+    def _scan(self) -> None:
+        """Atualiza a assinatura (tamanho, mtime) dos arquivos do diretório."""
+        now = time.monotonic()
+        present = set()
+        for entry in self.input_dir.iterdir():
+            name = entry.name
+            if (name.startswith('.') or name.lower().endswith(IGNORED_SUFFIXES)
+                    or not any(fnmatch.fnmatch(name.lower(), pattern) for pattern in INPUT_PATTERNS)):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            if not entry.is_file():
+                continue
+            signature = (stat.st_size, stat.st_mtime_ns)
+            present.add(entry)
+            if self._delivered.get(entry) == signature:
+                continue
+            previous = self._pending.get(entry)
+            if previous is None or previous[0] != signature:
+                self._pending[entry] = (signature, now)
+
+        for path in list(self._pending):
+            if path not in present:
+                del self._pending[path]
+        for path in list(self._delivered):
+            if path not in present:
+                del self._delivered[path]
+
+    def next_batch(self, stop: threading.Event) -> list:
+        """
+        Aguarda até haver arquivos completos (ou até `stop` ser sinalizado).
+
+        Returns:
+            list: Os arquivos prontos, em ordem de nome. Cada versão de um
+                  arquivo é entregue uma única vez.
+        """
+        last_scan = 0.0
+        while not stop.is_set():
+            self._scan()
+            last_scan = time.monotonic()
+
+            ready = [path for path, (_, changed) in self._pending.items()
+                     if last_scan - changed >= self.debounce_seconds]
+            if ready:
+                for path in ready:
+                    self._delivered[path] = self._pending.pop(path)[0]
+                return sorted(ready)
+
+            if self._pending:
+                oldest = min(changed for _, changed in self._pending.values())
+                timeout = self.debounce_seconds - (last_scan - oldest)
+            else:
+                timeout = self.poll_seconds if self._inotify is None else _WAIT_SECONDS
+            self._wait(max(0.05, min(timeout, _WAIT_SECONDS)))
+        return []
+
+    def close(self) -> None:
+        """Fecha o watch inotify."""
+        if self._inotify is not None:
+            self._inotify.close()
+
+
+def warm_up(ingestors: dict) -> None:
+    """
+    Importa as bibliotecas pesadas e carrega esquemas e templates de todos os
+    ingestores usando o pool.
+
+    Os módulos importam pandas e pyarrow só no primeiro uso; sem a importação
+    aqui, o primeiro arquivo recebido pagaria esse custo.
+    """
+    import pandas
+    import python.core.data_cleaner
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        pass  # pyarrow é opcional (Parquet/Arrow, cache de conversão e quarentena)
+
+    conn = acquire_connection()
+    try:
+        for ingestor in ingestors.values():
+            ingestor.warm_up(conn)
+    finally:
+        release_connection(conn)
+
+
+def watch():
+    """
+    Executa o modo watch até receber SIGINT ou SIGTERM.
+
+    A cada conjunto de arquivos completos, o pipeline é executado apenas para
+    esses arquivos, reaproveitando as instâncias de ingestor e o pool de
+    conexões. Uma falha em um ciclo é impressa e o processo continua.
+    """
+    etl_config = get_etl_config()
+    stop = threading.Event()
+
+    def request_stop(signum, frame):
+        print(f"\n🛑 Sinal {signal.Signals(signum).name} recebido. Encerrando após o ciclo atual...")
+        stop.set()
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    print("="*60)
+    print("👀 PIPELINE DE INGESTÃO BRONZE - MODO WATCH")
+    print("="*60)
+
+    start = time.time()
+    init_connection_pool()
+    ingestors = {ingestor_class: ingestor_class() for ingestor_class in INGESTOR_MAPPING.values()}
+    warm_up(ingestors)
+    watcher = InputWatcher(INPUT_DIR, etl_config.watch_debounce_seconds, etl_config.watch_poll_seconds)
+    print(f"✓ Processo pronto em {time.time() - start:.2f}s "
+          f"(detecção: {watcher.mode}, debounce: {etl_config.watch_debounce_seconds:g}s)")
+    print(f"📂 Observando: {INPUT_DIR}")
+    metrics_server = None
+    if etl_config.metrics_port:
+        metrics_server = start_http_server(etl_config.metrics_port)
+        print(f"📈 Métricas em http://0.0.0.0:{etl_config.metrics_port}/metrics")
+
+    try:
+        while not stop.is_set():
+            files = watcher.next_batch(stop)
+            if not files:
+                continue
+            print(f"\n📥 Arquivos recebidos: {', '.join(path.name for path in files)}")
+            try:
+                run_pipeline(files=files, ingestors=ingestors)
+            except Exception as e:
+                print(f"❌ Falha no ciclo do pipeline: {e}")
+    finally:
+        watcher.close()
+        close_connection_pool()
+        close_archive_store()
+        if metrics_server is not None:
+            metrics_server.shutdown()
+    print("✅ Modo watch encerrado.")
+
+
+if __name__ == "__main__":
+    # Ponto de entrada para a execução do script
+    watch()
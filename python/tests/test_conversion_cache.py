@@ -0,0 +1,89 @@
+"""
+Testes do cache de conversão de planilhas (`python.core.conversion_cache`).
+"""
+import itertools
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Adiciona o diretório raiz do projeto ao path do sistema para permitir
+# importações de outros módulos do projeto.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from python.core.conversion_cache import ConversionCache
+
+pytest.importorskip('pyarrow')
+
+
+def _planilha(columns, lotes=3, linhas=2):
+    """Simula a leitura de uma planilha, registrando os lotes já lidos."""
+    lidos = []
+
+    def produce():
+        for i in range(lotes):
+            lidos.append(i)
+            batch = pd.DataFrame([['a', None]] * linhas, columns=columns, dtype=object)
+            batch.index = pd.RangeIndex(i * linhas, (i + 1) * linhas)
+            yield batch
+
+    return produce, lidos
+
+
+def test_cache_miss_repassa_lotes_antes_de_converter(tmp_path):
+    cache = ConversionCache(tmp_path, 10 ** 9)
+    produce, lidos = _planilha(['cargo', 'nivel'])
+
+    batches = cache.batches('abc', produce, 2)
+    next(batches)
+
+    # O primeiro lote sai sem esperar a conversão da planilha inteira
+    assert lidos == [0]
+    assert not cache.path_for('abc').exists()
+    list(batches)
+    assert cache.path_for('abc').exists()
+
+    relidos = list(cache.batches('abc', _planilha(['cargo', 'nivel'])[0], 2))
+    assert [len(batch) for batch in relidos] == [2, 2, 2]
+    assert list(relidos[-1].index) == [4, 5]
+    assert relidos[0].loc[0, 'nivel'] is None
+
+
+def test_cabecalho_repetido_usa_leitura_direta(tmp_path):
+    cache = ConversionCache(tmp_path, 10 ** 9)
+    produce, _ = _planilha(['cargo', 'cargo'])
+
+    batches = list(cache.batches('abc', produce, 2))
+
+    assert [len(batch) for batch in batches] == [2, 2, 2]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_carga_interrompida_conclui_conversao(tmp_path):
+    """Uma carga que para no meio (ex: falha no banco) deixa a conversão pronta para a próxima tentativa."""
+    cache = ConversionCache(tmp_path, 10 ** 9)
+    produce, lidos = _planilha(['cargo', 'nivel'])
+
+    batches = cache.batches('abc', produce, 2)
+    next(batches)
+    batches.close()
+
+    assert lidos == [0, 1, 2]
+    assert cache.path_for('abc').exists()
+    relidos = list(cache.batches('abc', _planilha(['cargo', 'nivel'])[0], 2))
+    assert [len(batch) for batch in relidos] == [2, 2, 2]
+
+
+def test_falha_na_leitura_descarta_conversao(tmp_path):
+    cache = ConversionCache(tmp_path, 10 ** 9)
+    produce, _ = _planilha(['cargo', 'nivel'])
+
+    def produce_com_falha():
+        yield from itertools.islice(produce(), 2)
+        raise ValueError("planilha corrompida")
+
+    with pytest.raises(ValueError):
+        list(cache.batches('abc', produce_com_falha, 2))
+
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,35 @@
+"""
+Testes da leitura de cabeçalhos e lotes de CSV (`python.core.readers`).
+"""
+import io
+import sys
+from pathlib import Path
+
+# Adiciona o diretório raiz do projeto ao path do sistema para permitir
+# importações de outros módulos do projeto.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from python.core.readers import iter_batches, read_header
+
+
+def test_csv_header_com_bom_utf8():
+    """O BOM de CSVs exportados pelo Excel não faz parte do nome da primeira coluna."""
+    stream = io.BytesIO('﻿cargo;status_vendedor\nVendedor;Ativo\n'.encode('utf-8'))
+
+    header = read_header(stream, '.csv')
+
+    assert header.columns == ['cargo', 'status_vendedor']
+    assert header.sep == ';'
+    stream.seek(0)
+    batch = next(iter_batches(stream, '.csv', header, 10))
+    assert list(batch.columns) == ['cargo', 'status_vendedor']
+    assert batch.loc[0, 'cargo'] == 'Vendedor'
+
+
+def test_csv_header_sem_bom():
+    stream = io.BytesIO(b'cargo,nivel\nVendedor,1\n')
+
+    header = read_header(stream, '.csv')
+
+    assert header.columns == ['cargo', 'nivel']
+    assert header.encoding == 'utf-8'
@@ -0,0 +1,31 @@
+"""
+Testes das regras de validação por coluna (`python.core.rules`).
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Adiciona o diretório raiz do projeto ao path do sistema para permitir
+# importações de outros módulos do projeto.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from python.core.rules import Domain
+
+
+def test_domain_normaliza_espacos_e_maiusculas():
+    values = pd.Series(['Ativo', ' INATIVO ', 'Suspenso', None, ''], dtype=object)
+
+    failed = Domain(['Ativo', 'Inativo']).check(values)
+
+    assert failed.tolist() == [False, False, True, False, False]
+
+
+def test_domain_em_coluna_numerica_tipada():
+    """Parquet/Arrow IPC: inteiros com células vazias chegam como float (1.0)."""
+    values = pd.Series([1.0, 2.0, 5.0, np.nan, 1.5])
+
+    failed = Domain(['1', '2']).check(values)
+
+    assert failed.tolist() == [False, False, True, False, True]
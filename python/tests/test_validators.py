@@ -0,0 +1,103 @@
+"""
+Testes da validação vetorizada de CPF/CNPJ (`validators.mascara_cnpj_cpf_invalidos`).
+"""
+import random
+import re
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Adiciona o diretório raiz do projeto ao path do sistema para permitir
+# importações de outros módulos do projeto.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from python.utils.validators import mascara_cnpj_cpf_invalidos, validar_cnpj_cpf
+
+
+def _digito(numeros, pesos):
+    resto = sum(int(n) * p for n, p in zip(numeros, pesos)) % 11
+    return '0' if resto < 2 else str(11 - resto)
+
+
+def _cpf(rng):
+    base = ''.join(rng.choice('0123456789') for _ in range(9))
+    base += _digito(base, range(10, 1, -1))
+    return base + _digito(base, range(11, 1, -1))
+
+
+def _cnpj(rng):
+    base = ''.join(rng.choice('0123456789') for _ in range(12))
+    base += _digito(base, [5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2])
+    return base + _digito(base, [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2])
+
+
+def test_cnpj_sem_zeros_a_esquerda():
+    """CNPJs que perderam os zeros iniciais em uma planilha continuam válidos."""
+    values = pd.Series(['2251927000120', '02251927000120', '02.251.927/0001-20', 2251927000120],
+                       dtype=object)
+
+    assert not mascara_cnpj_cpf_invalidos(values).any()
+
+
+def test_valores_formatados():
+    values = pd.Series(['529.982.247-25', '529 982 247 25', '11.222.333/0001-81', '529.982.247-26'])
+
+    assert mascara_cnpj_cpf_invalidos(values).tolist() == [False, False, False, True]
+
+
+def test_todos_os_digitos_iguais():
+    values = pd.Series(['11111111111', '111.111.111-11', '00000000000', '99999999999999'])
+
+    assert mascara_cnpj_cpf_invalidos(values).all()
+
+
+def test_valores_curtos_e_vazios():
+    """Menos de 11 dígitos é inválido; células vazias ficam para a checagem de obrigatórios."""
+    values = pd.Series(['0', '123', '1234567890', None, '', '   '], dtype=object)
+
+    assert mascara_cnpj_cpf_invalidos(values).tolist() == [True, True, True, False, False, False]
+
+
+def test_colunas_numericas_tipadas():
+    """Parquet/Arrow IPC: o número do CNPJ/CPF, inclusive como float com células vazias."""
+    inteiros = pd.Series([2251927000120, 52998224725, 52998224726], dtype='int64')
+    floats = pd.Series([2251927000120.0, np.nan, 52998224726.0])
+
+    assert mascara_cnpj_cpf_invalidos(inteiros).tolist() == [False, False, True]
+    assert mascara_cnpj_cpf_invalidos(floats).tolist() == [False, False, True]
+
+
+def test_mesmo_resultado_da_validacao_por_valor():
+    """
+    Compara com `validar_cnpj_cpf`. A única diferença esperada: a máscara
+    completa valores de 12 ou 13 dígitos com zeros à esquerda (CNPJ).
+    """
+    rng = random.Random(42)
+    values = []
+    for _ in range(2000):
+        kind = rng.randrange(5)
+        if kind == 0:
+            value = _cpf(rng)
+        elif kind == 1:
+            value = _cnpj(rng)
+        elif kind == 2:
+            value = _cnpj(rng).lstrip('0') or '0'
+        else:
+            value = ''.join(rng.choice('0123456789') for _ in range(rng.randint(1, 15)))
+        if rng.random() < 0.3:
+            # Um dígito trocado
+            position = rng.randrange(len(value))
+            value = value[:position] + rng.choice('0123456789') + value[position + 1:]
+        if rng.random() < 0.3 and len(value) == 11:
+            value = f"{value[:3]}.{value[3:6]}.{value[6:9]}-{value[9:]}"
+        values.append(value)
+
+    mask = mascara_cnpj_cpf_invalidos(pd.Series(values))
+
+    for value, invalid in zip(values, mask):
+        digits = re.sub(r'[^0-9]', '', value)
+        if len(digits) in (12, 13):
+            digits = digits.zfill(14)
+        assert invalid == (not validar_cnpj_cpf(digits)[0]), value
@@ -7,6 +7,7 @@ o fim, o status e as métricas de cada execução.
 from datetime import datetime
 from typing import Optional, List, Dict
 from contextlib import contextmanager
+from dataclasses import dataclass
 from uuid import uuid4
 import os
 import getpass
@@ -78,7 +79,7 @@ def finalizar_execucao(conn, execucao_id: str, status: str,
     Args:
         conn: A conexão com o banco de dados.
         execucao_id (str): O ID da execução a ser finalizada.
-        status (str): O status final ('sucesso' ou 'erro').
+        status (str): O status final ('sucesso', 'erro' ou 'abortado').
         linhas_processadas (int): Total de linhas lidas da origem.
         linhas_inseridas (int): Total de linhas inseridas no destino.
         linhas_atualizadas (int): Total de linhas atualizadas no destino.
@@ -135,3 +136,241 @@ def auditar_execucao(conn, script_nome: str, camada: str, tabela_destino: str =
     except Exception as e:
         finalizar_execucao(conn, execucao_id, 'erro', mensagem_erro=str(e), **stats)
         raise
+
+
+CHECKPOINT_DDL = """
+    CREATE TABLE IF NOT EXISTS auditoria.checkpoint_ingestao (
+        execucao_fk uuid PRIMARY KEY REFERENCES auditoria.historico_execucao (id),
+        byte_offset bigint,
+        numero_linha bigint NOT NULL,
+        linhas_inseridas bigint NOT NULL,
+        linhas_log bigint NOT NULL,
+        data_atualizacao timestamp NOT NULL DEFAULT now()
+    );
+"""
+
+# Chave do advisory lock que serializa a criação da tabela de checkpoints
+_CHECKPOINT_DDL_LOCK_KEY = 0x636b_7074_5f69_6e67  # 'ckpt_ing'
+
+
+@dataclass
+class Checkpoint:
+    """
+    O último trecho confirmado da carga de um arquivo.
+
+    Attributes:
+        execucao_id (str): A execução (`historico_execucao`) a que pertence.
+        byte_offset (int, optional): Posição, no conteúdo descompactado do
+                                     arquivo, da primeira linha ainda não
+                                     confirmada (apenas CSV).
+        numero_linha (int): Linhas de dados já lidas e confirmadas.
+        linhas_inseridas (int): Linhas já inseridas no destino.
+        linhas_log (int): Entradas já gravadas em `log_rejeicao`.
+    """
+    execucao_id: str
+    byte_offset: Optional[int]
+    numero_linha: int
+    linhas_inseridas: int
+    linhas_log: int
+
+
+def criar_tabela_checkpoint(conn) -> None:
+    """
+    Cria a tabela `auditoria.checkpoint_ingestao`, se ainda não existir.
+
+    Processos iniciados ao mesmo tempo são serializados por um advisory lock
+    de transação (o `CREATE ... IF NOT EXISTS` concorrente falha no catálogo).
+    """
+    with get_cursor(conn) as cur:
+        cur.execute("SELECT pg_advisory_xact_lock(%s)", (_CHECKPOINT_DDL_LOCK_KEY,))
+        cur.execute(CHECKPOINT_DDL)
+    conn.commit()
+
+
+def salvar_checkpoint(conn, checkpoint: Checkpoint) -> None:
+    """
+    Grava (ou atualiza) o checkpoint de uma execução.
+
+    Não confirma a transação: o checkpoint deve ser confirmado no mesmo
+    `commit` dos dados que ele descreve.
+    """
+    query = """
+        INSERT INTO auditoria.checkpoint_ingestao
+        (execucao_fk, byte_offset, numero_linha, linhas_inseridas, linhas_log, data_atualizacao)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        ON CONFLICT (execucao_fk) DO UPDATE
+        SET byte_offset = EXCLUDED.byte_offset, numero_linha = EXCLUDED.numero_linha,
+            linhas_inseridas = EXCLUDED.linhas_inseridas, linhas_log = EXCLUDED.linhas_log,
+            data_atualizacao = EXCLUDED.data_atualizacao
+    """
+    with get_cursor(conn) as cur:
+        cur.execute(query, (checkpoint.execucao_id, checkpoint.byte_offset, checkpoint.numero_linha,
+                            checkpoint.linhas_inseridas, checkpoint.linhas_log, datetime.now()))
+
+
+def buscar_checkpoint(conn, file_hash: str, tabela_origem: str,
+                      tabela_destino: str) -> Optional[Checkpoint]:
+    """
+    Busca o checkpoint da última execução interrompida de um arquivo.
+
+    Só é considerada a execução mais recente do arquivo (mesmo hash, origem e
+    destino), e apenas se ela terminou com 'erro' ou ficou 'em_execucao' (o
+    processo caiu antes de registrar o erro).
+
+    Uma execução 'em_execucao' interrompida antes do primeiro checkpoint não
+    tem o que retomar: ela é finalizada como 'erro', e a próxima carga começa
+    uma nova execução. A busca roda com o lock do hash do arquivo, então não
+    há outra carga do mesmo arquivo em andamento.
+
+    Returns:
+        Checkpoint: O checkpoint a retomar, ou `None` se não houver.
+    """
+    query = """
+        SELECT h.id, h.status, c.byte_offset, c.numero_linha, c.linhas_inseridas, c.linhas_log
+        FROM auditoria.historico_execucao h
+        LEFT JOIN auditoria.checkpoint_ingestao c ON c.execucao_fk = h.id
+        WHERE h.file_hash = %s AND h.tabela_origem = %s AND h.tabela_destino = %s
+        ORDER BY h.data_inicio DESC
+        LIMIT 1
+    """
+    with get_cursor(conn) as cur:
+        cur.execute(query, (file_hash, tabela_origem, tabela_destino))
+        row = cur.fetchone()
+        if row is not None and row[1] == 'em_execucao' and row[3] is None:
+            cur.execute("""
+                UPDATE auditoria.historico_execucao
+                SET status = 'erro', data_fim = %s,
+                    mensagem_erro = 'Execução interrompida antes do primeiro checkpoint'
+                WHERE id = %s AND status = 'em_execucao'
+            """, (datetime.now(), row[0]))
+    conn.commit()
+    if row is None or row[1] not in ('erro', 'em_execucao') or row[3] is None:
+        return None
+    return Checkpoint(str(row[0]), row[2], row[3], row[4], row[5])
+
+
+def retomar_execucao(conn, execucao_id: str) -> None:
+    """Marca uma execução interrompida como 'em_execucao' novamente, para ser retomada."""
+    query = """
+        UPDATE auditoria.historico_execucao
+        SET status = 'em_execucao', data_fim = NULL, mensagem_erro = NULL
+        WHERE id = %s
+    """
+    with get_cursor(conn) as cur:
+        cur.execute(query, (execucao_id,))
+        conn.commit()
+
+
+METRICAS_DDL = """
+    CREATE TABLE IF NOT EXISTS auditoria.metrica_etapa (
+        execucao_fk uuid NOT NULL REFERENCES auditoria.historico_execucao (id),
+        etapa varchar(50) NOT NULL,
+        duracao_segundos double precision NOT NULL,
+        linhas bigint NOT NULL,
+        bytes bigint NOT NULL,
+        chamadas integer NOT NULL,
+        linhas_por_segundo double precision,
+        bytes_por_segundo double precision,
+        data_registro timestamp NOT NULL DEFAULT now(),
+        PRIMARY KEY (execucao_fk, etapa)
+    );
+"""
+
+# Chave do advisory lock que serializa a criação da tabela de métricas
+_METRICAS_DDL_LOCK_KEY = 0x6d65_7472_5f65_7461  # 'metr_eta'
+
+
+def criar_tabela_metricas(conn) -> None:
+    """
+    Cria a tabela `auditoria.metrica_etapa`, se ainda não existir (serializada
+    por um advisory lock de transação, como `criar_tabela_checkpoint`).
+    """
+    with get_cursor(conn) as cur:
+        cur.execute("SELECT pg_advisory_xact_lock(%s)", (_METRICAS_DDL_LOCK_KEY,))
+        cur.execute(METRICAS_DDL)
+    conn.commit()
+
+
+def registrar_metricas(conn, execucao_id: str, metricas: List[tuple]) -> None:
+    """
+    Grava (ou atualiza) as métricas por etapa de uma execução e confirma a transação.
+
+    Args:
+        conn: Conexão com o banco de dados.
+        execucao_id (str): A execução (`historico_execucao`) medida.
+        metricas (list): Tuplas `(etapa, duracao_segundos, linhas, bytes,
+                         chamadas, linhas_por_segundo, bytes_por_segundo)`.
+    """
+    if not metricas:
+        return
+    query = """
+        INSERT INTO auditoria.metrica_etapa
+        (execucao_fk, etapa, duracao_segundos, linhas, bytes, chamadas,
+         linhas_por_segundo, bytes_por_segundo, data_registro)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+        ON CONFLICT (execucao_fk, etapa) DO UPDATE
+        SET duracao_segundos = EXCLUDED.duracao_segundos, linhas = EXCLUDED.linhas,
+            bytes = EXCLUDED.bytes, chamadas = EXCLUDED.chamadas,
+            linhas_por_segundo = EXCLUDED.linhas_por_segundo,
+            bytes_por_segundo = EXCLUDED.bytes_por_segundo,
+            data_registro = EXCLUDED.data_registro
+    """
+    now = datetime.now()
+    with get_cursor(conn) as cur:
+        cur.executemany(query, [(execucao_id,) + tuple(row) + (now,) for row in metricas])
+    conn.commit()
+
+
+RESUMO_REJEICAO_DDL = """
+    CREATE TABLE IF NOT EXISTS auditoria.resumo_rejeicao (
+        execucao_fk uuid NOT NULL REFERENCES auditoria.historico_execucao (id),
+        severidade varchar(10) NOT NULL,
+        campo_falha text NOT NULL,
+        motivo_rejeicao text NOT NULL,
+        quantidade bigint NOT NULL,
+        data_registro timestamp NOT NULL DEFAULT now(),
+        PRIMARY KEY (execucao_fk, severidade, campo_falha, motivo_rejeicao)
+    );
+"""
+
+# Chave do advisory lock que serializa a criação da tabela de resumo de rejeições
+_RESUMO_DDL_LOCK_KEY = 0x7265_736d_5f72_656a  # 'resm_rej'
+
+
+def criar_tabela_resumo_rejeicao(conn) -> None:
+    """
+    Cria a tabela `auditoria.resumo_rejeicao`, se ainda não existir (serializada
+    por um advisory lock de transação, como `criar_tabela_checkpoint`).
+    """
+    with get_cursor(conn) as cur:
+        cur.execute("SELECT pg_advisory_xact_lock(%s)", (_RESUMO_DDL_LOCK_KEY,))
+        cur.execute(RESUMO_REJEICAO_DDL)
+    conn.commit()
+
+
+def registrar_resumo_rejeicao(conn, execucao_id: str, contagens: Dict[tuple, int]) -> None:
+    """
+    Soma contagens de rejeições e avisos ao resumo de uma execução.
+
+    Não confirma a transação: as contagens devem ser confirmadas no mesmo
+    `commit` das linhas que elas descrevem.
+
+    Args:
+        conn: Conexão com o banco de dados.
+        execucao_id (str): A execução (`historico_execucao`).
+        contagens (dict): `{(severidade, campo_falha, motivo_rejeicao): quantidade}`.
+    """
+    if not contagens:
+        return
+    query = """
+        INSERT INTO auditoria.resumo_rejeicao
+        (execucao_fk, severidade, campo_falha, motivo_rejeicao, quantidade, data_registro)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        ON CONFLICT (execucao_fk, severidade, campo_falha, motivo_rejeicao) DO UPDATE
+        SET quantidade = auditoria.resumo_rejeicao.quantidade + EXCLUDED.quantidade,
+            data_registro = EXCLUDED.data_registro
+    """
+    now = datetime.now()
+    with get_cursor(conn) as cur:
+        cur.executemany(query, [(execucao_id, severidade, campo, motivo, quantidade, now)
+                                for (severidade, campo, motivo), quantidade in contagens.items()])
@@ -118,6 +118,27 @@ class PathsConfig:
         )
 
 
+# Modos do log de rejeições (`ETL_REJECTION_LOG_MODE`)
+REJECTION_LOG_MODES = ('full', 'compact', 'quarantine')
+# Destinos dos arquivos processados (`ETL_ARCHIVE_MODE`)
+ARCHIVE_MODES = ('move', 'store')
+
+
+def _choice(var: str, default: str, options) -> str:
+    """
+    Lê uma variável de ambiente que aceita um conjunto fixo de valores.
+
+    Lança um `ValueError` para valores desconhecidos, em vez de cair no
+    comportamento padrão sem aviso (ex: 'compat' no lugar de 'compact').
+    """
+    value = os.getenv(var, default).strip().lower()
+    if value not in options:
+        raise ValueError(
+            f"❌ Valor inválido para {var}: '{value}'. Opções: {', '.join(options)}"
+        )
+    return value
+
+
 @dataclass
 class ETLConfig:
     """
@@ -128,6 +149,26 @@ class ETLConfig:
     batch_insert_size: int = 1000
     enable_profiling: bool = False
     parallel_ingestors: int = 1
+    template_cache_file: Optional[str] = None
+    spreadsheet_backend: str = 'auto'
+    conversion_cache_dir: Optional[str] = 'docker/data/cache/conversions'
+    conversion_cache_max_mb: int = 2048
+    sheet_workers: int = 4
+    pipeline_depth: int = 2
+    watch_debounce_seconds: float = 2.0
+    watch_poll_seconds: float = 5.0
+    job_queue: bool = False
+    queue_workers: int = 1
+    checkpoint_rows: int = 0
+    metrics_textfile: Optional[str] = None
+    metrics_port: int = 0
+    rejection_log_mode: str = 'full'
+    rejection_sample_size: int = 0
+    rejection_log_rate: float = 0.0
+    abort_failure_rate: float = 0.0
+    abort_min_rows: int = 10000
+    archive_mode: str = 'move'
+    archive_zstd_level: int = 10
 
     @classmethod
     def from_env(cls) -> 'ETLConfig':
@@ -137,7 +178,27 @@ class ETLConfig:
             retry_delay_seconds=int(os.getenv('ETL_RETRY_DELAY', 5)),
             batch_insert_size=int(os.getenv('ETL_BATCH_SIZE', 1000)),
             enable_profiling=os.getenv('ETL_PROFILING', 'false').lower() == 'true',
-            parallel_ingestors=int(os.getenv('ETL_PARALLEL_INGESTORS', 1))
+            parallel_ingestors=int(os.getenv('ETL_PARALLEL_INGESTORS', 1)),
+            template_cache_file=os.getenv('ETL_TEMPLATE_CACHE') or None,
+            spreadsheet_backend=os.getenv('ETL_SPREADSHEET_BACKEND', 'auto').lower(),
+            conversion_cache_dir=os.getenv('ETL_CONVERSION_CACHE_DIR', 'docker/data/cache/conversions') or None,
+            conversion_cache_max_mb=int(os.getenv('ETL_CONVERSION_CACHE_MAX_MB', 2048)),
+            sheet_workers=int(os.getenv('ETL_SHEET_WORKERS', 4)),
+            pipeline_depth=int(os.getenv('ETL_PIPELINE_DEPTH', 2)),
+            watch_debounce_seconds=float(os.getenv('ETL_WATCH_DEBOUNCE_SECONDS', 2.0)),
+            watch_poll_seconds=float(os.getenv('ETL_WATCH_POLL_SECONDS', 5.0)),
+            job_queue=os.getenv('ETL_JOB_QUEUE', 'false').lower() == 'true',
+            queue_workers=int(os.getenv('ETL_QUEUE_WORKERS', 1)),
+            checkpoint_rows=int(os.getenv('ETL_CHECKPOINT_ROWS', 0)),
+            metrics_textfile=os.getenv('ETL_METRICS_TEXTFILE') or None,
+            metrics_port=int(os.getenv('ETL_METRICS_PORT', 0)),
+            rejection_log_mode=_choice('ETL_REJECTION_LOG_MODE', 'full', REJECTION_LOG_MODES),
+            rejection_sample_size=int(os.getenv('ETL_REJECTION_SAMPLE_SIZE', 0)),
+            rejection_log_rate=float(os.getenv('ETL_REJECTION_LOG_RATE', 0)),
+            abort_failure_rate=float(os.getenv('ETL_ABORT_FAILURE_RATE', 0)),
+            abort_min_rows=int(os.getenv('ETL_ABORT_MIN_ROWS', 10000)),
+            archive_mode=_choice('ETL_ARCHIVE_MODE', 'move', ARCHIVE_MODES),
+            archive_zstd_level=int(os.getenv('ETL_ARCHIVE_ZSTD_LEVEL', 10))
         )
 
 
@@ -192,3 +253,7 @@ def get_db_config() -> DatabaseConfig:
 def get_paths_config() -> PathsConfig:
     """Retorna apenas a configuração de caminhos."""
     return get_config().paths
+
+def get_etl_config() -> ETLConfig:
+    """Retorna apenas a configuração do comportamento do ETL."""
+    return get_config().etl
@@ -7,24 +7,43 @@ e liberar conexões e cursores de forma segura e eficiente.
 Principais características:
 - Conexão robusta com tentativas automáticas (`retry`) em caso de falha.
 - Gerenciadores de contexto que garantem o fechamento de conexões e cursores.
+- Pool opcional de conexões para processos de longa duração (ex: o modo watch).
 - Suporte para cursores que retornam dicionários (`RealDictCursor`).
 - Configuração centralizada através do módulo `config`.
+
+O `psycopg2` e o `tenacity` são importados apenas na primeira conexão: scripts
+que terminam antes de acessar o banco (ex: diretório de entrada vazio) não
+pagam pela importação.
 """
 
 import os
-import psycopg2
-from psycopg2.extras import RealDictCursor
+import threading
+import time
 from typing import Generator
 from contextlib import contextmanager
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
 from .config import get_db_config
+from .metrics import CONNECTION_WAIT
+
+# Pool de conexões do processo, criado por `init_connection_pool`
+_pool = None
+_pool_lock = threading.Lock()
+# Conexões abertas fora do pool porque ele estava esgotado
+_overflow = set()
+
+def _connect_kwargs() -> dict:
+    """Parâmetros de conexão obtidos da configuração do banco."""
+    db_config = get_db_config()
+    return dict(
+        host=db_config.host,
+        port=db_config.port,
+        database=db_config.database,
+        user=db_config.user,
+        password=db_config.password,
+        connect_timeout=db_config.connect_timeout,
+        sslmode=os.getenv('DB_SSLMODE', 'require')
+    )
 
-@retry(
-    stop=stop_after_attempt(3),  # Tenta no máximo 3 vezes
-    wait=wait_exponential(multiplier=1, min=2, max=10),  # Espera exponencial entre tentativas
-    retry=retry_if_exception_type(psycopg2.OperationalError)  # Só tenta novamente em erros operacionais
-)
 def get_db_connection():
     """
     Cria e retorna uma nova conexão com o banco de dados PostgreSQL.
@@ -39,22 +58,105 @@ def get_db_connection():
     Raises:
         ConnectionError: Se a conexão falhar após todas as tentativas.
     """
+    import psycopg2
+    from tenacity import Retrying, stop_after_attempt, wait_exponential, retry_if_exception_type
+
+    def connect():
+        try:
+            conn = psycopg2.connect(**_connect_kwargs())
+            conn.autocommit = False  # Desabilita autocommit para controle transacional
+            return conn
+        except psycopg2.Error as e:
+            raise ConnectionError(f"Falha ao conectar ao banco de dados após várias tentativas: {e}") from e
+
+    retrying = Retrying(
+        stop=stop_after_attempt(3),  # Tenta no máximo 3 vezes
+        wait=wait_exponential(multiplier=1, min=2, max=10),  # Espera exponencial entre tentativas
+        retry=retry_if_exception_type(psycopg2.OperationalError)  # Só tenta novamente em erros operacionais
+    )
+    return retrying(connect)
+
+def init_connection_pool():
+    """
+    Cria o pool de conexões do processo (`DB_POOL_MIN_SIZE` a `DB_POOL_MAX_SIZE`
+    conexões), usado por `acquire_connection` e `release_connection`.
+
+    Indicado para processos de longa duração, que assim evitam o custo de uma
+    nova conexão (TLS e autenticação) a cada arquivo. Chamadas repetidas
+    reaproveitam o pool já criado.
+    """
+    from psycopg2.pool import ThreadedConnectionPool
+
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            db_config = get_db_config()
+            _pool = ThreadedConnectionPool(db_config.pool_min_size, db_config.pool_max_size,
+                                           **_connect_kwargs())
+        return _pool
+
+def close_connection_pool():
+    """Fecha todas as conexões do pool, se houver um."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+
+def acquire_connection():
+    """
+    Obtém uma conexão do pool, se ele tiver sido criado, ou uma nova conexão.
+
+    Conexões do pool que foram encerradas pelo servidor são descartadas e
+    substituídas. Com o pool esgotado, uma conexão avulsa é aberta. Toda
+    conexão obtida aqui deve ser devolvida com `release_connection`.
+
+    O tempo de espera vai para o histograma `credits_etl_connection_wait_seconds`.
+
+    Returns:
+        psycopg2.connection: Uma conexão ativa com o banco de dados.
+    """
+    start = time.perf_counter()
     try:
-        db_config = get_db_config()
-        sslmode = os.getenv('DB_SSLMODE', 'require')
-        conn = psycopg2.connect(
-            host=db_config.host,
-            port=db_config.port,
-            database=db_config.database,
-            user=db_config.user,
-            password=db_config.password,
-            connect_timeout=db_config.connect_timeout,
-            sslmode=sslmode
-        )
-        conn.autocommit = False  # Desabilita autocommit para controle transacional
+        return _acquire()
+    finally:
+        CONNECTION_WAIT.observe(time.perf_counter() - start)
+
+def _acquire():
+    """Obtém a conexão de `acquire_connection`, do pool ou nova."""
+    pool = _pool
+    if pool is None:
+        return get_db_connection()
+
+    import psycopg2
+    from psycopg2.pool import PoolError
+
+    try:
+        conn = pool.getconn()
+    except PoolError:
+        conn = get_db_connection()
+        _overflow.add(conn)
         return conn
-    except psycopg2.Error as e:
-        raise ConnectionError(f"Falha ao conectar ao banco de dados após várias tentativas: {e}") from e
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1")
+        conn.rollback()
+    except psycopg2.Error:
+        pool.putconn(conn, close=True)
+        conn = pool.getconn()
+    return conn
+
+def release_connection(conn):
+    """
+    Devolve ao pool uma conexão obtida com `acquire_connection` (uma transação
+    pendente é revertida), ou a fecha se não houver pool.
+    """
+    pool = _pool
+    if pool is None or conn in _overflow:
+        _overflow.discard(conn)
+        conn.close()
+    else:
+        pool.putconn(conn, close=conn.closed != 0)
 
 @contextmanager
 def get_connection() -> Generator:
@@ -111,6 +213,8 @@ def get_dict_cursor(conn) -> Generator:
     Yields:
         psycopg2.extras.RealDictCursor: Um cursor que retorna linhas como dicionários.
     """
+    from psycopg2.extras import RealDictCursor
+
     with get_cursor(conn, cursor_factory=RealDictCursor) as cursor:
         yield cursor
 
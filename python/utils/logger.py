@@ -7,9 +7,15 @@ diferentes níveis de log para o console e para os arquivos.
 
 import sys
 import os
+import threading
 from pathlib import Path
 from loguru import logger
 
+# Sinks já configurados: o do console (um por processo) e um arquivo por nome
+_console_sink = None
+_file_sinks = {}
+_setup_lock = threading.Lock()
+
 def setup_logger(name: str, log_dir: str = None, rotation: str = "100 MB", retention: str = "30 days") -> "logger":
     """
     Configura e retorna um logger Loguru para um script ou módulo específico.
@@ -19,6 +25,10 @@ def setup_logger(name: str, log_dir: str = None, rotation: str = "100 MB", reten
     - Um handler para arquivo com rotação, compressão e retenção automáticas.
     - Um formato de log padronizado e colorido para fácil leitura.
 
+    Chamadas repetidas não refazem a configuração: o console é configurado
+    uma única vez por processo e o arquivo uma vez por `name`. Cada arquivo
+    recebe apenas os registros do logger retornado para o seu `name`.
+
     Args:
         name (str): O nome do logger, geralmente o nome do script (`__name__`).
         log_dir (str, optional): Diretório para salvar os arquivos de log.
@@ -27,18 +37,9 @@ def setup_logger(name: str, log_dir: str = None, rotation: str = "100 MB", reten
         retention (str): O tempo para manter os arquivos de log antigos (ex: "30 days").
 
     Returns:
-        logger: A instância do logger Loguru configurada.
+        logger: A instância do logger Loguru configurada, vinculada a `name`.
     """
-    # Remove a configuração padrão do Loguru para evitar duplicatas
-    logger.remove()
-
-    # Determina o diretório de logs, detectando o ambiente
-    if log_dir is None:
-        log_dir = Path('/app/logs') if Path('/app').exists() else Path(__file__).parent.parent.parent / 'logs'
-    else:
-        log_dir = Path(log_dir)
-
-    log_dir.mkdir(parents=True, exist_ok=True)
+    global _console_sink
 
     # Formato de log customizado para clareza e consistência
     log_format = (
@@ -48,32 +49,50 @@ def setup_logger(name: str, log_dir: str = None, rotation: str = "100 MB", reten
         "<level>{message}</level>"
     )
 
-    # Handler para o console (saída padrão)
-    logger.add(
-        sys.stdout,
-        format=log_format,
-        level=os.getenv("LOG_LEVEL", "INFO").upper(),
-        colorize=True,
-        backtrace=True,  # Mostra o stack trace completo em exceções
-        diagnose=True    # Adiciona informações de diagnóstico em exceções
-    )
+    bound_logger = logger.bind(logger_name=name)
+    with _setup_lock:
+        if _console_sink is None:
+            # Remove a configuração padrão do Loguru para evitar duplicatas
+            logger.remove()
 
-    # Handler para o arquivo de log com rotação
-    log_file = log_dir / f"{name}.log"
-    logger.add(
-        log_file,
-        format=log_format,
-        level="DEBUG",  # Nível mais detalhado para o arquivo
-        rotation=rotation,
-        retention=retention,
-        compression="zip",  # Comprime os arquivos de log antigos
-        backtrace=True,
-        diagnose=True,
-        encoding="utf-8"
-    )
+            # Handler para o console (saída padrão)
+            _console_sink = logger.add(
+                sys.stdout,
+                format=log_format,
+                level=os.getenv("LOG_LEVEL", "INFO").upper(),
+                colorize=True,
+                backtrace=True,  # Mostra o stack trace completo em exceções
+                diagnose=True    # Adiciona informações de diagnóstico em exceções
+            )
+
+        if name in _file_sinks:
+            return bound_logger
+
+        # Determina o diretório de logs, detectando o ambiente
+        if log_dir is None:
+            log_dir = Path('/app/logs') if Path('/app').exists() else Path(__file__).parent.parent.parent / 'logs'
+        else:
+            log_dir = Path(log_dir)
+
+        log_dir.mkdir(parents=True, exist_ok=True)
+
+        # Handler para o arquivo de log com rotação
+        log_file = log_dir / f"{name}.log"
+        _file_sinks[name] = logger.add(
+            log_file,
+            format=log_format,
+            level="DEBUG",  # Nível mais detalhado para o arquivo
+            filter=lambda record: record["extra"].get("logger_name") == name,
+            rotation=rotation,
+            retention=retention,
+            compression="zip",  # Comprime os arquivos de log antigos
+            backtrace=True,
+            diagnose=True,
+            encoding="utf-8"
+        )
 
-    logger.info(f"Logger '{name}' configurado. Logs serão salvos em: {log_file}")
-    return logger
+    bound_logger.info(f"Logger '{name}' configurado. Logs serão salvos em: {log_file}")
+    return bound_logger
 
 def log_dataframe_info(df, nome: str = "DataFrame", logger_obj=None) -> None:
     """
@@ -0,0 +1,275 @@
+"""
+Este módulo, `metrics`, expõe métricas do pipeline no formato do Prometheus,
+para que a vazão e a latência do ETL sejam coletadas e alertadas como os
+demais serviços.
+
+- Execuções em lote: com `ETL_METRICS_TEXTFILE`, as métricas são gravadas ao
+  final de cada execução em um arquivo `.prom`, lido pelo "textfile
+  collector" do node_exporter.
+- Modo watch: com `ETL_METRICS_PORT`, um endpoint HTTP (`/metrics`) é servido
+  durante todo o processo, em OpenMetrics (ou no formato de texto clássico,
+  conforme o cabeçalho `Accept` do coletor).
+
+Métricas:
+- `credits_etl_files_processed_total{ingestor,status}` e
+  `credits_etl_duplicates_skipped_total{ingestor}`.
+- `credits_etl_rows_{read,inserted,warned,rejected}_total{ingestor}`.
+- `credits_etl_stage_duration_seconds{ingestor,stage}` (histograma) e
+  `credits_etl_copy_bytes_total{ingestor}`.
+- `credits_etl_connection_wait_seconds` (histograma).
+- `credits_etl_pipeline_runs_total{status}`,
+  `credits_etl_pipeline_last_duration_seconds` e
+  `credits_etl_pipeline_last_success_timestamp_seconds`.
+
+Os valores ficam em memória no processo (apenas biblioteca padrão, sem
+dependências): no arquivo `.prom` de uma execução em lote, os contadores são
+os daquela execução.
+"""
+
+import bisect
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Content-Types dos dois formatos de exposição
+OPENMETRICS_CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+TEXT_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Limites (em segundos) dos histogramas de latência
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+CONNECTION_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ''
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+class _Metric:
+    """Base das métricas: nome, descrição, rótulos e os valores por rótulo."""
+
+    type_name = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Sequence[str]) -> Tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name}: esperados os rótulos {self.labelnames}, recebidos {labels}")
+        return tuple(str(label) for label in labels)
+
+    def _samples(self) -> List[Tuple[str, Tuple[str, ...], float, Tuple[str, ...]]]:
+        raise NotImplementedError
+
+    def render(self, openmetrics: bool) -> List[str]:
+        """Linhas de exposição da métrica (`# HELP`, `# TYPE` e as amostras)."""
+        name = self.name
+        if not openmetrics and self.type_name == 'counter':
+            name += '_total'
+        lines = [f"# HELP {name} {self.documentation}", f"# TYPE {name} {self.type_name}"]
+        for suffix, labels, value, extra in self._samples():
+            names = self.labelnames + (('le',) if extra else ())
+            lines.append(f"{self.name}{suffix}{_format_labels(names, labels + extra)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """Contador monotônico (exposto como `<nome>_total`)."""
+
+    type_name = 'counter'
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        if amount < 0:
+            raise ValueError(f"{self.name}: um contador não pode diminuir")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self):
+        with self._lock:
+            return [('_total', key, value, ()) for key, value in sorted(self._values.items())]
+
+
+class Gauge(_Metric):
+    """Valor que sobe e desce (ex: duração da última execução)."""
+
+    type_name = 'gauge'
+
+    def set(self, value: float, *labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def _samples(self):
+        with self._lock:
+            return [('', key, value, ()) for key, value in sorted(self._values.items())]
+
+
+class Histogram(_Metric):
+    """Histograma cumulativo, com os limites (`le`) informados e `+Inf`."""
+
+    type_name = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = STAGE_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._values[key] = (counts, total + value)
+
+    def _samples(self):
+        samples = []
+        with self._lock:
+            for key, (counts, total) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float('inf'),), counts):
+                    cumulative += count
+                    samples.append(('_bucket', key, cumulative, (_format_value(bound),)))
+                samples.append(('_count', key, cumulative, ()))
+                samples.append(('_sum', key, total, ()))
+        return samples
+
+
+class Registry:
+    """Conjunto de métricas do processo, na ordem de registro."""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self, openmetrics: bool = False) -> str:
+        """
+        Todas as métricas no formato de exposição.
+
+        Args:
+            openmetrics (bool): OpenMetrics 1.0 (com `# EOF`) em vez do formato
+                                de texto clássico do Prometheus (0.0.4), que é
+                                o lido pelo textfile collector.
+        """
+        lines = [line for metric in self._metrics for line in metric.render(openmetrics)]
+        if openmetrics:
+            lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+FILES_PROCESSED = REGISTRY.register(Counter(
+    'credits_etl_files_processed', 'Arquivos (fontes) carregados, por ingestor e status final.',
+    ('ingestor', 'status')))
+DUPLICATES_SKIPPED = REGISTRY.register(Counter(
+    'credits_etl_duplicates_skipped', 'Arquivos ignorados por já terem sido carregados (mesmo hash).',
+    ('ingestor',)))
+ROWS_READ = REGISTRY.register(Counter(
+    'credits_etl_rows_read', 'Linhas de dados lidas dos arquivos carregados.', ('ingestor',)))
+ROWS_INSERTED = REGISTRY.register(Counter(
+    'credits_etl_rows_inserted', 'Linhas inseridas na camada bronze.', ('ingestor',)))
+ROWS_WARNED = REGISTRY.register(Counter(
+    'credits_etl_rows_warned', 'Linhas inseridas com aviso (WARN) em log_rejeicao.', ('ingestor',)))
+ROWS_REJECTED = REGISTRY.register(Counter(
+    'credits_etl_rows_rejected', 'Linhas rejeitadas (ERROR) em log_rejeicao.', ('ingestor',)))
+STAGE_DURATION = REGISTRY.register(Histogram(
+    'credits_etl_stage_duration_seconds', 'Duração de cada execução de uma etapa da carga (ex: um lote).',
+    ('ingestor', 'stage'), STAGE_BUCKETS))
+COPY_BYTES = REGISTRY.register(Counter(
+    'credits_etl_copy_bytes', 'Bytes enviados ao banco via COPY.', ('ingestor',)))
+CONNECTION_WAIT = REGISTRY.register(Histogram(
+    'credits_etl_connection_wait_seconds', 'Espera para obter uma conexão com o banco (pool ou nova).',
+    (), CONNECTION_BUCKETS))
+PIPELINE_RUNS = REGISTRY.register(Counter(
+    'credits_etl_pipeline_runs', 'Execuções do pipeline, por status.', ('status',)))
+PIPELINE_LAST_DURATION = REGISTRY.register(Gauge(
+    'credits_etl_pipeline_last_duration_seconds', 'Duração da última execução do pipeline.'))
+PIPELINE_LAST_SUCCESS = REGISTRY.register(Gauge(
+    'credits_etl_pipeline_last_success_timestamp_seconds',
+    'Instante (Unix) da última execução do pipeline concluída sem falhas.'))
+
+
+def write_textfile(path: str, registry: Registry = REGISTRY) -> None:
+    """
+    Grava as métricas para o textfile collector do node_exporter.
+
+    O arquivo é escrito em um temporário no mesmo diretório e renomeado, para
+    que o coletor nunca leia um arquivo pela metade.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(registry.render(openmetrics=False))
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: Registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        openmetrics = 'application/openmetrics-text' in self.headers.get('Accept', '')
+        body = self.registry.render(openmetrics).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', OPENMETRICS_CONTENT_TYPE if openmetrics else TEXT_CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # As coletas periódicas não vão para a saída do processo
+
+
+def start_http_server(port: int, host: str = '0.0.0.0',
+                      registry: Registry = REGISTRY) -> ThreadingHTTPServer:
+    """
+    Serve as métricas em `http://<host>:<port>/metrics`, em uma thread de fundo.
+
+    Returns:
+        ThreadingHTTPServer: O servidor (encerre com `shutdown()`).
+    """
+    handler = type('MetricsHandler', (_MetricsHandler,), {'registry': registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+    return server
+
+
+def export_textfile(textfile: Optional[str]) -> None:
+    """Grava o arquivo `.prom`, se configurado; uma falha é apenas avisada."""
+    if not textfile:
+        return
+    try:
+        write_textfile(textfile)
+    except OSError as e:
+        print(f"⚠️  Não foi possível gravar as métricas em {textfile}: {e}")
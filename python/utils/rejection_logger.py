@@ -3,6 +3,15 @@ Este módulo, `rejection_logger`, fornece uma classe para gerenciar o registro
 estruturado de dados que foram rejeitados durante o processo de ingestão na
 camada Bronze. Ele permite acumular rejeições em um buffer e salvá-las em
 lote no banco de dados para auditoria e análise posterior.
+
+O registro completo é gravado como JSON (validado pelo banco com `::jsonb`).
+No modo compacto, ele é omitido: a linha é recuperada do arquivo arquivado
+quando necessário (ver `python.core.row_resolver`).
+
+Com `ETL_REJECTION_SAMPLE_SIZE`, apenas os primeiros exemplos de cada
+(severidade, campo, motivo) vão para o buffer, e as contagens completas para
+`auditoria.resumo_rejeicao`. As linhas de log por rejeição são limitadas por
+`ETL_REJECTION_LOG_RATE` (ver `python.utils.rejection_summary`).
 """
 
 import json
@@ -12,8 +21,11 @@ from datetime import datetime
 from psycopg2 import sql
 from psycopg2.extras import execute_values
 
+from .audit import criar_tabela_resumo_rejeicao, registrar_resumo_rejeicao
+from .config import get_config
 from .db_connection import get_cursor
 from .logger import setup_logger
+from .rejection_summary import LogRateLimiter, RejectionSampler
 
 # Logger específico para este módulo
 logger = setup_logger('rejection_logger')
@@ -25,7 +37,9 @@ class RejectionLogger:
     e inserindo-os em lote na tabela `auditoria.log_rejeicao`.
     """
 
-    def __init__(self, conn, execucao_fk: str, script_nome: str, tabela_destino: str):
+    def __init__(self, conn, execucao_fk: str, script_nome: str, tabela_destino: str,
+                 compacto: bool = False, amostras: Optional[int] = None,
+                 linhas_por_segundo: Optional[float] = None):
         """
         Inicializa o logger de rejeições para uma execução específica.
 
@@ -34,12 +48,25 @@ class RejectionLogger:
             execucao_fk (str): O UUID da execução do ETL.
             script_nome (str): O nome do script que está gerando as rejeições.
             tabela_destino (str): A tabela de destino onde a inserção falhou.
+            compacto (bool): Se True, o registro completo não é gravado.
+            amostras (int, optional): Exemplos gravados por (severidade, campo,
+                                      motivo); 0 = todos. Padrão: `ETL_REJECTION_SAMPLE_SIZE`.
+            linhas_por_segundo (float, optional): Limite de linhas de log por
+                                      segundo; 0 = sem limite. Padrão: `ETL_REJECTION_LOG_RATE`.
         """
         self.conn = conn
         self.execucao_fk = execucao_fk
         self.script_nome = script_nome
         self.tabela_destino = tabela_destino
+        self.compacto = compacto
         self.rejeicoes: List[Dict] = []  # Buffer para acumular rejeições
+        etl_config = get_config().etl
+        self.amostrador = RejectionSampler(etl_config.rejection_sample_size if amostras is None else amostras)
+        self.limitador = LogRateLimiter(etl_config.rejection_log_rate if linhas_por_segundo is None
+                                        else linhas_por_segundo)
+        if self.amostrador.amostras > 0:
+            # A criação confirma a transação: feita antes de qualquer rejeição
+            criar_tabela_resumo_rejeicao(conn)
 
     def registrar_rejeicao(
         self,
@@ -61,8 +88,15 @@ class RejectionLogger:
             registro_completo (Dict, optional): O registro completo como um dicionário.
             severidade (str): A severidade da rejeição ('ERROR', 'WARNING', 'CRITICAL').
         """
-        registro_json = self._serializar_registro_para_json(registro_completo)
         valor_str = str(valor_recebido)[:500] if valor_recebido is not None else None
+        if self.limitador.permitir():
+            logger.warning(f"[REJEIÇÃO] Linha {numero_linha or 'N/A'}: Campo '{campo_falha}' "
+                           f"falhou: {motivo_rejeicao}. Valor: '{valor_str}'{self.limitador.sufixo()}")
+
+        if not self.amostrador.filtrar([{'severidade': severidade, 'campo_falha': campo_falha,
+                                         'motivo_rejeicao': motivo_rejeicao}]):
+            return  # Além do limite de exemplos: apenas contada
+        registro_json = None if self.compacto else self._serializar_registro_para_json(registro_completo)
 
         rejeicao = {
             'execucao_fk': self.execucao_fk,
@@ -77,34 +111,34 @@ class RejectionLogger:
         }
         self.rejeicoes.append(rejeicao)
 
-        log_msg = (f"[REJEIÇÃO] Linha {numero_linha or 'N/A'}: Campo '{campo_falha}' "
-                   f"falhou: {motivo_rejeicao}. Valor: '{valor_str}'")
-        logger.warning(log_msg)
-
     def _serializar_registro_para_json(self, registro: Optional[Dict]) -> Optional[str]:
         """Converte um dicionário de registro em uma string JSON, tratando tipos de dados incompatíveis."""
         if not registro:
             return None
         try:
-            # Converte valores não serilizáveis (como NaN, Inf) para strings ou None
+            # NaN e Inf não existem em JSON: viram null. Datas e demais tipos viram texto.
             serializado = {
-                k: str(v) if isinstance(v, (datetime, float)) and not math.isfinite(v) else v
+                str(k): None if isinstance(v, float) and not math.isfinite(v) else v
                 for k, v in registro.items()
             }
             return json.dumps(serializado, ensure_ascii=False, default=str)
         except Exception as e:
             logger.warning(f"Erro ao serializar registro para JSON: {e}")
-            return str(registro)
+            return json.dumps({str(k): str(v) for k, v in registro.items()}, ensure_ascii=False)
 
     def salvar_rejeicoes(self) -> int:
         """
         Insere todas as rejeições acumuladas no buffer no banco de dados.
 
         Utiliza `psycopg2.extras.execute_values` para uma inserção em lote eficiente.
+        Com limite de exemplos, as contagens acumuladas desde a última chamada
+        são somadas a `auditoria.resumo_rejeicao`.
 
         Returns:
             int: O número de registros de rejeição que foram salvos.
         """
+        if self.amostrador.amostras > 0:
+            self._salvar_resumo()
         if not self.rejeicoes:
             return 0
 
@@ -125,7 +159,9 @@ class RejectionLogger:
             ]
 
             with get_cursor(self.conn) as cur:
-                execute_values(cur, query, dados_para_inserir, page_size=len(dados_para_inserir))
+                execute_values(cur, query, dados_para_inserir,
+                               template="(%s, %s, %s, %s, %s, %s, %s, %s::jsonb, %s, %s)",
+                               page_size=len(dados_para_inserir))
 
             total = len(self.rejeicoes)
             logger.info(f"{total} rejeições salvas com sucesso na tabela de auditoria.")
@@ -134,4 +170,15 @@ class RejectionLogger:
 
         except Exception as e:
             logger.error(f"Falha crítica ao salvar rejeições no banco de dados: {e}", exc_info=True)
-            raise
\ No newline at end of file
+            raise
+
+    def _salvar_resumo(self) -> None:
+        """Soma as contagens pendentes ao resumo da execução (sem confirmar a transação)."""
+        pendentes = self.amostrador.pendentes()
+        if not pendentes:
+            return
+        registrar_resumo_rejeicao(self.conn, self.execucao_fk, pendentes)
+        omitidas = sum(self.amostrador.omitidas().values())
+        if omitidas:
+            logger.info(f"{omitidas} rejeições além de {self.amostrador.amostras} exemplos por campo e "
+                        f"motivo: contagens em auditoria.resumo_rejeicao.{self.limitador.sufixo()}")
\ No newline at end of file
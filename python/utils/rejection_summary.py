@@ -0,0 +1,124 @@
+"""
+Este módulo, `rejection_summary`, limita o volume do log de rejeições em
+arquivos patológicos (ex: uma exportação que quebra uma coluna inteira e gera
+um ERROR por linha).
+
+- `RejectionSampler`: guarda apenas os primeiros `ETL_REJECTION_SAMPLE_SIZE`
+  exemplos de cada (severidade, campo, motivo) de uma execução; os demais
+  entram só na contagem, gravada em `auditoria.resumo_rejeicao`.
+- `LogRateLimiter`: limita as linhas por segundo no console e nos arquivos
+  de log (`ETL_REJECTION_LOG_RATE`); as linhas omitidas são contadas e
+  informadas na próxima linha emitida.
+
+O motivo é agrupado sem o valor recebido (ver `reason_category`), para que
+cada valor inválido não vire uma categoria própria.
+"""
+
+import time
+from collections import Counter
+from typing import Dict, List, Tuple
+
+
+def reason_category(motivo: str) -> str:
+    """
+    O motivo sem o valor recebido, para agrupar as contagens.
+    Ex: "Data inválida em 'data_fat': 32/13/2024" → "Data inválida em 'data_fat'".
+    """
+    return motivo.partition(': ')[0]
+
+
+def rejection_key(severidade: str, campo_falha: str, motivo_rejeicao: str) -> Tuple[str, str, str]:
+    """A chave de agrupamento de uma rejeição: `(severidade, campo, categoria do motivo)`."""
+    return severidade, campo_falha, reason_category(motivo_rejeicao)
+
+
+class RejectionSampler:
+    """
+    Seleciona as entradas do log de rejeições a gravar: os primeiros
+    `amostras` exemplos de cada chave (`rejection_key`) ao longo de uma
+    execução. Todas as entradas, gravadas ou não, são contadas.
+    """
+
+    def __init__(self, amostras: int):
+        """
+        Args:
+            amostras (int): Exemplos gravados por chave (0 = todos).
+        """
+        self.amostras = amostras
+        # Total de entradas por chave na execução
+        self.contagens = Counter()
+        # Entradas por chave desde a última chamada a `pendentes`
+        self._pendentes = Counter()
+
+    def filtrar(self, entradas: List[Dict]) -> List[Dict]:
+        """
+        Conta as entradas e devolve as que devem ser gravadas.
+
+        Args:
+            entradas (list): Entradas do log (`severidade`, `campo_falha`, `motivo_rejeicao`).
+
+        Returns:
+            list: As entradas dentro do limite de exemplos de cada chave.
+        """
+        gravadas = []
+        for entrada in entradas:
+            chave = rejection_key(entrada['severidade'], entrada['campo_falha'], entrada['motivo_rejeicao'])
+            self.contagens[chave] += 1
+            self._pendentes[chave] += 1
+            if self.amostras <= 0 or self.contagens[chave] <= self.amostras:
+                gravadas.append(entrada)
+        return gravadas
+
+    def pendentes(self) -> Counter:
+        """As contagens ainda não gravadas no resumo (e as zera)."""
+        pendentes, self._pendentes = self._pendentes, Counter()
+        return pendentes
+
+    def descartar_pendentes(self) -> None:
+        """Desconta as contagens ainda não gravadas (a transação foi desfeita)."""
+        self.contagens.subtract(self._pendentes)
+        self._pendentes = Counter()
+
+    def omitidas(self) -> Dict[Tuple[str, str, str], int]:
+        """Entradas não gravadas por chave (acima do limite de exemplos)."""
+        if self.amostras <= 0:
+            return {}
+        return {chave: total - self.amostras for chave, total in self.contagens.items()
+                if total > self.amostras}
+
+
+class LogRateLimiter:
+    """
+    Limita a quantidade de linhas por segundo de um log (balde de fichas:
+    permite rajadas de até `por_segundo` linhas).
+    """
+
+    def __init__(self, por_segundo: float):
+        """
+        Args:
+            por_segundo (float): Linhas por segundo (0 = sem limite).
+        """
+        self.por_segundo = por_segundo
+        self.omitidas = 0
+        self._fichas = float(por_segundo)
+        self._ultimo = time.monotonic()
+
+    def permitir(self) -> bool:
+        """True se a próxima linha pode ser emitida; caso contrário, conta a linha como omitida."""
+        if self.por_segundo <= 0:
+            return True
+        agora = time.monotonic()
+        self._fichas = min(self.por_segundo, self._fichas + (agora - self._ultimo) * self.por_segundo)
+        self._ultimo = agora
+        if self._fichas >= 1:
+            self._fichas -= 1
+            return True
+        self.omitidas += 1
+        return False
+
+    def sufixo(self) -> str:
+        """Texto com as linhas omitidas desde a última linha emitida (e as zera)."""
+        if not self.omitidas:
+            return ''
+        omitidas, self.omitidas = self.omitidas, 0
+        return f" (+{omitidas} linhas omitidas do log)"
@@ -7,6 +7,10 @@ Os validadores cobrem uma variedade de cenários, desde checagens simples, como
 campos obrigatórios, até validações complexas, como formatos de data, CPF/CNPJ
 e regras de domínio. Cada função de validação retorna uma tupla `(bool, str)`,
 indicando o sucesso da validação e uma mensagem de erro, se aplicável.
+
+Para colunas inteiras, `mascara_cnpj_cpf_invalidos` valida todos os valores de
+uma vez com NumPy (sem laço Python por linha) e retorna a máscara das linhas
+inválidas, no formato usado pela limpeza de tipos (`DataCleaner.identify_errors`).
 """
 
 import re
@@ -115,6 +119,107 @@ def _validar_cnpj(cnpj: str) -> Tuple[bool, Optional[str]]:
         
     return True, None
 
+# Pesos dos dígitos verificadores do CNPJ
+_PESOS_CNPJ_1 = (5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2)
+_PESOS_CNPJ_2 = (6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2)
+# Valores com esse tamanho ou mais não são um CPF/CNPJ, nem formatado (ex: "12.345.678/0001-95")
+_TAMANHO_MAXIMO_CNPJ_CPF = 32
+
+def mascara_cnpj_cpf_invalidos(serie):
+    """
+    Valida uma coluna inteira de CPFs/CNPJs e retorna a máscara dos inválidos.
+
+    Os caracteres não numéricos são descartados. Um valor é válido se for um
+    CPF (11 dígitos) ou um CNPJ (14 dígitos) com os dígitos verificadores
+    corretos e sem todos os dígitos iguais. Valores com 12 ou 13 dígitos são
+    completados com zeros à esquerda e validados como CNPJ, o que recupera os
+    CNPJs que perderam os zeros iniciais ao passar por uma planilha (ex:
+    `2251927000120` → `02251927000120`); valores com menos de 11 dígitos são
+    inválidos.
+
+    Não há laço Python por linha: os caracteres viram uma matriz de códigos e
+    os dígitos verificadores são calculados com aritmética de arrays NumPy
+    sobre a coluna toda. Células vazias não são consideradas inválidas (ver a
+    checagem de campos obrigatórios).
+
+    Args:
+        serie (pd.Series): Os valores (texto ou números inteiros).
+
+    Returns:
+        pd.Series: Máscara booleana (mesmo índice), True para os valores inválidos.
+    """
+    import numpy as np
+    import pandas as pd
+
+    if pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(serie):
+        # Colunas tipadas (ex: Parquet): o número, sem casas decimais
+        serie = serie.round().astype('Int64').astype(str).where(serie.notna(), None)
+    valores = serie.to_numpy(dtype=object)
+    valores = np.where(pd.isna(valores), '', valores)
+
+    # Um código por caractere (bytes; Unicode se houver caracteres não ASCII),
+    # truncado em `_TAMANHO_MAXIMO_CNPJ_CPF` e preenchido com 0 à direita
+    try:
+        texto = valores.astype(f'S{_TAMANHO_MAXIMO_CNPJ_CPF}')
+    except UnicodeEncodeError:
+        texto = valores.astype(f'U{_TAMANHO_MAXIMO_CNPJ_CPF}')
+    codigos = texto.view(np.uint8 if texto.dtype.kind == 'S' else np.uint32).reshape(
+        len(texto), _TAMANHO_MAXIMO_CNPJ_CPF)
+    longo = codigos[:, -1] != 0
+    usadas = np.flatnonzero(codigos.any(axis=0))
+    # Uma linha por posição de caractere, até a última usada
+    posicoes = np.ascontiguousarray(codigos[:, :usadas[-1] + 1 if len(usadas) else 0].T)
+
+    # Os dígitos de cada valor lidos como um número inteiro, uma passada
+    # vetorizada por posição de caractere (os não numéricos são ignorados)
+    numero = np.zeros(len(texto), dtype=np.int64)
+    quantidade = np.zeros(len(texto), dtype=np.int64)
+    preenchido = np.zeros(len(texto), dtype=bool)
+    for codigo in posicoes:
+        digito = codigo - codigo.dtype.type(48)
+        eh_digito = digito < 10
+        numero = np.where(eh_digito, numero * 10 + digito, numero)
+        quantidade += eh_digito
+        preenchido |= codigo > 32
+
+    # Os 14 dígitos do número (os zeros à esquerda perdidos voltam aqui), em
+    # duas metades de 7 dígitos, que cabem em int32
+    alta, baixa = np.divmod(numero, 10 ** 7)
+    alta, baixa = alta.astype(np.int32), baixa.astype(np.int32)
+    digitos = np.empty((14, len(texto)), dtype=np.int32)
+    for indice in range(6, -1, -1):
+        alta, digitos[indice] = np.divmod(alta, 10)
+        baixa, digitos[indice + 7] = np.divmod(baixa, 10)
+    # Produtos em ponto flutuante (BLAS): as somas são inteiros pequenos, exatos
+    digitos = digitos.astype(np.float64)
+
+    cnpj_valido = (quantidade >= 12) & (quantidade <= 14) & _digitos_cnpj_corretos(digitos)
+    cpf_valido = (quantidade == 11) & _digitos_cpf_corretos(digitos[3:])
+    invalido = preenchido & (longo | ~(cnpj_valido | cpf_valido))
+    return pd.Series(invalido, index=serie.index)
+
+def _digitos_cnpj_corretos(digitos):
+    """Confere os dígitos verificadores de CNPJs (matriz 14 x n, um CNPJ por coluna)."""
+    import numpy as np
+
+    dv1 = 11 - (np.array(_PESOS_CNPJ_1, dtype=np.float64) @ digitos[:12]) % 11
+    dv1[dv1 >= 10] = 0
+    dv2 = 11 - (np.array(_PESOS_CNPJ_2, dtype=np.float64) @ digitos[:13]) % 11
+    dv2[dv2 >= 10] = 0
+    repetidos = digitos.max(axis=0) == digitos.min(axis=0)
+    return (dv1 == digitos[12]) & (dv2 == digitos[13]) & ~repetidos
+
+def _digitos_cpf_corretos(digitos):
+    """Confere os dígitos verificadores de CPFs (matriz 11 x n, um CPF por coluna)."""
+    import numpy as np
+
+    dv1 = (np.arange(10, 1, -1, dtype=np.float64) @ digitos[:9]) * 10 % 11
+    dv1[dv1 == 10] = 0
+    dv2 = (np.arange(11, 1, -1, dtype=np.float64) @ digitos[:10]) * 10 % 11
+    dv2[dv2 == 10] = 0
+    repetidos = digitos.max(axis=0) == digitos.min(axis=0)
+    return (dv1 == digitos[9]) & (dv2 == digitos[10]) & ~repetidos
+
 # --- VALIDADORES NUMÉRICOS ---
 
 def validar_numero(valor: Any, tipo: str = 'decimal') -> Tuple[bool, Optional[str]]: